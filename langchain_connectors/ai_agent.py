@@ -9,12 +9,16 @@ from langchain.prompts import PromptTemplate, MessagesPlaceholder
 from langchain.chains.llm import LLMChain
 from langchain.chains.llm_math.base import LLMMathChain
 from ubility_langchain.model import Model
+from ubility_langchain.history_store import get_history_store, HISTORY_WINDOW
+from ubility_langchain.memory import create_memory, TokenBudgetMemory
 from langchain.tools import BaseTool
 import requests
 import json
 import os, io
 import logging
 
+HISTORY_DIRECTORY = "/langchain_connectors/langchain_history"
+
 
 class GetTrigger(BaseTool):
     name = "trigger-flow"
@@ -242,8 +246,9 @@ def invoke(inputs, model, params, cred):
             }
         ]
         memory:{
-            "type": "ConversationBufferMemory",
-            "historyId":"164e70e4ced"
+            "type": "ConversationBufferMemory" | "ConversationTokenBufferMemory" | "ConversationSummaryMemory" | "ConversationSummaryBufferMemory",
+            "historyId":"164e70e4ced",
+            "maxTokenLimit": 2000
         }
     }
     """
@@ -264,36 +269,16 @@ def invoke(inputs, model, params, cred):
         
         logging.warning("test1")
         if "memory" in params and "type" in params["memory"]:
-            memory = ConversationBufferMemory(memory_key="history", return_messages=True)
-
+            turns = []
             if 'context' in params["memory"] :
                 for context in params["memory"]['context']:
-                    memory.save_context({'input': str(context['input'])},{"output": str(context['output'])})
+                    turns.append((str(context['input']), str(context['output'])))
 
             if "historyId" in params["memory"]:
                 historyId = params["memory"]["historyId"]
-                filePath = f"/langchain_connectors/langchain_history/{historyId}.json"
-                if os.path.exists(filePath):
-                    f = open(filePath)
-                    
-                    try:
-                        data = json.load(f)
-                    except Exception:
-                        data = {"context": []}
-                    f.close()
-                    for context in data["context"]:
-                        memory.save_context({"input": str(context["input"])}, {"output": str(context["output"])})
-                else:
-                    with io.open(filePath, "w", encoding="utf-8") as file:
-                        data = {"context": []}
-                        str_ = json.dumps(
-                            data,
-                            indent=4,
-                            sort_keys=True,
-                            separators=(",", ": "),
-                            ensure_ascii=False,
-                        )
-                        file.write(str_)
+                history_store = get_history_store(HISTORY_DIRECTORY, params["memory"].get("historyBackend"))
+                turns.extend(history_store.load_sequenced(historyId, params["memory"].get("historyWindow", HISTORY_WINDOW)))
+                memory = create_memory(params["memory"], llm_model, turns, history_store.load_state(historyId))
             else:
                 raise Exception("missing history id")
 
@@ -341,24 +326,10 @@ def invoke(inputs, model, params, cred):
                                     answer[key] = str(answer[key])
                                     
         if "memory" in params and "type" in params["memory"] and "historyId" in params["memory"]:
-            f = open(filePath)
-            logging.warning("teni")
-            try:
-                data = json.load(f)
-            except Exception:
-                data = {"context": []}
-            f.close()
-
-            data["context"].append({"input": inputs["query"], "output": answer["output"]})
-            with io.open(filePath, "w", encoding="utf-8") as file:
-                str_ = json.dumps(
-                    data,
-                    indent=4,
-                    sort_keys=True,
-                    separators=(",", ": "),
-                    ensure_ascii=False,
-                )
-                file.write(str_)
+            sequence = history_store.append(historyId, inputs["query"], answer["output"])
+            if isinstance(memory, TokenBudgetMemory) and memory.summary:
+                memory.set_sequence(sequence)
+                history_store.save_state(historyId, memory.state())
 
         return answer
     
@@ -10,9 +10,8 @@ import json
 from ubility_langchain.callbacks_handler import LogsCallbackHandler, TokenCounter
 from ubility_langchain.model import Model
 from ubility_langchain.functions import post_langchain_to_elasticsearch, calculate_total_cost
+from ubility_langchain.streaming import open_stream
 import threading
-import socketio
-import uuid
 
 def langchain_basic_llm_set_outputParser(params):
     try:
@@ -92,12 +91,10 @@ def langchain_basic_llm_create_chain(cred, model, inputs, params, flowName, user
                     result = ""
                     if "streaming" in params and "conversation_id" in params["streaming"]:
                         conv_id = params["streaming"]["conversation_id"]
-                        sio = socketio.Client()
-                        custom_client_id = str(uuid.uuid4())
-                        sio.connect('', headers={'client_id': custom_client_id,'conversation_id':conv_id})
-                        for chunk in chain.stream(input=inputs["query"], config={"callbacks": [handler, token_counter]}):
-                            sio.send({'message':chunk.content, 'conversation_id': conv_id})
-                            result += chunk.content
+                        with open_stream(conv_id) as stream:
+                            for chunk in chain.stream(input=inputs["query"], config={"callbacks": [handler, token_counter]}):
+                                stream.send(chunk.content)
+                                result += chunk.content
 
                     else:
                         for chunk in chain.stream(input=inputs["query"], config={"callbacks": [handler, token_counter]}):
@@ -141,12 +138,10 @@ def langchain_basic_llm_create_chain(cred, model, inputs, params, flowName, user
                         result = ""
                         if "streaming" in params and "conversation_id" in params["streaming"]:
                             conv_id = params["streaming"]["conversation_id"]
-                            sio = socketio.Client()
-                            custom_client_id = str(uuid.uuid4())
-                            sio.connect('', headers={'client_id': custom_client_id,'conversation_id':conv_id})
-                            for chunk in chain.stream(input=inputs["promptInputs"], config={"callbacks": [handler, token_counter]}):
-                                sio.send({'message':chunk.content, 'conversation_id': conv_id})
-                                result += chunk.content
+                            with open_stream(conv_id) as stream:
+                                for chunk in chain.stream(input=inputs["promptInputs"], config={"callbacks": [handler, token_counter]}):
+                                    stream.send(chunk.content)
+                                    result += chunk.content
                         else:
                             for chunk in chain.stream(input=inputs["promptInputs"], config={"callbacks": [handler, token_counter]}):
                                 result += chunk.content
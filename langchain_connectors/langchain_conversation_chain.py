@@ -15,14 +15,19 @@ from langchain_core.messages import BaseMessage, AIMessage
 from ubility_langchain.model import Model
 from ubility_langchain.callbacks_handler import LogsCallbackHandler, TokenCounter
 from ubility_langchain.functions import post_langchain_to_elasticsearch, calculate_total_cost
+from ubility_langchain.streaming import open_stream
+from ubility_langchain.history_store import get_history_store, HISTORY_WINDOW
+from ubility_langchain.memory import create_memory, TokenBudgetMemory
+from ubility_langchain.session_store import SessionStore
 import json, threading
 import io
 import os
 import logging
-import socketio
-import uuid
 
-store = {}
+# sessions of the process, evicted when idle or beyond LANGCHAIN_SESSION_MAX
+store = SessionStore()
+
+HISTORY_DIRECTORY = 'langchain_connectors/langchain_history'
 
 
 class InMemoryHistory(BaseModel):
@@ -57,9 +62,11 @@ def serialize_in_memory_history(obj: InMemoryHistory) -> List[Dict[str, str]]:
 def get_session_history(
     session_id: str
 ) -> BaseChatMessageHistory:
-    if (session_id) not in store:
-        store[session_id] = InMemoryHistory()
-    return store[session_id]
+    history = store.get(session_id)
+    if history is None:
+        history = InMemoryHistory()
+        store[session_id] = history
+    return history
 
 
 def langchain_invoke_conversation(inputs, model, cred,chainMemory, flowName, userId, params):
@@ -75,52 +82,20 @@ def langchain_invoke_conversation(inputs, model, cred,chainMemory, flowName, use
             else:
                 raise Exception("Missing Model Data")
                 
+            token_counter = TokenCounter(llm_model)
             if 'type' in chainMemory :
-                memory = ConversationBufferMemory(memory_key="history", return_messages= True)
-                msgs = []
+                turns = []
+                state = {}
                 if 'context' in chainMemory :
                     for context in chainMemory['context']:
-                        input_history = HumanMessage(content=str(context['input']))
-                        msgs.append(input_history)
-                        output_history = AIMessageChunk(content=str(context['output']))
-                        msgs.append(output_history)
-                        memory.save_context({'input': str(context['input'])},{"output": str(context['output'])})
+                        turns.append((str(context['input']), str(context['output'])))
                 if 'historyId' in chainMemory :
                     historyId = chainMemory['historyId']
-                    filePath = f'langchain_connectors/langchain_history/{historyId}.json'
-                    if os.path.exists(filePath):
-                        f = open(filePath)
-                        logging.warning('awal')
-                        try:
-                            data = json.load(f)
-                        except Exception:
-                            data = {historyId: []}
-                        f.close()
-                        # msgs = []
-                        for context in data[historyId]:
-                            for msg in context:
-                                if "HumanMessage" in msg:
-                                    input_context = msg["HumanMessage"]
-                                    input_history = HumanMessage(content=input_context)
-                                    msgs.append(input_history)
-                                if "AIMessageChunk" in msg:
-                                    output_context = msg["AIMessageChunk"]
-                                    output_history = AIMessageChunk(content=output_context)
-                                    msgs.append(output_history)
-                            if input_context and output_context:
-                                # local_store = InMemoryHistory()
-                                # local_store.add_messages(messages=msgs)
-                                # store[historyId] = local_store
-                                memory.save_context({'input': input_context},{"output": output_context})
-                            else:
-                                raise Exception("input or output not found") 
-                    else:
-                        with io.open(filePath, 'w', encoding='utf-8') as file:
-                            data = {historyId: []}
-                            str_ = json.dumps(data,
-                                            indent=4, sort_keys=True,
-                                            separators=(',', ': '), ensure_ascii=False)
-                            file.write(str_)
+                    history_store = get_history_store(HISTORY_DIRECTORY, chainMemory.get('historyBackend'))
+                    turns.extend(history_store.load_sequenced(historyId, chainMemory.get('historyWindow', HISTORY_WINDOW)))
+                    state = history_store.load_state(historyId)
+                memory = create_memory(chainMemory, llm_model, turns, state, callbacks=[handler, token_counter])
+                msgs = memory.load_memory_variables({})["history"]
 
                 local_store = InMemoryHistory()
                 local_store.add_messages(messages=msgs)
@@ -163,17 +138,14 @@ def langchain_invoke_conversation(inputs, model, cred,chainMemory, flowName, use
                             input_messages_key="question",
                             history_messages_key="history",
                         )
-                        token_counter = TokenCounter(llm_model)
                         
                         result = ""
                         if "streaming" in params and "conversation_id" in params["streaming"]:
                             conv_id = params["streaming"]["conversation_id"]
-                            sio = socketio.Client()
-                            custom_client_id = str(uuid.uuid4())
-                            sio.connect('', headers={'client_id': custom_client_id,'conversation_id':conv_id})
-                            for chunk in chain_with_history.stream({"question": inputs['query']}, config={"callbacks": [handler, token_counter], "configurable": {"session_id": historyId}}):
-                                sio.send({'message':chunk.content, 'conversation_id': conv_id})
-                                result += chunk.content
+                            with open_stream(conv_id) as stream:
+                                for chunk in chain_with_history.stream({"question": inputs['query']}, config={"callbacks": [handler, token_counter], "configurable": {"session_id": historyId}}):
+                                    stream.send(chunk.content)
+                                    result += chunk.content
                         else:
                             for chunk in chain_with_history.stream({"question": inputs['query']}, config={"callbacks": [handler, token_counter], "configurable": {"session_id": historyId}}):
                                 result += chunk.content
@@ -194,41 +166,24 @@ def langchain_invoke_conversation(inputs, model, cred,chainMemory, flowName, use
                     input_messages_key="question",
                     history_messages_key="history",
                 )
-                token_counter = TokenCounter(llm_model)
 
                 result = ""
                 if "streaming" in params and "conversation_id" in params["streaming"]:
                     conv_id = params["streaming"]["conversation_id"]
-                    sio = socketio.Client()
-                    custom_client_id = str(uuid.uuid4())
-                    sio.connect('', headers={'client_id': custom_client_id,'conversation_id':conv_id})
-                    for chunk in chain_with_history.stream({"question": inputs['query']}, config={"callbacks": [token_counter, handler], "configurable": {"session_id": historyId}}):
-                        sio.send({'message':chunk.content, 'conversation_id': conv_id})
-                        result += chunk.content
+                    with open_stream(conv_id) as stream:
+                        for chunk in chain_with_history.stream({"question": inputs['query']}, config={"callbacks": [token_counter, handler], "configurable": {"session_id": historyId}}):
+                            stream.send(chunk.content)
+                            result += chunk.content
                 else:
                     for chunk in chain_with_history.stream({"question": inputs['query']}, config={"callbacks": [token_counter, handler], "configurable": {"session_id": historyId}}):
                         result += chunk.content
 
             if 'historyId' in chainMemory:
-                json_data = {key: serialize_in_memory_history(value) for key, value in store.items()}
-                last_messages = json_data[historyId][-2:]
-                f = open(filePath)
-                try:
-                    data = json.load(f)
-                except Exception:
-                    data = {historyId: []}
-                f.close()
-                if historyId in data:
-                    data[historyId].append(last_messages)
-                else:
-                    data[historyId] = []
-                    data[historyId].append(last_messages)
-
-                with io.open(filePath, 'w', encoding='utf-8') as file:
-                    str_ = json.dumps(data,
-                                    indent=4, sort_keys=True,
-                                    separators=(',', ': '), ensure_ascii=False)
-                    file.write(str_)
+                # one record appended per turn, the rest of the history is not rewritten
+                sequence = history_store.append(historyId, inputs['query'], result)
+                if isinstance(memory, TokenBudgetMemory) and memory.summary:
+                    memory.set_sequence(sequence)
+                    history_store.save_state(historyId, memory.state())
 
             answer = {"answer":result}
 
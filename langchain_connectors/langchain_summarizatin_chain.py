@@ -12,13 +12,12 @@ import logging
 from ubility_langchain.callbacks_handler import LogsCallbackHandler, TokenCounter
 from ubility_langchain.model import Model
 from ubility_langchain.functions import post_langchain_to_elasticsearch, calculate_total_cost
+from ubility_langchain.streaming import open_stream
 import threading
 import random
 import string
 import base64
 import json
-import socketio
-import uuid
 
 # pip install jq
 
@@ -100,12 +99,10 @@ def langchain_summarization_chain(cred, model, inputs, flowName, userId, params)
         summary = ""
         if "streaming" in params and "conversation_id" in params["streaming"]:
             conv_id = params["streaming"]["conversation_id"]
-            sio = socketio.Client()
-            custom_client_id = str(uuid.uuid4())
-            sio.connect('', headers={'client_id': custom_client_id,'conversation_id':conv_id})
-            for chunk in chain.stream(split_docs, config={"callbacks": [token_counter, handler]}):
-                sio.send({'message':chunk.content, 'conversation_id': conv_id})
-                summary += chunk.content
+            with open_stream(conv_id) as stream:
+                for chunk in chain.stream(split_docs, config={"callbacks": [token_counter, handler]}):
+                    stream.send(chunk.content)
+                    summary += chunk.content
         else:
             for chunk in chain.stream(split_docs, config={"callbacks": [token_counter, handler]}):
                 summary += chunk.content
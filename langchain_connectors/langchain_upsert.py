@@ -1,46 +1,60 @@
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 import json
 import sys
+import itertools
 import os
 UbilityLibraries = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.append(UbilityLibraries)
 from langchain_connectors.ubility_langchain.document_loader import DocumentLoader
 from langchain_connectors.ubility_langchain.model import Model
 from langchain_connectors.ubility_langchain.vector_store import VectorStore
+from langchain_connectors.ubility_langchain.embedding_pipeline import EMBEDDING_BATCH_SIZE, EMBEDDING_WORKERS
 
 
 import logging
 
 
+def split_documents(documents,text_splitter):
+    """
+        Split documents one at a time, so that chunks reach the embedding stage while the next documents load.
+    """
+    for document in documents:
+        yield from text_splitter.split_documents([document])
+
+
 def Langchain_upsert(cred,document_loader_data,vector_store,embedding_model):
     try:
 
         creds=json.loads(cred)
         
-        # Step 1: Load the data from input and split it
+        # Step 1: Load the data from input and split it, lazily
         chunkSize = document_loader_data['chunkSize']
         chunkOverlap = document_loader_data['chunkOverlap']  
 
-        documents = DocumentLoader(type=document_loader_data['type']).load(document_loader_data)
+        documents = DocumentLoader(type=document_loader_data['type']).lazy_load(document_loader_data)
 
         text_splitter = RecursiveCharacterTextSplitter(chunk_size=chunkSize, chunk_overlap=chunkOverlap)
-        texts = text_splitter.split_documents(documents)  # Split data
-        nbr_of_docs=len(texts)
-        if nbr_of_docs !=0 :
-            
-            # Step 2: Create embedding using given model type
-            provider = embedding_model["provider"]
-            model = embedding_model["model"]
-            embedding = Model(provider,model,creds).embedding()
-            # Step3 : Insert splited data into vector store after embedding it using the created model
-            vectoreStore_type = vector_store["type"]
-            vectoreStore_details = vector_store
-            insert_data= VectorStore(vectoreStore_type,creds,vectoreStore_details).insert_data(texts,embedding,vectoreStore_details)
-            return {"Message":f"{nbr_of_docs} documents had been inserted to {vectoreStore_type}"}
-        else:
+        texts = split_documents(documents, text_splitter)  # Split data
+        first_text = next(texts, None)
+        if first_text is None:
             raise Exception("No data found to be retrieved")
+        texts = itertools.chain([first_text], texts)
+        
+        # Step 2: Create embedding using given model type
+        provider = embedding_model["provider"]
+        model = embedding_model["model"]
+        embedding = Model(provider,model,creds).cached_embedding()
+        batch_size = int(embedding_model.get("batchSize", EMBEDDING_BATCH_SIZE))
+        max_workers = int(embedding_model.get("maxConcurrency", EMBEDDING_WORKERS))
+        # Step3 : Embed the splited data in batches and insert each batch into the vector store
+        vectoreStore_type = vector_store["type"]
+        vectoreStore_details = vector_store
+        vectorStore = VectorStore(vectoreStore_type,creds,vectoreStore_details)
+        insert_data= vectorStore.insert_stream(texts,embedding,vectoreStore_details,batch_size,max_workers)
+        result = vectorStore.upsert_result
+        if vectoreStore_details.get("incremental", False):
+            return {"Message":f"{result['added']} documents had been inserted to {vectoreStore_type}, {result['skipped']} unchanged and {result['deleted']} deleted"}
+        return {"Message":f"{result['added']} documents had been inserted to {vectoreStore_type}"}
 
     except Exception as error:
         raise Exception(error)
-
-   
\ No newline at end of file
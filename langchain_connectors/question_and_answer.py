@@ -1,6 +1,4 @@
 from langchain_pinecone import Pinecone as langPinecone
-from langchain.embeddings.openai import OpenAIEmbeddings
-from langchain.embeddings.ollama import OllamaEmbeddings
 from langchain.memory import ConversationBufferMemory
 from langchain_core.output_parsers.string import StrOutputParser
 from langchain_community.chat_models.openai import ChatOpenAI
@@ -12,10 +10,10 @@ import logging
 import json
 
 from ubility_langchain.callbacks_handler import LogsCallbackHandler, TokenCounter
+from ubility_langchain.model import Model
 from ubility_langchain.functions import post_langchain_to_elasticsearch, calculate_total_cost
+from ubility_langchain.streaming import open_stream
 import threading
-import socketio
-import uuid
 
 # pip install tiktoken
 # pip install pinecone-client
@@ -61,18 +59,8 @@ def retrieve(inputs, model, vectorStore, embedding, cred, flowName, userId, para
         cred = json.loads(cred)
         handler = LogsCallbackHandler()
         if embedding and vectorStore and model:
-            if embedding['provider'] == 'openAi':
-                if 'OpenAI' in cred and 'apiKey' in cred['OpenAI']:
-                    embeddings = OpenAIEmbeddings(model=embedding['model'], openai_api_key=cred['OpenAI']['apiKey'])
-                else:
-                    raise Exception('Missing OpenAI API key')
-            elif embedding['provider'] == 'ollama':
-                embeddings = OllamaEmbeddings()
-                if 'Ollama' in cred and 'ollamaBaseUrl' in cred['Ollama']:
-                    if 'ollamaModel' in embedding:
-                        embeddings = OllamaEmbeddings(model=embedding['model'], base_url=cred['Ollama']['ollamaBaseUrl'])
-                else:
-                    raise Exception('Missing Ollama base url')
+            # same cache namespace as Langchain_upsert, so that both share the cached vectors
+            embeddings = Model(provider=embedding['provider'], model=embedding['model'], credentials=cred).cached_embedding()
  
             if 'type' in vectorStore :
                 if  vectorStore['type'] == 'pinecone':
@@ -132,12 +120,10 @@ def retrieve(inputs, model, vectorStore, embedding, cred, flowName, userId, para
             answer = ""
             if "streaming" in params and "conversation_id" in params["streaming"]:
                 conv_id = params["streaming"]["conversation_id"]
-                sio = socketio.Client()
-                custom_client_id = str(uuid.uuid4())
-                sio.connect('', headers={'client_id': custom_client_id,'conversation_id':conv_id})
-                for chunk in chain.stream(inputs["query"], config={"callbacks": [token_counter, handler]}):
-                    sio.send({'message':chunk.content, 'conversation_id': conv_id})
-                    answer += chunk
+                with open_stream(conv_id) as stream:
+                    for chunk in chain.stream(inputs["query"], config={"callbacks": [token_counter, handler]}):
+                        stream.send(chunk)
+                        answer += chunk
             else:
                 for chunk in chain.stream(inputs["query"], config={"callbacks": [token_counter, handler]}):
                     answer += chunk
@@ -1,41 +1,83 @@
 from langchain_core.callbacks import FileCallbackHandler, BaseCallbackHandler
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from langchain_core.agents import AgentAction, AgentFinish
-from langchain_core.utils.input import print_text
+from collections import deque
+import time
+
+# events kept by a LogsCallbackHandler, the oldest ones are dropped beyond it
+LOG_MAX_EVENTS = 1000
 
 class LogsCallbackHandler(FileCallbackHandler):
-    """Callback Handler that returns logs."""
+    """Callback Handler that returns logs.
+
+    Events are kept as records {"event", "timestamp", "duration", "text"} in a ring buffer
+    of max_events, the log string is only rendered when .log is read.
+    """
 
     def __init__(
-        self, color: Optional[str] = None
+        self, color: Optional[str] = None, max_events: int = LOG_MAX_EVENTS
     ) -> None:
         """Initialize callback handler."""
         self.color = color
-        self.log = ""
+        self.events = deque(maxlen=max_events)
+        self.dropped_events = 0
+        self._started = {}
+        self._rendered = None
 
     def __del__(self) -> None:
         """Destructor to cleanup when done."""
         
 
+    def _add_event(self, event: str, text: str, run_id: Any = None) -> None:
+        started = self._started.pop(run_id, None) if run_id is not None else None
+        if len(self.events) == self.events.maxlen:
+            self.dropped_events += 1
+        self.events.append({
+            "event": event,
+            "timestamp": time.time(),
+            "duration": time.monotonic() - started if started is not None else None,
+            "text": text
+        })
+        self._rendered = None
+
+    def _start(self, run_id: Any) -> None:
+        if run_id is not None:
+            self._started[run_id] = time.monotonic()
+
+    @property
+    def log(self) -> str:
+        """Log rendered from the events, cached until the next event."""
+        if self._rendered is None:
+            parts = [f"... {self.dropped_events} earlier events dropped\n"] if self.dropped_events else []
+            parts.extend(event["text"] for event in self.events)
+            self._rendered = "".join(parts)
+        return self._rendered
+
+    def get_events(self) -> List[Dict[str, Any]]:
+        return list(self.events)
+
     def on_chain_start(self, serialized: Dict[str, Any], inputs: Dict[str, Any], **kwargs: Any) -> Any:
-        class_name = serialized.get("name", serialized.get("id", ["<unknown>"])[-1])
-        log_entry = f"\033[1m> Entering new {class_name} chain...\033[0m\n"
-        self.log += log_entry
+        class_name = (serialized or {}).get("name", (serialized or {}).get("id", ["<unknown>"])[-1])
+        self._start(kwargs.get("run_id"))
+        self._add_event("chain_start", f"\033[1m> Entering new {class_name} chain...\033[0m\n")
 
     def on_text(self, text: str, color: Optional[str] = None, end: str = "", **kwargs: Any) -> Any:
-        log_entry = f"Text: ---{text}---\n"
-        self.log += f"{text}\n"
+        self._add_event("text", f"{text}\n")
 
     def on_chain_end(self, outputs: Dict[str, Any], **kwargs: Any) -> Any:
-        log_entry = "\033[1m> Finished chain.\033[0m\n"
-        self.log += log_entry
+        self._add_event("chain_end", "\033[1m> Finished chain.\033[0m\n", kwargs.get("run_id"))
+
+    def on_chain_error(self, error: BaseException, **kwargs: Any) -> Any:
+        self._add_event("chain_error", f"\033[1m> Chain error: {error}\033[0m\n", kwargs.get("run_id"))
 
     def on_agent_action(
         self, action: AgentAction, color: Optional[str] = None, **kwargs: Any
     ) -> Any:
         """Run on agent action."""
-        log_entry = print_text(action.log, color=color or self.color)
-        self.log += log_entry
+        self._add_event("agent_action", action.log)
+
+    def on_tool_start(self, serialized: Dict[str, Any], input_str: str, **kwargs: Any) -> Any:
+        self._start(kwargs.get("run_id"))
 
     def on_tool_end(
         self,
@@ -45,24 +87,22 @@ class LogsCallbackHandler(FileCallbackHandler):
         llm_prefix: Optional[str] = None,
         **kwargs: Any,
     ) -> None:
-        """If not the final action, print out observation."""
+        """If not the final action, log the observation."""
+        text = str(output)
         if observation_prefix is not None:
-            log_entry = print_text(f"\n{observation_prefix}")
-
-            self.log += log_entry
-        log_entry = print_text(output, color=color or self.color)
-        self.log += log_entry
+            text = f"\n{observation_prefix}{text}"
         if llm_prefix is not None:
-            log_entry = print_text(f"\n{llm_prefix}")
+            text = f"{text}\n{llm_prefix}"
+        self._add_event("tool_end", text, kwargs.get("run_id"))
 
-            self.log += log_entry
+    def on_tool_error(self, error: BaseException, **kwargs: Any) -> Any:
+        self._add_event("tool_error", f"\nTool error: {error}\n", kwargs.get("run_id"))
 
     def on_agent_finish(
         self, finish: AgentFinish, color: Optional[str] = None, **kwargs: Any
     ) -> None:
         """Run on agent end."""
-        log_entry = print_text(finish.log, color=color or self.color, end="\n")
-        self.log += log_entry
+        self._add_event("agent_finish", f"{finish.log}\n")
 
 
 # it works with any type of model
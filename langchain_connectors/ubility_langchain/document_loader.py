@@ -64,19 +64,13 @@ class DocumentLoader:
         try:
             logging.info("Load data method")
 
-            if self.type == "basicDataLoader":
-                response = basicDataLoader(loader_data)
-            elif self.type == "webPageLoader":
-                response = webPageLoader(loader_data)
-            elif self.type == "wikipediaLoader":
-                response = wikipediaLoader(loader_data)
-            elif self.type == "MicrosoftLoader":
-                response = MicrosoftLoader(loader_data)
+            response = self._get_loader(loader_data)
             documents = response.load()
             logging.info("////file_name////")
             logging.info(file_name)
             logging.info("////file_name////")
             if file_name != "":
+                set_source_name(documents, file_name, loader_data)
                 logging.info(f"deleting temp file: {file_name}")
                 os.remove(file_name) #delete file    /app/robotfiles/UbilityLibraries/temp/
                 file_name=''
@@ -84,6 +78,39 @@ class DocumentLoader:
             return documents
         except Exception as error:
             raise Exception(error)
+
+    def lazy_load(self,loader_data: dict):
+        """
+            Load data method yielding one document at a time (e.g. one page of a PDF), so that
+            the documents can be split and embedded while the next ones are read.
+            The temp file, if any, is deleted once the generator is done.
+        """
+        global file_name
+        logging.info("Lazy load data method")
+        response = self._get_loader(loader_data)
+        temp_file_name = file_name
+        file_name = ''
+        try:
+            for document in response.lazy_load():
+                if temp_file_name != "":
+                    set_source_name([document], temp_file_name, loader_data)
+                yield document
+        finally:
+            if temp_file_name != "":
+                logging.info(f"deleting temp file: {temp_file_name}")
+                os.remove(temp_file_name)
+
+    #get the langchain loader matching the loader type
+    def _get_loader(self,loader_data: dict):
+        if self.type == "basicDataLoader":
+            response = basicDataLoader(loader_data)
+        elif self.type == "webPageLoader":
+            response = webPageLoader(loader_data)
+        elif self.type == "wikipediaLoader":
+            response = wikipediaLoader(loader_data)
+        elif self.type == "MicrosoftLoader":
+            response = MicrosoftLoader(loader_data)
+        return response
  
  
 def MicrosoftLoader(loader_data):
@@ -213,6 +240,18 @@ def basicDataLoader(loader_data):
     except Exception as error:
         raise Exception(error)
 
+def set_source_name(documents, temp_file_name, loader_data):
+    """
+        Replace the random temp file source of documents by the caller provided sourceName, which is what
+        identifies the source across loads (e.g. for incremental upserts). Without it the source is left unset.
+    """
+    for document in documents:
+        if document.metadata.get("source") == temp_file_name:
+            if loader_data.get("sourceName"):
+                document.metadata["source"] = str(loader_data["sourceName"])
+            else:
+                del document.metadata["source"]
+
 def generate_random_filename(extension):
     logging.info("generate random filename")
     try:
@@ -0,0 +1,211 @@
+##################################################################################
+# Embeddings are cached by content hash so that unchanged chunks are not re-paid.#
+##################################################################################
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from typing import (Dict,Iterable,List,Optional)
+from decouple import config
+
+from langchain_core.embeddings import Embeddings
+
+
+EMBEDDING_CACHE_PATH = config("EMBEDDING_CACHE_PATH", default="/app/robotfiles/UbilityLibraries/embedding_cache/embeddings.sqlite3")
+MEMORY_CACHE_SIZE = config("EMBEDDING_MEMORY_CACHE_SIZE", default=10000, cast=int)
+# Rows kept on disk, the oldest written ones are evicted beyond it, 0 disables the limit
+DISK_CACHE_MAX_ROWS = config("EMBEDDING_DISK_CACHE_MAX_ROWS", default=1000000, cast=int)
+# Rows written by a process between two checks of the disk cache size
+_EVICTION_CHECK_INTERVAL = 1000
+# SQLite limits the number of host parameters of a single statement
+_SQLITE_BATCH_SIZE = 500
+
+
+class MemoryEmbeddingStore:
+    """
+        In-process LRU tier, shared by every cached embedding model of the process.
+    """
+
+    def __init__(self, max_size: int = MEMORY_CACHE_SIZE):
+        self.max_size = max_size
+        self._vectors = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, List[float]]:
+        found = {}
+        with self._lock:
+            for key in keys:
+                vector = self._vectors.get(key)
+                if vector is not None:
+                    self._vectors.move_to_end(key)
+                    found[key] = vector
+        return found
+
+    def set_many(self, items: Dict[str, List[float]]):
+        with self._lock:
+            for key, vector in items.items():
+                self._vectors[key] = vector
+                self._vectors.move_to_end(key)
+            while len(self._vectors) > self.max_size:
+                self._vectors.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._vectors.clear()
+
+
+class SQLiteEmbeddingStore:
+    """
+        On-disk tier keeping vectors as float32 blobs in a SQLite file, shared by every worker of the host.
+        Beyond max_rows, the rows written first are evicted (with a 10% slack, so that eviction runs in batches).
+    """
+
+    def __init__(self, path: str = EMBEDDING_CACHE_PATH, max_rows: int = DISK_CACHE_MAX_ROWS):
+        self.path = path
+        self.max_rows = max_rows
+        self._written = 0
+        self._written_lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._connection().execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+
+    #sqlite connections can not be shared between threads
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, List[float]]:
+        keys = list(keys)
+        found = {}
+        connection = self._connection()
+        for start in range(0, len(keys), _SQLITE_BATCH_SIZE):
+            batch = keys[start:start + _SQLITE_BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            for key, blob in connection.execute(f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch):
+                vector = array("f")
+                vector.frombytes(blob)
+                found[key] = vector.tolist()
+        return found
+
+    def set_many(self, items: Dict[str, List[float]]):
+        connection = self._connection()
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, array("f", vector).tobytes()) for key, vector in items.items()]
+            )
+        with self._written_lock:
+            self._written += len(items)
+            check = self._written >= _EVICTION_CHECK_INTERVAL
+            if check:
+                self._written = 0
+        if check and self.max_rows:
+            self.evict()
+
+    def evict(self):
+        connection = self._connection()
+        with connection:
+            count = connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            if count <= self.max_rows:
+                return
+            excess = count - int(self.max_rows * 0.9)
+            # rowids grow with every insert or replace, so the smallest ones are the oldest rows
+            connection.execute(
+                "DELETE FROM embeddings WHERE rowid IN (SELECT rowid FROM embeddings ORDER BY rowid LIMIT ?)",
+                (excess,)
+            )
+        logging.info(f"{excess} embeddings evicted from {self.path}")
+
+
+memory_store = MemoryEmbeddingStore()
+_disk_stores = {}
+_disk_stores_lock = threading.Lock()
+
+
+def get_disk_store(path: str = EMBEDDING_CACHE_PATH) -> Optional[SQLiteEmbeddingStore]:
+    """
+        Return the SQLite tier stored at path, or None when it can not be opened (e.g. read-only file system).
+    """
+    with _disk_stores_lock:
+        if path not in _disk_stores:
+            try:
+                _disk_stores[path] = SQLiteEmbeddingStore(path)
+            except (OSError, sqlite3.Error) as error:
+                logging.warning(f"Embedding cache disabled on disk: {error}")
+                _disk_stores[path] = None
+        return _disk_stores[path]
+
+
+class CachedEmbeddings(Embeddings):
+    """
+        Wrap an embedding model so that every text is embedded once per model.
+
+        Vectors are keyed by sha256(namespace, text), where the namespace identifies the embedding
+        model (provider, model and params), and looked up in each store in turn: memory first, then disk.
+        Only the texts missing from every store are sent to the wrapped model.
+    """
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        namespace: str,
+        stores: Optional[list] = None
+        ):
+        self.embedding = embedding
+        self.namespace = namespace
+        if stores is None:
+            stores = [memory_store, get_disk_store()]
+        self.stores = [store for store in stores if store is not None]
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.namespace}\0{text}".encode("utf-8")).hexdigest()
+
+    def _lookup(self, keys: List[str]) -> Dict[str, List[float]]:
+        found = {}
+        for index, store in enumerate(self.stores):
+            missing = [key for key in keys if key not in found]
+            if not missing:
+                break
+            hits = store.get_many(missing)
+            if hits and index > 0:
+                # promote the hits to the faster tiers
+                for faster in self.stores[:index]:
+                    faster.set_many(hits)
+            found.update(hits)
+        return found
+
+    def _store(self, items: Dict[str, List[float]]):
+        for store in self.stores:
+            store.set_many(items)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [self._key(text) for text in texts]
+        vectors = self._lookup(keys)
+        missing = OrderedDict()
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                missing[key] = text
+        if missing:
+            embedded = dict(zip(missing.keys(), self.embedding.embed_documents(list(missing.values()))))
+            self._store(embedded)
+            vectors.update(embedded)
+        logging.info(f"{len(texts) - len(missing)} of {len(texts)} embeddings found in cache")
+        return [vectors[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        key = self._key("query\0" + text)
+        vector = self._lookup([key]).get(key)
+        if vector is None:
+            vector = self.embedding.embed_query(text)
+            self._store({key: vector})
+        return vector
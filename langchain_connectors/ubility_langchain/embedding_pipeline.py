@@ -0,0 +1,131 @@
+##############################################################################################
+# Staged ingestion: chunks are embedded in batches on a worker pool while the caller         #
+# keeps loading, splitting and writing, so that the stages overlap and memory stays bounded. #
+##############################################################################################
+import logging
+import random
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import (Callable,Iterable,Iterator,List,Optional)
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+
+EMBEDDING_BATCH_SIZE = 64
+EMBEDDING_WORKERS = 4
+MAX_RETRIES = 6
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+
+
+def batched(items: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """
+        Tell whether a provider error is a rate limit or throttling error worth retrying.
+    """
+    response = getattr(error, "response", None)
+    status = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+    if status in (429, 503):
+        return True
+    name = type(error).__name__.lower()
+    message = str(error).lower()
+    return "ratelimit" in name or "rate limit" in message or "too many requests" in message or "throttl" in message
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def embed_with_backoff(embedding: Embeddings, texts: List[str], max_retries: int = MAX_RETRIES) -> List[List[float]]:
+    """
+        Embed a batch, sleeping and retrying with exponential backoff and jitter while the provider rate limits us.
+        The Retry-After header is honoured when the provider sends one.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return embedding.embed_documents(texts)
+        except Exception as error:
+            if attempt == max_retries or not is_rate_limited(error):
+                raise
+            delay = retry_after(error) or min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.5)
+            logging.warning(f"Embedding rate limited, retrying in {delay:.1f}s ({attempt + 1}/{max_retries})")
+            time.sleep(delay)
+
+
+class PrecomputedEmbeddings(Embeddings):
+    """
+        Hand the vectors computed by the pipeline to a vector store, so that it does not embed the batch again.
+        Texts without a precomputed vector, and queries, go to the wrapped model.
+    """
+
+    def __init__(self, embedding: Embeddings):
+        self.embedding = embedding
+        self._vectors = {}
+
+    def set_vectors(self, texts: List[str], vectors: List[List[float]]):
+        self._vectors = dict(zip(texts, vectors))
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        missing = [text for text in texts if text not in self._vectors]
+        if missing:
+            self._vectors.update(zip(missing, self.embedding.embed_documents(missing)))
+        return [self._vectors[text] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embedding.embed_query(text)
+
+
+def run_pipeline(
+    chunks: Iterable[Document],
+    embedding: Embeddings,
+    write: Callable[[List[Document], List[List[float]]], None],
+    batch_size: int = EMBEDDING_BATCH_SIZE,
+    max_workers: int = EMBEDDING_WORKERS,
+    max_retries: int = MAX_RETRIES
+    ) -> int:
+    """
+        Embed chunks in batches on a bounded worker pool and write each batch once embedded.
+
+        Chunks are pulled lazily from the iterable, so loading and splitting run while the workers embed.
+        At most two batches per worker are in flight, and batches are written in order by the calling thread.
+
+        Return the number of chunks written.
+    """
+    pending = deque()
+    written = 0
+
+    def write_next():
+        batch, future = pending.popleft()
+        write(batch, future.result())
+        return len(batch)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for batch in batched(chunks, batch_size):
+                texts = [document.page_content for document in batch]
+                pending.append((batch, executor.submit(embed_with_backoff, embedding, texts, max_retries)))
+                while len(pending) >= max_workers * 2 or (pending and pending[0][1].done()):
+                    written += write_next()
+            while pending:
+                written += write_next()
+        except BaseException:
+            for _, future in pending:
+                future.cancel()
+            raise
+    logging.info(f"{written} chunks embedded and written")
+    return written
@@ -0,0 +1,286 @@
+###############################################################################
+# Conversation history is appended one turn at a time and read back by window.#
+###############################################################################
+import fcntl
+import io
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import (List,Optional,Tuple)
+from decouple import config
+
+
+HISTORY_BACKEND = config("LANGCHAIN_HISTORY_BACKEND", default="jsonl")
+# Number of most recent turns loaded into memory, 0 loads the whole history
+HISTORY_WINDOW = config("LANGCHAIN_HISTORY_WINDOW", default=50, cast=int)
+_BLOCK_SIZE = 64 * 1024
+
+
+def legacy_turns(data: dict, history_id: str) -> List[Tuple[str, str]]:
+    """
+        Read the turns of a history written by the previous whole-file JSON format, either
+        {"context": [{"input": ..., "output": ...}]} or {historyId: [[{"HumanMessage": ...}, {"AIMessageChunk": ...}]]}.
+    """
+    turns = []
+    if "context" in data:
+        for context in data["context"]:
+            turns.append((str(context["input"]), str(context["output"])))
+    for context in data.get(history_id, []):
+        input_context = output_context = None
+        for msg in context:
+            if "HumanMessage" in msg:
+                input_context = msg["HumanMessage"]
+            if "AIMessageChunk" in msg:
+                output_context = msg["AIMessageChunk"]
+        if input_context is not None and output_context is not None:
+            turns.append((input_context, output_context))
+    return turns
+
+
+class JSONLHistoryStore:
+    """
+        One <historyId>.jsonl file per conversation, one line per turn.
+        Writers append under an exclusive flock, readers only read the tail of the file.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, history_id: str) -> str:
+        return os.path.join(self.directory, f"{history_id}.jsonl")
+
+    #convert the <historyId>.json file of the previous format, once
+    def _migrate(self, history_id: str, file):
+        legacy_path = os.path.join(self.directory, f"{history_id}.json")
+        if os.fstat(file.fileno()).st_size != 0 or not os.path.exists(legacy_path):
+            return
+        try:
+            with open(legacy_path, encoding="utf-8") as legacy:
+                turns = legacy_turns(json.load(legacy), history_id)
+        except (OSError, ValueError) as error:
+            logging.warning(f"Could not migrate history {legacy_path}: {error}")
+            return
+        for input_context, output_context in turns:
+            file.write(json.dumps({"input": input_context, "output": output_context}, ensure_ascii=False) + "\n")
+        file.flush()
+        logging.info(f"{len(turns)} turns migrated from {legacy_path}")
+
+    def append(self, history_id: str, input_context: str, output_context: str) -> int:
+        """
+            Append a turn and return its sequence, the offset of its line in the file.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        line = json.dumps({"input": input_context, "output": output_context, "createdAt": time.time()}, ensure_ascii=False) + "\n"
+        with io.open(self._path(history_id), "a", encoding="utf-8") as file:
+            fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                self._migrate(history_id, file)
+                sequence = os.fstat(file.fileno()).st_size
+                file.write(line)
+                file.flush()
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
+        return sequence
+
+    def load(self, history_id: str, max_turns: Optional[int] = HISTORY_WINDOW) -> List[Tuple[str, str]]:
+        """
+            Return the last max_turns (input, output) turns, oldest first.
+        """
+        return [(input_context, output_context) for input_context, output_context, _ in self.load_sequenced(history_id, max_turns)]
+
+    def load_sequenced(self, history_id: str, max_turns: Optional[int] = HISTORY_WINDOW) -> List[Tuple[str, str, int]]:
+        """
+            Return the last max_turns (input, output, sequence) turns, oldest first.
+            The sequence of a turn is the offset of its line, it increases with every appended turn.
+        """
+        path = self._path(history_id)
+        if not os.path.exists(path):
+            legacy_path = os.path.join(self.directory, f"{history_id}.json")
+            if not os.path.exists(legacy_path):
+                return []
+            with io.open(path, "a", encoding="utf-8") as file:
+                fcntl.flock(file, fcntl.LOCK_EX)
+                try:
+                    self._migrate(history_id, file)
+                finally:
+                    fcntl.flock(file, fcntl.LOCK_UN)
+        with open(path, "rb") as file:
+            fcntl.flock(file, fcntl.LOCK_SH)
+            try:
+                lines = self._tail(file, max_turns)
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
+        turns = []
+        for offset, line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            turns.append((record["input"], record["output"], offset))
+        return turns
+
+    def load_state(self, history_id: str) -> dict:
+        """
+            Return the memory state (e.g. rolling summary) saved with a history, {} if none.
+        """
+        try:
+            with open(os.path.join(self.directory, f"{history_id}.state.json"), encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def save_state(self, history_id: str, state: dict):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{history_id}.state.json")
+        temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(state, file, ensure_ascii=False)
+        # readers see either the previous or the new state, never a partial one
+        os.replace(temporary_path, path)
+
+    #read the last count (offset, line) lines, block by block from the end of the file
+    def _tail(self, file, count: Optional[int]) -> List[Tuple[int, bytes]]:
+        position = 0
+        if not count:
+            buffer = file.read()
+        else:
+            file.seek(0, os.SEEK_END)
+            position = file.tell()
+            buffer = b""
+            while position > 0 and buffer.count(b"\n") <= count:
+                size = min(_BLOCK_SIZE, position)
+                position -= size
+                file.seek(position)
+                buffer = file.read(size) + buffer
+        lines = []
+        offset = position
+        for line in buffer.split(b"\n"):
+            lines.append((offset, line))
+            offset += len(line) + 1
+        if position > 0:
+            # the first line may start before the block
+            lines = lines[1:]
+        lines = [(offset, line) for offset, line in lines if line.strip()]
+        return lines[-count:] if count else lines
+
+
+class SQLiteHistoryStore:
+    """
+        One history.sqlite3 database per directory, one row per turn.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, "history.sqlite3")
+        self._local = threading.local()
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS turns ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, history_id TEXT NOT NULL, "
+                "input TEXT NOT NULL, output TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS turns_history_id ON turns (history_id, id)")
+            connection.execute("CREATE TABLE IF NOT EXISTS states (history_id TEXT PRIMARY KEY, state TEXT NOT NULL)")
+
+    #sqlite connections can not be shared between threads
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    #import the <historyId>.json file of the previous format, once
+    def _migrate(self, history_id: str) -> bool:
+        legacy_path = os.path.join(self.directory, f"{history_id}.json")
+        if not os.path.exists(legacy_path):
+            return False
+        try:
+            with open(legacy_path, encoding="utf-8") as legacy:
+                turns = legacy_turns(json.load(legacy), history_id)
+        except (OSError, ValueError) as error:
+            logging.warning(f"Could not migrate history {legacy_path}: {error}")
+            return False
+        connection = self._connection()
+        with connection:
+            # BEGIN IMMEDIATE takes the write lock, so that concurrent readers migrate only once
+            connection.execute("BEGIN IMMEDIATE")
+            if connection.execute("SELECT 1 FROM turns WHERE history_id = ? LIMIT 1", (history_id,)).fetchone():
+                return True
+            now = time.time()
+            connection.executemany(
+                "INSERT INTO turns (history_id, input, output, created_at) VALUES (?, ?, ?, ?)",
+                [(history_id, input_context, output_context, now) for input_context, output_context in turns]
+            )
+        return bool(turns)
+
+    def append(self, history_id: str, input_context: str, output_context: str) -> int:
+        """
+            Append a turn and return its sequence, the id of its row.
+        """
+        connection = self._connection()
+        with connection:
+            cursor = connection.execute(
+                "INSERT INTO turns (history_id, input, output, created_at) VALUES (?, ?, ?, ?)",
+                (history_id, input_context, output_context, time.time())
+            )
+        return cursor.lastrowid
+
+    def load(self, history_id: str, max_turns: Optional[int] = HISTORY_WINDOW) -> List[Tuple[str, str]]:
+        """
+            Return the last max_turns (input, output) turns, oldest first.
+        """
+        return [(input_context, output_context) for input_context, output_context, _ in self.load_sequenced(history_id, max_turns)]
+
+    def load_sequenced(self, history_id: str, max_turns: Optional[int] = HISTORY_WINDOW) -> List[Tuple[str, str, int]]:
+        """
+            Return the last max_turns (input, output, sequence) turns, oldest first.
+            The sequence of a turn is the id of its row, it increases with every appended turn.
+        """
+        rows = self._connection().execute(
+            "SELECT input, output, id FROM turns WHERE history_id = ? ORDER BY id DESC LIMIT ?",
+            (history_id, max_turns or -1)
+        ).fetchall()
+        if not rows and self._migrate(history_id):
+            return self.load_sequenced(history_id, max_turns)
+        return [(input_context, output_context, sequence) for input_context, output_context, sequence in reversed(rows)]
+
+    def load_state(self, history_id: str) -> dict:
+        """
+            Return the memory state (e.g. rolling summary) saved with a history, {} if none.
+        """
+        row = self._connection().execute("SELECT state FROM states WHERE history_id = ?", (history_id,)).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def save_state(self, history_id: str, state: dict):
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO states (history_id, state) VALUES (?, ?)",
+                (history_id, json.dumps(state, ensure_ascii=False))
+            )
+
+
+_VALID_BACKENDS = {"jsonl": JSONLHistoryStore, "sqlite": SQLiteHistoryStore}
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_history_store(directory: str, backend: Optional[str] = None):
+    """
+        Return the history store of a directory, backend is "jsonl" (default) or "sqlite".
+    """
+    backend = backend or HISTORY_BACKEND
+    if backend not in _VALID_BACKENDS:
+        raise ValueError(f"Invalid history backend '{backend}'. Valid backends are: {', '.join(_VALID_BACKENDS)}")
+    with _stores_lock:
+        key = (backend, directory)
+        if key not in _stores:
+            _stores[key] = _VALID_BACKENDS[backend](directory)
+        return _stores[key]
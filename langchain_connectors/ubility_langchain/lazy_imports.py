@@ -0,0 +1,46 @@
+#####################################################################################
+# Provider SDKs are imported the first time a flow uses them, not when we are loaded.#
+#####################################################################################
+import importlib
+import logging
+import os
+import threading
+import time
+
+
+# Seconds a single provider import may take before a warning is logged
+IMPORT_TIME_BUDGET = float(os.environ.get("UBILITY_IMPORT_TIME_BUDGET", 1.0))
+
+# Seconds spent importing each provider class, e.g. {"langchain_openai.ChatOpenAI": 0.84}
+import_times = {}
+
+_classes = {}
+_classes_lock = threading.Lock()
+
+
+def load_class(module: str, name: str, package: str = None):
+    """
+        Import a provider module on first use and return one of its attributes.
+
+        Example:
+            .. code-block:: python
+
+                ChatOpenAI = load_class("langchain_openai", "ChatOpenAI")
+    """
+    key = f"{module}.{name}"
+    cls = _classes.get(key)
+    if cls is not None:
+        return cls
+    with _classes_lock:
+        cls = _classes.get(key)
+        if cls is None:
+            start = time.perf_counter()
+            cls = getattr(importlib.import_module(module, package), name)
+            elapsed = time.perf_counter() - start
+            import_times[key] = elapsed
+            if elapsed > IMPORT_TIME_BUDGET:
+                logging.warning(f"Importing {key} took {elapsed:.2f}s, over the {IMPORT_TIME_BUDGET:.2f}s budget")
+            else:
+                logging.info(f"Imported {key} in {elapsed:.2f}s")
+            _classes[key] = cls
+    return cls
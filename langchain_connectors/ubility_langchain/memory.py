@@ -0,0 +1,202 @@
+######################################################################################
+# Conversation memory capped by tokens: a sliding window, a rolling summary or both. #
+######################################################################################
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import (Any,Dict,List,Optional,Tuple)
+
+from langchain.memory import ConversationBufferMemory
+from langchain.memory.chat_memory import BaseChatMemory
+from langchain_core.messages import BaseMessage, SystemMessage
+
+
+_VALID_MEMORY_TYPES = {
+    "ConversationBufferMemory": "buffer",
+    "ConversationTokenBufferMemory": "window",
+    "ConversationSummaryMemory": "summary",
+    "ConversationSummaryBufferMemory": "hybrid"
+}
+DEFAULT_MAX_TOKEN_LIMIT = 2000
+MAX_CACHED_TOKEN_COUNTS = 50000
+
+SUMMARY_PROMPT = """Progressively summarize the lines of conversation provided, adding onto the previous summary and returning a new summary.
+
+Current summary:
+{summary}
+
+New lines of conversation:
+{new_lines}
+
+New summary:"""
+
+_token_counts = OrderedDict()
+_token_counts_lock = threading.Lock()
+
+
+def count_tokens(llm, message: BaseMessage) -> int:
+    """
+        Number of tokens of a message for a model, computed once per (model, message type, content).
+    """
+    model_name = getattr(llm, "model_name", None) or getattr(llm, "model", None) or type(llm).__name__
+    key = (str(model_name), message.type, hashlib.sha256(str(message.content).encode("utf-8")).hexdigest())
+    with _token_counts_lock:
+        count = _token_counts.get(key)
+        if count is not None:
+            _token_counts.move_to_end(key)
+            return count
+    try:
+        count = llm.get_num_tokens_from_messages([message])
+    except Exception:
+        # the provider has no tokenizer available, use the usual 4 characters per token estimate
+        count = len(str(message.content)) // 4 + 1
+    with _token_counts_lock:
+        _token_counts[key] = count
+        while len(_token_counts) > MAX_CACHED_TOKEN_COUNTS:
+            _token_counts.popitem(last=False)
+    return count
+
+
+class TokenBudgetMemory(BaseChatMemory):
+    """
+        Chat memory keeping at most max_token_limit tokens of history.
+
+        - window: the most recent turns that fit in the budget, older turns are dropped
+        - summary: every turn is folded into a rolling summary
+        - hybrid: the most recent turns that fit in the budget, older turns are folded into the summary
+
+        The summary is extended incrementally with the turns leaving the window only,
+        state() returns what has to be persisted so that the next call does not summarize them again:
+        the sequence in the history store of the last summarized turn.
+        The turn saved by the current call has no sequence until it is appended to the history store,
+        set_sequence() gives it its sequence.
+    """
+
+    llm: Any
+    mode: str = "window"
+    max_token_limit: int = DEFAULT_MAX_TOKEN_LIMIT
+    memory_key: str = "history"
+    return_messages: bool = True
+    summary: str = ""
+    last_summarized_sequence: Optional[int] = None
+    # sequence of every turn of chat_memory, None for the turns not read from the history store
+    turn_sequences: List[Optional[int]] = []
+    # the turn saved by the current call was summarized before its sequence was known
+    pending_summarized: bool = False
+    callbacks: Optional[List[Any]] = None
+
+    @property
+    def memory_variables(self) -> List[str]:
+        return [self.memory_key]
+
+    def load_memory_variables(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        messages = list(self.chat_memory.messages)
+        if self.summary:
+            messages.insert(0, SystemMessage(content=f"Summary of the earlier conversation: {self.summary}"))
+        return {self.memory_key: messages}
+
+    def load_turns(self, turns: List[Tuple], state: Dict[str, Any]):
+        """
+            Fill the memory with stored turns, skipping the ones the persisted summary already covers.
+
+            turns are (input, output) or (input, output, sequence) tuples, oldest first, the turns without
+            sequence (e.g. the context of the request) come before the ones read from the history store.
+        """
+        self.summary = state.get("summary", "")
+        self.last_summarized_sequence = state.get("lastSummarizedSequence")
+        start = 0
+        if self.last_summarized_sequence is not None:
+            for index, turn in enumerate(turns):
+                sequence = turn[2] if len(turn) > 2 else None
+                if sequence is None:
+                    continue
+                if sequence > self.last_summarized_sequence:
+                    # the turns without sequence were before the summarized ones
+                    start = max(start, index)
+                    break
+                start = index + 1
+        for turn in turns[start:]:
+            self.chat_memory.add_user_message(turn[0])
+            self.chat_memory.add_ai_message(turn[1])
+            self.turn_sequences.append(turn[2] if len(turn) > 2 else None)
+        self.prune()
+
+    def save_context(self, inputs: Dict[str, Any], outputs: Dict[str, str]) -> None:
+        super().save_context(inputs, outputs)
+        self.turn_sequences.append(None)
+        self.prune(saved_turn=True)
+
+    def set_sequence(self, sequence: int):
+        """
+            Give the turn saved by the current call the sequence it was appended with to the history store.
+        """
+        if self.turn_sequences and self.turn_sequences[-1] is None:
+            self.turn_sequences[-1] = sequence
+        if self.pending_summarized:
+            self.last_summarized_sequence = sequence
+            self.pending_summarized = False
+
+    def prune(self, saved_turn: bool = False):
+        messages = self.chat_memory.messages
+        turns = [messages[index:index + 2] for index in range(0, len(messages), 2)]
+        kept = 0
+        if self.mode != "summary":
+            total = 0
+            for turn in reversed(turns):
+                total += sum(count_tokens(self.llm, message) for message in turn)
+                if total > self.max_token_limit:
+                    break
+                kept += 1
+        pruned = turns[:len(turns) - kept]
+        if not pruned:
+            return
+        pruned_sequences = self.turn_sequences[:len(pruned)]
+        if self.mode in ("summary", "hybrid"):
+            self.summary = self._summarize([message for turn in pruned for message in turn])
+            sequences = [sequence for sequence in pruned_sequences if sequence is not None]
+            if sequences:
+                self.last_summarized_sequence = max(sequences)
+            if saved_turn and len(pruned) == len(turns):
+                self.pending_summarized = True
+        self.chat_memory.messages = [message for turn in turns[len(pruned):] for message in turn]
+        self.turn_sequences = self.turn_sequences[len(pruned):]
+
+    def _summarize(self, messages: List[BaseMessage]) -> str:
+        new_lines = "\n".join(f"{'Human' if message.type == 'human' else 'AI'}: {message.content}" for message in messages)
+        logging.info(f"Summarizing {len(messages)} messages")
+        # the callbacks of the chain count the summary tokens and log the call
+        result = self.llm.invoke(
+            SUMMARY_PROMPT.format(summary=self.summary, new_lines=new_lines),
+            config={"callbacks": self.callbacks} if self.callbacks else None
+        )
+        return getattr(result, "content", result)
+
+    def state(self) -> Dict[str, Any]:
+        return {"summary": self.summary, "lastSummarizedSequence": self.last_summarized_sequence}
+
+
+def create_memory(memory_params: dict, llm, turns: List[Tuple], state: Dict[str, Any] = {}, callbacks: Optional[List[Any]] = None):
+    """
+        Build the memory of a chain from its memory params and stored turns, see TokenBudgetMemory.load_turns.
+        callbacks (e.g. the LogsCallbackHandler and TokenCounter of the chain) are passed to the summary calls.
+
+        memory_params:
+            - type: ConversationBufferMemory (every turn, default), ConversationTokenBufferMemory (window),
+              ConversationSummaryMemory (summary) or ConversationSummaryBufferMemory (hybrid)
+            - maxTokenLimit: token budget of the window (default is 2000)
+    """
+    mode = _VALID_MEMORY_TYPES.get(memory_params.get("type"), "buffer")
+    if mode == "buffer":
+        memory = ConversationBufferMemory(memory_key="history", return_messages=True)
+        for turn in turns:
+            memory.save_context({"input": turn[0]}, {"output": turn[1]})
+        return memory
+    memory = TokenBudgetMemory(
+        llm=llm,
+        mode=mode,
+        max_token_limit=int(memory_params.get("maxTokenLimit", DEFAULT_MAX_TOKEN_LIMIT)),
+        callbacks=callbacks
+    )
+    memory.load_turns(turns, state)
+    return memory
@@ -15,23 +15,62 @@ import logging
 from typing import (Any,Callable,Dict,Generator,Iterable,List,Optional,Tuple,Type)
 import os
 import types
+import hashlib
+import json
+import threading
+from collections import OrderedDict
 
 
-from langchain_openai import OpenAIEmbeddings, ChatOpenAI
-from langchain_community.embeddings import OllamaEmbeddings
-from langchain_community.chat_models.ollama import ChatOllama
-from langchain_anthropic import ChatAnthropic
-from langchain_aws import ChatBedrock
-from langchain_community.chat_models.google_palm import ChatGooglePalm
-from langchain_openai import AzureChatOpenAI
-from langchain_mistralai import ChatMistralAI
-from langchain_cohere import ChatCohere
-from langchain_together import ChatTogether
-from langchain_community.llms.huggingface_endpoint import HuggingFaceEndpoint
-from langchain_community.chat_models.huggingface import ChatHuggingFace
-from langchain_google_vertexai import ChatVertexAI
+# Provider SDKs are imported by load_class when the provider is actually used
+from .lazy_imports import load_class
+from .embedding_cache import CachedEmbeddings
 
 
+# Chat and embedding clients kept by the process, reusing their HTTP/boto3/gRPC connections
+MAX_CACHED_CLIENTS = 32
+
+_clients = OrderedDict()
+_clients_lock = threading.Lock()
+
+
+def fingerprint(data) -> str:
+    """
+        Hash credentials or params so that they can be part of a cache key without being kept.
+    """
+    raw = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def get_cached_client(key: tuple):
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is not None:
+            _clients.move_to_end(key)
+        return client
+
+
+def cache_client(key: tuple, client):
+    with _clients_lock:
+        _clients[key] = client
+        _clients.move_to_end(key)
+        while len(_clients) > MAX_CACHED_CLIENTS:
+            _clients.popitem(last=False)
+    return client
+
+
+def invalidate_clients(provider: Optional[str] = None, credentials: Optional[dict] = None):
+    """
+        Drop the cached clients of a provider and/or of a set of credentials, e.g. after a key was revoked.
+        Without arguments every cached client is dropped.
+    """
+    credentials_fingerprint = fingerprint(credentials) if credentials is not None else None
+    with _clients_lock:
+        for key in list(_clients):
+            if provider is not None and key[1] != provider:
+                continue
+            if credentials_fingerprint is not None and key[3] != credentials_fingerprint:
+                continue
+            del _clients[key]
 
 
 class Model:
@@ -106,6 +145,9 @@ class Model:
             logging.info("It is an vertexAi provider")
             self._setup_vertexAi(self.credentials)
             
+    #key of the cached client, built from the provider, model, credentials and optionals
+    def _cache_key(self, kind):
+        return (kind, self.provider, self.model, fingerprint(self.credentials), fingerprint(self.params))
 
     #set up openAi object 
     def _setup_openAi(self,cred):
@@ -243,18 +285,30 @@ class Model:
         logging.info("Create embedding model")
         try:
             if self.provider in _VALID_EMBEDDING_PROVIDERS:
+                key = self._cache_key("embedding")
+                response = get_cached_client(key)
+                if response is not None:
+                    return response
                 optionals = self.params
                 if self.provider == "openAi":
+                    OpenAIEmbeddings = load_class("langchain_openai", "OpenAIEmbeddings")
                     response = OpenAIEmbeddings(openai_api_key= self.api_key,model=self.model,**optionals)
                 elif self.provider == "ollama":
+                    OllamaEmbeddings = load_class("langchain_community.embeddings", "OllamaEmbeddings")
                     response = OllamaEmbeddings(base_url=self.base_url,model=self.model,**optionals)
-                return response
+                return cache_client(key, response)
             else:
                 raise ValueError(f"Invalid method for provider '{self.provider}'. Valid providers for embedding method are: {', '.join(_VALID_EMBEDDING_PROVIDERS)}")
         except ValueError as error:
             raise ValueError(error)
         except Exception as error:
             raise Exception(error)
+
+    def cached_embedding(self):
+        """
+            Embedding model whose vectors are cached by content hash, so that unchanged texts are embedded only once.
+        """
+        return CachedEmbeddings(self.embedding(), namespace=f"{self.provider}:{self.model}:{fingerprint(self.params)}")
         
     def chat(self):
         """
@@ -264,32 +318,48 @@ class Model:
         logging.info("Create chat model")
         try:
             if self.provider in _VALID_CHAT_PROVIDERS:
+                key = self._cache_key("chat")
+                llm = get_cached_client(key)
+                if llm is not None:
+                    return llm
                 optionals = self.params["optionals"]
                 if self.provider == "openAi":
+                    ChatOpenAI = load_class("langchain_openai", "ChatOpenAI")
                     llm = ChatOpenAI(model=self.model, api_key=self.api_key,**optionals)
                 elif self.provider == "ollama":
+                    ChatOllama = load_class("langchain_community.chat_models.ollama", "ChatOllama")
                     llm = ChatOllama(model=self.model, base_url=self.base_url,**optionals)
                 elif self.provider == "anthropic":
+                    ChatAnthropic = load_class("langchain_anthropic", "ChatAnthropic")
                     llm = ChatAnthropic(model=self.model, anthropic_api_key=self.api_key,**optionals)
                 elif self.provider == "awsBedrock":
+                    ChatBedrock = load_class("langchain_aws", "ChatBedrock")
                     llm = ChatBedrock(region_name=self.region_name, model_id=self.model, model_kwargs=optionals)
                 elif self.provider == "googlePaLMGemini":
+                    ChatGooglePalm = load_class("langchain_community.chat_models.google_palm", "ChatGooglePalm")
                     llm = ChatGooglePalm(google_api_key=self.api_key, model_name=self.model, **optionals)
                 elif self.provider == "azureOpenAi":
+                    AzureChatOpenAI = load_class("langchain_openai", "AzureChatOpenAI")
                     llm = AzureChatOpenAI(api_key=self.api_key, model=self.model, **optionals)
                 elif self.provider == "mistralAi":
+                    ChatMistralAI = load_class("langchain_mistralai", "ChatMistralAI")
                     llm = ChatMistralAI(api_key=self.api_key, model_name=self.model, **optionals)
                 elif self.provider == "cohere":
+                    ChatCohere = load_class("langchain_cohere", "ChatCohere")
                     llm = ChatCohere(cohere_api_key=self.api_key, model=self.model, **optionals)
                 elif self.provider == "togetherAi":
+                    ChatTogether = load_class("langchain_together", "ChatTogether")
                     llm = ChatTogether(api_key=self.api_key, model=self.model, **optionals)
                 elif self.provider == "huggingFace":
+                    HuggingFaceEndpoint = load_class("langchain_community.llms.huggingface_endpoint", "HuggingFaceEndpoint")
                     llm_model = HuggingFaceEndpoint(huggingfacehub_api_token=self.api_token, endpoint_url=self.params["endpoint"], model=self.model, **optionals)
+                    ChatHuggingFace = load_class("langchain_community.chat_models.huggingface", "ChatHuggingFace")
                     llm = ChatHuggingFace(llm=llm_model)
                 elif self.provider == "vertexAi":
                     kwargs=self.kwargs
+                    ChatVertexAI = load_class("langchain_google_vertexai", "ChatVertexAI")
                     llm = ChatVertexAI(model_name=self.model, **kwargs)
-                return llm
+                return cache_client(key, llm)
             else:
                 raise ValueError(f"Invalid method for provider '{self.provider}'. Valid providers for chat method are: {', '.join(_VALID_CHAT_PROVIDERS)}")
         except ValueError as error:
@@ -0,0 +1,71 @@
+#################################################################################
+# The record index remembers which chunks of each source are in a vector store.#
+#################################################################################
+import os
+import sqlite3
+import threading
+from typing import (Dict,Iterable,List)
+from decouple import config
+
+
+RECORD_INDEX_PATH = config("RECORD_INDEX_PATH", default="/app/robotfiles/UbilityLibraries/record_index/records.sqlite3")
+
+
+class RecordIndex:
+    """
+        SQLite table mapping (vector store namespace, source id) to the hashes and vector ids of its chunks.
+
+        The namespace identifies one collection of one vector store, the source id one loaded document.
+    """
+
+    def __init__(self, path: str = RECORD_INDEX_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS records ("
+                "namespace TEXT NOT NULL, source_id TEXT NOT NULL, chunk_hash TEXT NOT NULL, vector_id TEXT NOT NULL, "
+                "PRIMARY KEY (namespace, source_id, chunk_hash))"
+            )
+
+    #sqlite connections can not be shared between threads
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, namespace: str, source_id: str) -> Dict[str, str]:
+        """
+            Return the chunks of a source as {chunk hash: vector id}.
+        """
+        rows = self._connection().execute(
+            "SELECT chunk_hash, vector_id FROM records WHERE namespace = ? AND source_id = ?",
+            (namespace, source_id)
+        )
+        return dict(rows)
+
+    def sources(self, namespace: str) -> List[str]:
+        rows = self._connection().execute("SELECT DISTINCT source_id FROM records WHERE namespace = ?", (namespace,))
+        return [row[0] for row in rows]
+
+    def update(self, namespace: str, source_id: str, added: Dict[str, str], deleted: Iterable[str]):
+        """
+            Record the chunks written for a source and forget the deleted ones, in one transaction.
+        """
+        connection = self._connection()
+        with connection:
+            connection.executemany(
+                "DELETE FROM records WHERE namespace = ? AND source_id = ? AND chunk_hash = ?",
+                [(namespace, source_id, chunk_hash) for chunk_hash in deleted]
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO records (namespace, source_id, chunk_hash, vector_id) VALUES (?, ?, ?, ?)",
+                [(namespace, source_id, chunk_hash, vector_id) for chunk_hash, vector_id in added.items()]
+            )
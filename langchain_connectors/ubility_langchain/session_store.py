@@ -0,0 +1,90 @@
+###################################################################################
+# In-process chat sessions, bounded by count, idle time and messages per session. #
+###################################################################################
+import threading
+import time
+from collections import OrderedDict
+from decouple import config
+
+
+SESSION_MAX = config("LANGCHAIN_SESSION_MAX", default=1000, cast=int)
+SESSION_TTL = config("LANGCHAIN_SESSION_TTL", default=1800, cast=int)
+SESSION_MAX_MESSAGES = config("LANGCHAIN_SESSION_MAX_MESSAGES", default=200, cast=int)
+
+
+class SessionStore:
+    """
+        Dict-like LRU/TTL cache of chat histories keyed by session id.
+
+        Sessions idle for more than ttl seconds are dropped, the least recently used ones are
+        dropped beyond max_sessions, and each history keeps at most max_messages messages.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = SESSION_MAX,
+        ttl: float = SESSION_TTL,
+        max_messages: int = SESSION_MAX_MESSAGES
+        ):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.max_messages = max_messages
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    #drop the expired sessions, they are the least recently used ones
+    def _expire(self, now):
+        while self._sessions:
+            session_id, (_, last_used) = next(iter(self._sessions.items()))
+            if now - last_used <= self.ttl:
+                break
+            del self._sessions[session_id]
+
+    def _trim(self, history):
+        messages = getattr(history, "messages", None)
+        if self.max_messages and messages is not None and len(messages) > self.max_messages:
+            history.messages = messages[-self.max_messages:]
+        return history
+
+    def __setitem__(self, session_id, history):
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            self._sessions[session_id] = (self._trim(history), now)
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def get(self, session_id, default=None):
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return default
+            self._sessions[session_id] = (self._trim(entry[0]), now)
+            self._sessions.move_to_end(session_id)
+            return entry[0]
+
+    def __getitem__(self, session_id):
+        history = self.get(session_id)
+        if history is None:
+            raise KeyError(session_id)
+        return history
+
+    def __contains__(self, session_id):
+        return self.get(session_id) is not None
+
+    def __len__(self):
+        with self._lock:
+            self._expire(time.monotonic())
+            return len(self._sessions)
+
+    def pop(self, session_id, default=None):
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+        return default if entry is None else entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._sessions.clear()
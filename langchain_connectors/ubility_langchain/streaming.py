@@ -0,0 +1,252 @@
+#####################################################################################
+# Streamed tokens go through one shared socketio connection, coalesced into frames. #
+#####################################################################################
+import atexit
+import logging
+import threading
+import time
+import uuid
+from decouple import config
+
+import socketio
+
+
+STREAMING_URL = config("LANGCHAIN_STREAMING_URL", default="")
+# a frame is sent once its oldest token waited FLUSH_INTERVAL seconds or it holds FRAME_SIZE characters
+FLUSH_INTERVAL = config("LANGCHAIN_STREAMING_FLUSH_INTERVAL", default=0.05, cast=float)
+FRAME_SIZE = config("LANGCHAIN_STREAMING_FRAME_SIZE", default=1024, cast=int)
+# characters kept per conversation while the link is down, the oldest ones are dropped beyond it
+MAX_PENDING = config("LANGCHAIN_STREAMING_MAX_PENDING", default=1048576, cast=int)
+# seconds a closing stream waits for the client to reconnect before dropping its last frame
+CLOSE_TIMEOUT = config("LANGCHAIN_STREAMING_CLOSE_TIMEOUT", default=5.0, cast=float)
+
+
+class ConversationStream:
+    """
+        Buffer of the tokens of one conversation, flushed as frames by the emitter.
+        Use it as a context manager so that the last frame is sent and the stream released.
+    """
+
+    def __init__(self, emitter, conversation_id: str):
+        self.emitter = emitter
+        self.conversation_id = conversation_id
+        self._parts = []
+        self._size = 0
+        self._first_token_at = None
+        self._dropped = 0
+        self._lock = threading.Lock()
+        # keeps the frames in order when the flusher thread and close() flush at the same time
+        self._flush_lock = threading.Lock()
+
+    def send(self, text: str):
+        if not text:
+            return
+        with self._lock:
+            if self._first_token_at is None:
+                self._first_token_at = time.monotonic()
+            self._parts.append(text)
+            self._size += len(text)
+            self._trim()
+            full = self._size >= self.emitter.frame_size
+        if full:
+            # the flusher thread sends it, the producer never waits on the socket
+            self.emitter.wake()
+
+    def due(self, now: float) -> bool:
+        with self._lock:
+            if self._size >= self.emitter.frame_size:
+                return True
+            return self._first_token_at is not None and now - self._first_token_at >= self.emitter.flush_interval
+
+    def flush(self, wait: bool = True):
+        # the buffer is swapped out under the lock and sent outside of it, so that send() never waits on the socket;
+        # without wait, a frame already being sent by another thread leaves the tokens for the next flush
+        if not self._flush_lock.acquire(blocking=wait):
+            return
+        try:
+            with self._lock:
+                if not self._parts:
+                    return
+                parts, size, first_token_at = self._parts, self._size, self._first_token_at
+                self._parts = []
+                self._size = 0
+                self._first_token_at = None
+            if self.emitter.emit("".join(parts), self.conversation_id):
+                self._report_dropped()
+                return
+            with self._lock:
+                # keep the tokens, they go with the next frame once reconnected
+                self._parts = parts + self._parts
+                self._size += size
+                self._first_token_at = first_token_at
+                self._trim()
+        finally:
+            self._flush_lock.release()
+
+    def _trim(self):
+        # caller holds self._lock
+        while self._size > self.emitter.max_pending and len(self._parts) > 1:
+            part = self._parts.pop(0)
+            self._size -= len(part)
+            self._dropped += len(part)
+
+    def _report_dropped(self):
+        with self._lock:
+            dropped, self._dropped = self._dropped, 0
+        if dropped:
+            logging.warning(f"{dropped} streamed characters of conversation {self.conversation_id} dropped while disconnected")
+
+    def close(self, timeout: float = None):
+        """
+            Release the stream and send its last frame, waiting up to timeout seconds (default is the
+            emitter close_timeout) for the client to reconnect before dropping it.
+        """
+        self.emitter.release(self)
+        deadline = time.monotonic() + (self.emitter.close_timeout if timeout is None else timeout)
+        while True:
+            self.flush()
+            with self._lock:
+                if not self._parts:
+                    break
+            if not self.emitter.wait_connected(deadline - time.monotonic()):
+                break
+        self._report_dropped()
+        with self._lock:
+            if self._parts:
+                logging.warning(f"{self._size} streamed characters of conversation {self.conversation_id} could not be sent")
+                self._parts = []
+                self._size = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class StreamingEmitter:
+    """
+        One socketio client per process multiplexing the streamed answers of every conversation.
+
+        The client connects on first use, then socketio reconnects it by itself: frames emitted while
+        it is disconnected stay in their stream buffer, capped at max_pending characters.
+        Each frame carries its conversation_id, and a background thread sends the frames that are full or whose tokens waited more than flush_interval.
+
+        The connection is shared by every conversation, so it only sends the client_id header:
+        unlike the previous one connection per answer, there is no conversation_id connection header anymore,
+        the gateway has to route on the conversation_id of each frame.
+    """
+
+    def __init__(self, url: str = STREAMING_URL, flush_interval: float = FLUSH_INTERVAL, frame_size: int = FRAME_SIZE, max_pending: int = MAX_PENDING, close_timeout: float = CLOSE_TIMEOUT):
+        self.url = url
+        self.flush_interval = flush_interval
+        self.frame_size = frame_size
+        self.max_pending = max_pending
+        self.close_timeout = close_timeout
+        self.client_id = str(uuid.uuid4())
+        self._client = socketio.Client(reconnection=True)
+        self._connect_lock = threading.Lock()
+        self._streams = set()
+        self._streams_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._wake_event = threading.Event()
+        self._flusher = None
+
+    def _ensure_connected(self):
+        # connect once, the reconnections are left to socketio (reconnection=True)
+        if self._flusher is not None:
+            return
+        with self._connect_lock:
+            if self._flusher is None:
+                self._client.connect(self.url, headers={'client_id': self.client_id})
+                self._flusher = threading.Thread(target=self._flush_loop, name="streaming-emitter", daemon=True)
+                self._flusher.start()
+
+    def open(self, conversation_id: str) -> ConversationStream:
+        self._ensure_connected()
+        stream = ConversationStream(self, conversation_id)
+        with self._streams_lock:
+            self._streams.add(stream)
+        return stream
+
+    def release(self, stream: ConversationStream):
+        with self._streams_lock:
+            self._streams.discard(stream)
+
+    def emit(self, message: str, conversation_id: str) -> bool:
+        if not self._client.connected:
+            return False
+        try:
+            self._client.send({'message': message, 'conversation_id': conversation_id})
+            return True
+        except Exception as error:
+            logging.warning(f"Could not stream to conversation {conversation_id}: {error}")
+            return False
+
+    def wait_connected(self, timeout: float) -> bool:
+        # socketio reconnects the client by itself, wait for it up to timeout seconds
+        deadline = time.monotonic() + timeout
+        while not self._client.connected:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(0.05, remaining))
+        return self._client.connected
+
+    def wake(self):
+        self._wake_event.set()
+
+    def _flush_loop(self):
+        while not self._closed.is_set():
+            self._wake_event.wait(self.flush_interval)
+            self._wake_event.clear()
+            now = time.monotonic()
+            with self._streams_lock:
+                streams = list(self._streams)
+            for stream in streams:
+                if stream.due(now):
+                    stream.flush(wait=False)
+
+    def close(self):
+        self._closed.set()
+        self._wake_event.set()
+        with self._streams_lock:
+            streams = list(self._streams)
+        # the streams share one close_timeout to wait for a reconnection
+        deadline = time.monotonic() + self.close_timeout
+        for stream in streams:
+            stream.close(max(deadline - time.monotonic(), 0))
+        if self._client.connected:
+            self._client.disconnect()
+
+
+_emitter = None
+_emitter_lock = threading.Lock()
+
+
+def get_emitter() -> StreamingEmitter:
+    global _emitter
+    with _emitter_lock:
+        if _emitter is None:
+            _emitter = StreamingEmitter()
+        return _emitter
+
+
+def open_stream(conversation_id: str) -> ConversationStream:
+    """
+        Return the stream of a conversation on the shared emitter, to be used as a context manager:
+
+            with open_stream(conv_id) as stream:
+                for chunk in chain.stream(...):
+                    stream.send(chunk.content)
+    """
+    return get_emitter().open(conversation_id)
+
+
+@atexit.register
+def close_emitter():
+    global _emitter
+    with _emitter_lock:
+        emitter, _emitter = _emitter, None
+    if emitter is not None:
+        emitter.close()
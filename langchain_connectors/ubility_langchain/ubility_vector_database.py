@@ -0,0 +1,361 @@
+###################################################################################
+# Ubility vector database: an in-process vector index persisted as .npy segments. #
+###################################################################################
+import fcntl
+import json
+import logging
+import os
+import re
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import (Any,Iterable,List,Optional,Tuple)
+
+import numpy as np
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore as LangchainVectorStore
+
+
+_VECTORS_FILE = "vectors.npy"
+_RECORDS_FILE = "records.json"
+_GENERATION_FILE = "GENERATION"
+_LOCK_FILE = ".lock"
+_QUERY_BATCH_SIZE = 256
+# segments appended since the last compaction, beyond it they are merged into one base file
+_MAX_SEGMENTS = 64
+
+#one lock per collection folder, shared by every instance of the process
+_path_locks = {}
+_path_locks_lock = threading.Lock()
+
+
+def _path_lock(path: str) -> threading.RLock:
+    with _path_locks_lock:
+        return _path_locks.setdefault(os.path.abspath(path), threading.RLock())
+
+
+def _write_atomic(path: str, write):
+    with open(path + ".tmp", "wb") as file:
+        write(file)
+    os.replace(path + ".tmp", path)
+
+
+class UbilityVectorDatabase(LangchainVectorStore):
+    """
+        Local vector store keeping a float32 matrix in memory.
+
+        A collection is a base file (``vectors.npy`` and ``records.json`` holding the texts,
+        metadata and ids) plus the segments appended since, one per add_texts call, and a
+        journal of deleted ids. Writers hold a lock per folder, in the process and on disk
+        (flock), and read what other writers appended before appending their own segment,
+        so instances and processes sharing a folder do not overwrite each other.
+        Segments are merged into a new base file once there are too many of them or once
+        most rows are deleted.
+        One folder holds one collection, so every tenant gets its own folder.
+    """
+
+    _VALID_DISTANCE_STRATEGIES=["cosine","innerProduct"]
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        path: str,
+        distance_strategy: str = "cosine"
+        ):
+        if distance_strategy not in self._VALID_DISTANCE_STRATEGIES:
+            raise ValueError(f"Invalid distance strategy '{distance_strategy}'. Valid strategies are: {', '.join(self._VALID_DISTANCE_STRATEGIES)}")
+        self._embedding = embedding
+        self.path = path
+        self.distance_strategy = distance_strategy
+        self._lock = _path_lock(path)
+        self._reset(generation=None)
+        with self._locked(exclusive=False):
+            pass
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding
+
+    def _reset(self, generation):
+        self._generation = generation
+        # (sequence, vectors, ids, texts, metadatas), the base file is sequence 0
+        self._chunks = []
+        self._last_sequence = 0
+        # deleted id -> last sequence written when it was deleted
+        self._deleted = {}
+        self._journal_offset = 0
+        self._snapshot = None
+
+    def _base_files(self, generation: int) -> Tuple[str, str]:
+        if generation == 0:
+            return os.path.join(self.path, _VECTORS_FILE), os.path.join(self.path, _RECORDS_FILE)
+        return os.path.join(self.path, f"vectors-{generation}.npy"), os.path.join(self.path, f"records-{generation}.json")
+
+    def _journal_file(self, generation: int) -> str:
+        return os.path.join(self.path, f"deleted-{generation}.jsonl")
+
+    def _read_generation(self) -> int:
+        try:
+            with open(os.path.join(self.path, _GENERATION_FILE), "r") as file:
+                return int(file.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def _load_chunk(self, sequence: int, vectors_path: str, records_path: str):
+        with open(records_path, "r") as file:
+            records = json.load(file)
+        if records["distanceStrategy"] != self.distance_strategy:
+            raise ValueError(f"Collection at '{self.path}' was created with distance strategy '{records['distanceStrategy']}'")
+        vectors = np.load(vectors_path, mmap_mode="r")
+        self._chunks.append((sequence, vectors, records["ids"], records["texts"], records["metadatas"]))
+
+    #catch up with what other instances and processes wrote since the last call
+    def _refresh(self):
+        generation = self._read_generation()
+        if generation != self._generation:
+            self._reset(generation)
+            vectors_path, records_path = self._base_files(generation)
+            if os.path.exists(vectors_path) and os.path.exists(records_path):
+                self._load_chunk(0, vectors_path, records_path)
+            self._snapshot = None
+        pattern = re.compile(rf"segment-{generation}-(\d+)\.npy$")
+        sequences = sorted(
+            int(match.group(1)) for match in map(pattern.match, os.listdir(self.path)) if match
+        ) if os.path.isdir(self.path) else []
+        for sequence in sequences:
+            if sequence > self._last_sequence:
+                prefix = os.path.join(self.path, f"segment-{generation}-{sequence}")
+                self._load_chunk(sequence, prefix + ".npy", prefix + ".json")
+                self._last_sequence = sequence
+                self._snapshot = None
+        journal_path = self._journal_file(generation)
+        if os.path.exists(journal_path):
+            with open(journal_path, "rb") as file:
+                file.seek(self._journal_offset)
+                data = file.read()
+            # a line without its newline is still being written
+            complete = data[:data.rfind(b"\n") + 1]
+            for line in complete.splitlines():
+                entry = json.loads(line)
+                self._deleted[entry["id"]] = entry["sequence"]
+            if complete:
+                self._journal_offset += len(complete)
+                self._snapshot = None
+
+    @contextmanager
+    def _locked(self, exclusive: bool = True):
+        with self._lock:
+            os.makedirs(self.path, exist_ok=True)
+            with open(os.path.join(self.path, _LOCK_FILE), "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                try:
+                    self._refresh()
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    #live rows of the collection, rebuilt after a change only
+    def _view(self):
+        if self._snapshot is None:
+            vectors, ids, texts, metadatas = [], [], [], []
+            for sequence, chunk_vectors, chunk_ids, chunk_texts, chunk_metadatas in self._chunks:
+                keep = [index for index, record_id in enumerate(chunk_ids) if self._deleted.get(record_id, -1) < sequence]
+                if not keep:
+                    continue
+                vectors.append(chunk_vectors if len(keep) == len(chunk_ids) else chunk_vectors[keep])
+                ids.extend(chunk_ids[index] for index in keep)
+                texts.extend(chunk_texts[index] for index in keep)
+                metadatas.extend(chunk_metadatas[index] for index in keep)
+            matrix = np.concatenate(vectors).astype(np.float32, copy=False) if len(vectors) > 1 else (vectors[0] if vectors else None)
+            self._snapshot = (matrix, ids, texts, metadatas)
+        return self._snapshot
+
+    def _dimension(self) -> Optional[int]:
+        for _, vectors, _, _, _ in self._chunks:
+            if len(vectors):
+                return vectors.shape[1]
+        return None
+
+    #merge the base file and the segments into the base file of the next generation
+    def _compact(self):
+        matrix, ids, texts, metadatas = self._view()
+        generation = self._generation + 1
+        vectors_path, records_path = self._base_files(generation)
+        # every row was deleted: the new generation has no base file, its dimension is set by the next add
+        if matrix is not None:
+            _write_atomic(vectors_path, lambda file: np.save(file, matrix))
+            _write_atomic(records_path, lambda file: file.write(json.dumps({
+                "distanceStrategy": self.distance_strategy,
+                "ids": ids,
+                "texts": texts,
+                "metadatas": metadatas
+            }).encode("utf-8")))
+        # switching the generation file publishes the new base file in one step
+        _write_atomic(os.path.join(self.path, _GENERATION_FILE), lambda file: file.write(str(generation).encode("utf-8")))
+        previous = self._generation
+        for name in os.listdir(self.path):
+            if name.startswith(f"segment-{previous}-") or name == f"deleted-{previous}.jsonl":
+                os.remove(os.path.join(self.path, name))
+        for old_path in self._base_files(previous):
+            if os.path.exists(old_path):
+                os.remove(old_path)
+        self._refresh()
+        logging.info(f"{self.path} compacted into generation {generation}")
+
+    def _maybe_compact(self):
+        rows = sum(len(chunk[2]) for chunk in self._chunks)
+        if len(self._chunks) - 1 > _MAX_SEGMENTS or (rows and len(self._view()[1]) < rows / 2):
+            self._compact()
+
+    def _prepare(self, vectors) -> np.ndarray:
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        if self.distance_strategy == "cosine":
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            vectors = vectors / norms
+        return vectors
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any
+        ) -> List[str]:
+        """
+            Embed texts and append them to the collection as a new segment.
+
+            Return the ids of the added texts.
+        """
+        texts = list(texts)
+        if not texts:
+            return []
+        metadatas = metadatas or [{} for _ in texts]
+        ids = ids or [str(uuid.uuid4()) for _ in texts]
+        vectors = self._prepare(self._embedding.embed_documents(texts))
+        with self._locked():
+            dimension = self._dimension()
+            if dimension is not None and dimension != vectors.shape[1]:
+                raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match collection dimension {dimension}")
+            prefix = os.path.join(self.path, f"segment-{self._generation}-{self._last_sequence + 1}")
+            # the records go first, a segment is only read once its vectors exist
+            _write_atomic(prefix + ".json", lambda file: file.write(json.dumps({
+                "distanceStrategy": self.distance_strategy,
+                "ids": ids,
+                "texts": texts,
+                "metadatas": metadatas
+            }).encode("utf-8")))
+            _write_atomic(prefix + ".npy", lambda file: np.save(file, vectors))
+            self._refresh()
+            self._maybe_compact()
+        logging.info(f"{len(texts)} vectors added to {self.path}")
+        return ids
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        """
+            Delete vectors by id, the ids are appended to the journal of deleted ids.
+        """
+        if not ids:
+            return False
+        with self._locked():
+            live = set(self._view()[1])
+            to_delete = [record_id for record_id in dict.fromkeys(ids) if record_id in live]
+            if not to_delete:
+                return False
+            with open(self._journal_file(self._generation), "a") as file:
+                file.write("".join(json.dumps({"id": record_id, "sequence": self._last_sequence}) + "\n" for record_id in to_delete))
+            self._refresh()
+            self._maybe_compact()
+        return True
+
+    def batch_search_by_vector(
+        self,
+        embeddings: List[List[float]],
+        k: int = 4
+        ) -> List[List[Tuple[Document, float]]]:
+        """
+            Top k search for several query vectors at once.
+
+            Return one list of (document, score) per query, best match first.
+        """
+        queries = self._prepare(embeddings)
+        with self._locked(exclusive=False):
+            matrix, ids, texts, metadatas = self._view()
+        if matrix is None or len(ids) == 0:
+            return [[] for _ in range(len(queries))]
+        if queries.shape[1] != matrix.shape[1]:
+            raise ValueError(f"Query dimension {queries.shape[1]} does not match collection dimension {matrix.shape[1]}")
+        count = len(ids)
+        k = min(k, count)
+        results = []
+        for start in range(0, len(queries), _QUERY_BATCH_SIZE):
+            scores = queries[start:start + _QUERY_BATCH_SIZE] @ matrix.T
+            if k < count:
+                top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            else:
+                top = np.tile(np.arange(count), (len(scores), 1))
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+            for row, row_scores in zip(top, top_scores):
+                results.append([
+                    (Document(page_content=texts[index], metadata={**metadatas[index], "id": ids[index]}), float(score))
+                    for index, score in zip(row, row_scores)
+                ])
+        return results
+
+    def similarity_search_with_score_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        **kwargs: Any
+        ) -> List[Tuple[Document, float]]:
+        return self.batch_search_by_vector([embedding], k=k)[0]
+
+    def similarity_search_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        **kwargs: Any
+        ) -> List[Document]:
+        return [document for document, _ in self.similarity_search_with_score_by_vector(embedding, k=k)]
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        **kwargs: Any
+        ) -> List[Tuple[Document, float]]:
+        return self.similarity_search_with_score_by_vector(self._embedding.embed_query(query), k=k)
+
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 4,
+        **kwargs: Any
+        ) -> List[Document]:
+        return [document for document, _ in self.similarity_search_with_score(query, k=k)]
+
+    def _select_relevance_score_fn(self):
+        # cosine similarity lies in [-1, 1], inner product is left as is
+        if self.distance_strategy == "cosine":
+            return lambda score: (score + 1.0) / 2.0
+        return lambda score: score
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        path: str = "",
+        distance_strategy: str = "cosine",
+        ids: Optional[List[str]] = None,
+        **kwargs: Any
+        ) -> "UbilityVectorDatabase":
+        vectorstore = cls(embedding=embedding, path=path, distance_strategy=distance_strategy)
+        vectorstore.add_texts(texts, metadatas=metadatas, ids=ids)
+        return vectorstore
@@ -2,23 +2,28 @@
 # A vector store takes care of storing embedded data and performing vector search.#
 ###################################################################################
 import logging
-from typing import (List)
+from typing import (Iterable,List)
 import os
+import hashlib
+import json
+import uuid
 from datetime import datetime
 import base64
 from decouple import config
 
 
-from langchain_community.vectorstores.pgvector import PGVector
-from langchain_community.vectorstores import Milvus
-from langchain_pinecone import PineconeVectorStore
-from langchain_elasticsearch import ElasticsearchStore
-from langchain_community.vectorstores.pinecone import Pinecone as langPinecone
-
-
 from langchain_core.embeddings import Embeddings
 from langchain_core.documents import Document
-from elasticsearch import Elasticsearch
+
+# Vector store SDKs are imported by load_class when the matching type is actually used
+from .lazy_imports import load_class
+from .record_index import RecordIndex
+from .embedding_pipeline import (EMBEDDING_BATCH_SIZE,EMBEDDING_WORKERS,PrecomputedEmbeddings,run_pipeline)
+
+
+UBILITY_VECTOR_DATABASE_PATH = config("UBILITY_VECTOR_DATABASE_PATH", default="/app/robotfiles/UbilityLibraries/vector_database/")
+# metadata hashed with the content of a chunk by incremental upserts: its position in a stable source
+HASH_METADATA_KEYS = ["page", "page_number", "row", "seq", "title"]
 
 
 class VectorStore:
@@ -70,6 +75,9 @@ class VectorStore:
         elif self.type == "elasticSearch":
             logging.info("It is an elasticSearch vector store")
             self._setup_elastic_search(self.credentials, self.params)
+        elif self.type == "ubilityVectorDatabase":
+            logging.info("It is an ubility vector database")
+            self._setup_ubility_vector_database(self.credentials, self.params)
             
 
     #set up postgres object 
@@ -83,6 +91,7 @@ class VectorStore:
                 c_name = params["collectionName"]
                 self.connection_url = "postgresql+psycopg2://"+username+":"+password+"@"+host+":5432/"+database
                 self.collection_name = c_name
+                self.namespace = f"postgres:{host}/{database}/{c_name}"
                 logging.info("--------------Done--------------")
             else:
                 raise Exception("missing Postgres credentials")
@@ -96,6 +105,7 @@ class VectorStore:
                 host = cred["Milvus"]["host"]
                 port = cred["Milvus"]["port"]
                 self.connection_args={"host": host, "port": port}
+                self.namespace = f"milvus:{host}:{port}"
                 logging.info("--------------Done--------------")
             else:
                 raise Exception("missing Milvus credentials")
@@ -108,6 +118,7 @@ class VectorStore:
             if "Pinecone" in cred:
                 self.api_key = cred["Pinecone"]["pineconeApiKey"]
                 self.index_name=params["indexName"]
+                self.namespace = f"pinecone:{self.index_name}"
                 logging.info("--------------Done--------------")
             else:
                 raise Exception("missing Pinecone credentials")
@@ -122,12 +133,26 @@ class VectorStore:
                 self.user = cred["ElasticSearch"]["userName"]
                 self.password = cred["ElasticSearch"]["password"]
                 self.index_name = params["indexName"]
+                self.namespace = f"elasticSearch:{self.cloud_id}/{self.index_name}"
                 logging.info("--------------Done--------------")
             else:
                 raise Exception("missing ElasticSearch credentials")
         except Exception as error:
             raise Exception(error)
 
+    #set up ubility vector database object
+    def _setup_ubility_vector_database(self,cred,params):
+        try:
+            c_name = params["collectionName"]
+            if not c_name or os.sep in c_name or c_name in (".", ".."):
+                raise Exception(f"Invalid collection name '{c_name}'")
+            self.collection_path = os.path.join(UBILITY_VECTOR_DATABASE_PATH, c_name)
+            self.distance_strategy = params.get("distanceStrategy", "cosine")
+            self.namespace = f"ubilityVectorDatabase:{c_name}"
+            logging.info("--------------Done--------------")
+        except Exception as error:
+            raise Exception(error)
+
         
     def insert_data(
         self,
@@ -142,13 +167,21 @@ class VectorStore:
                 documents: Splited data (from text splitter)
                 embedding: numerical representations of texts in a multidimensional space (you can retrieve it from embedding models)
                 params: parameters required while inserting data
+                    - incremental: (bool,optional) only write new or changed chunks and delete the removed ones, see _incremental_insert
+                    - sourceIdKey: (str,optional) metadata key identifying the source of a chunk (default is "source")
+                    - sourceId: (str,optional) source of every chunk, instead of the sourceIdKey metadata
+                    - hashMetadataKeys: (list,optional) metadata keys hashed with the content of a chunk (default is page, page_number, row, seq and title)
+                    - deleteMissingSources: (bool,optional) also delete the chunks of every source absent from documents
                 
             Return VectorStore initialized from documents and embeddings.
 
         """
         logging.info("Insert data in vector store")
         try:
+            if params.get("incremental", False):
+                return self._incremental_insert(documents, embedding, params)
             if self.type == "postgres":
+                PGVector = load_class("langchain_community.vectorstores.pgvector", "PGVector")
                 vectorestore = PGVector.from_documents(
                     embedding=embedding,
                     documents=documents,
@@ -156,6 +189,7 @@ class VectorStore:
                     connection_string=self.connection_url
                     )
             elif self.type == "milvus":
+                Milvus = load_class("langchain_community.vectorstores", "Milvus")
                 vectorestore = Milvus.from_documents(
                     documents=documents,
                     embedding=embedding,
@@ -163,12 +197,14 @@ class VectorStore:
                     )
             elif self.type == "pinecone":
                 os.environ["PINECONE_API_KEY"] = self.api_key
+                PineconeVectorStore = load_class("langchain_pinecone", "PineconeVectorStore")
                 vectorestore = PineconeVectorStore.from_documents(
                     documents=documents,
                     embedding=embedding,
                     index_name=self.index_name
                     )
             elif self.type == "elasticSearch":
+                ElasticsearchStore = load_class("langchain_elasticsearch", "ElasticsearchStore")
                 vectorestore = ElasticsearchStore.from_documents(
                     documents=documents,
                     embedding=embedding,
@@ -177,6 +213,14 @@ class VectorStore:
                     es_user = self.user,
                     es_password = self.password
                     )
+            elif self.type == "ubilityVectorDatabase":
+                UbilityVectorDatabase = load_class(".ubility_vector_database", "UbilityVectorDatabase", __package__)
+                vectorestore = UbilityVectorDatabase.from_documents(
+                    documents=documents,
+                    embedding=embedding,
+                    path=self.collection_path,
+                    distance_strategy=self.distance_strategy
+                    )
 
             return vectorestore
         except ValueError as error:
@@ -185,6 +229,161 @@ class VectorStore:
             raise Exception(error)
         
         
+    #open the existing collection without inserting anything
+    def _open_vectorstore(self, embedding):
+        if self.type == "postgres":
+            PGVector = load_class("langchain_community.vectorstores.pgvector", "PGVector")
+            return PGVector(
+                connection_string=self.connection_url,
+                embedding_function=embedding,
+                collection_name=self.collection_name
+                )
+        elif self.type == "milvus":
+            Milvus = load_class("langchain_community.vectorstores", "Milvus")
+            return Milvus(
+                embedding_function=embedding,
+                connection_args=self.connection_args
+                )
+        elif self.type == "pinecone":
+            os.environ["PINECONE_API_KEY"] = self.api_key
+            PineconeVectorStore = load_class("langchain_pinecone", "PineconeVectorStore")
+            return PineconeVectorStore(
+                index_name=self.index_name,
+                embedding=embedding
+                )
+        elif self.type == "elasticSearch":
+            ElasticsearchStore = load_class("langchain_elasticsearch", "ElasticsearchStore")
+            return ElasticsearchStore(
+                index_name=self.index_name,
+                embedding=embedding,
+                es_cloud_id=self.cloud_id,
+                es_user=self.user,
+                es_password=self.password
+                )
+        elif self.type == "ubilityVectorDatabase":
+            UbilityVectorDatabase = load_class(".ubility_vector_database", "UbilityVectorDatabase", __package__)
+            return UbilityVectorDatabase(
+                embedding=embedding,
+                path=self.collection_path,
+                distance_strategy=self.distance_strategy
+                )
+
+    #open the collection with a writer adding batches whose vectors are already computed
+    def _batch_writer(self, embedding):
+        precomputed = PrecomputedEmbeddings(embedding)
+        vectorestore = self._open_vectorstore(precomputed)
+
+        def write(documents, vectors, ids=None):
+            precomputed.set_vectors([document.page_content for document in documents], vectors)
+            if ids is None:
+                vectorestore.add_documents(documents)
+            else:
+                vectorestore.add_documents(documents, ids=ids)
+
+        return vectorestore, write
+
+    def insert_stream(
+        self,
+        chunks:Iterable[Document],
+        embedding:Embeddings,
+        params: dict = {},
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        max_workers: int = EMBEDDING_WORKERS
+        ):
+        """
+            Insert data in your vector store through the staged pipeline: chunks are pulled lazily,
+            embedded in batches of batch_size on max_workers threads and written batch by batch.
+
+            Args:
+                chunks: Splited data (from text splitter), a generator keeps memory bounded
+                embedding: numerical representations of texts in a multidimensional space (you can retrieve it from embedding models)
+                params: parameters required while inserting data, see insert_data
+
+            Return the VectorStore holding the data, the number of written chunks is kept in self.upsert_result.
+        """
+        logging.info("Insert data in vector store through the embedding pipeline")
+        try:
+            if params.get("incremental", False):
+                return self._incremental_insert(chunks, embedding, params, batch_size, max_workers)
+            vectorestore, write = self._batch_writer(embedding)
+            added = run_pipeline(chunks, embedding, write, batch_size, max_workers)
+            self.upsert_result = {"added": added, "skipped": 0, "deleted": 0}
+            return vectorestore
+        except ValueError as error:
+            raise ValueError(error)
+        except Exception as error:
+            raise Exception(error)
+
+    def _incremental_insert(
+        self,
+        documents:Iterable[Document],
+        embedding:Embeddings,
+        params: dict,
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        max_workers: int = EMBEDDING_WORKERS
+        ):
+        """
+            Upsert documents using the record index instead of re-inserting everything.
+
+            Every chunk needs a stable source id (sourceId, or its sourceIdKey metadata), a ValueError is raised otherwise.
+            Chunks are grouped by source and identified by the hash of their content and of the stable
+            metadata keys only, so that volatile metadata (e.g. temp file paths) does not change the hash.
+            Only the chunks missing from the index are embedded and written, with deterministic ids,
+            and the chunks the index knows but the source no longer has are deleted.
+            The index is updated once the new chunks are written, the counts are kept in self.upsert_result.
+        """
+        source_key = params.get("sourceIdKey", "source")
+        hash_keys = params.get("hashMetadataKeys", HASH_METADATA_KEYS)
+        index = RecordIndex()
+        sources = {}
+        for document in documents:
+            source_id = str(params["sourceId"]) if params.get("sourceId") else str(document.metadata.get(source_key, ""))
+            if not source_id:
+                raise ValueError(
+                    "Incremental upserts need a stable source id: set sourceName in the document loader data, "
+                    f"sourceId in the vector store params or the '{source_key}' metadata of every document"
+                )
+            stable_metadata = {key: document.metadata[key] for key in hash_keys if key in document.metadata}
+            raw = json.dumps([document.page_content, stable_metadata], sort_keys=True, default=str)
+            chunk_hash = hashlib.sha256(raw.encode("utf-8")).hexdigest()
+            # identical chunks of the same source are written once
+            sources.setdefault(source_id, {})[chunk_hash] = document
+        if params.get("deleteMissingSources", False):
+            for source_id in index.sources(self.namespace):
+                sources.setdefault(source_id, {})
+        plan = {}
+        vector_ids = {}
+        for source_id, chunks in sources.items():
+            existing = index.get(self.namespace, source_id)
+            added = {
+                chunk_hash: str(uuid.uuid5(uuid.NAMESPACE_URL, f"{self.namespace}/{source_id}/{chunk_hash}"))
+                for chunk_hash in chunks if chunk_hash not in existing
+            }
+            deleted = {chunk_hash: vector_id for chunk_hash, vector_id in existing.items() if chunk_hash not in chunks}
+            plan[source_id] = (added, deleted)
+            for chunk_hash, vector_id in added.items():
+                vector_ids[id(chunks[chunk_hash])] = vector_id
+        vectorestore, write = self._batch_writer(embedding)
+        new_documents = (sources[source_id][chunk_hash] for source_id, (added, _) in plan.items() for chunk_hash in added)
+        run_pipeline(
+            new_documents,
+            embedding,
+            lambda batch, vectors: write(batch, vectors, [vector_ids[id(document)] for document in batch]),
+            batch_size,
+            max_workers
+        )
+        result = {"added": 0, "skipped": 0, "deleted": 0}
+        for source_id, (added, deleted) in plan.items():
+            if deleted:
+                vectorestore.delete(ids=list(deleted.values()))
+            index.update(self.namespace, source_id, added, deleted.keys())
+            result["added"] += len(added)
+            result["skipped"] += len(sources[source_id]) - len(added)
+            result["deleted"] += len(deleted)
+        self.upsert_result = result
+        logging.info(f"Incremental upsert in {self.namespace}: {result}")
+        return vectorestore
+
     def retrieve_data(
         self,
         embedding:Embeddings
@@ -201,12 +400,21 @@ class VectorStore:
         logging.info("Retrieve data from your vectore store")
         try:
             if self.type == "pinecone":
+                langPinecone = load_class("langchain_community.vectorstores.pinecone", "Pinecone")
                 vectorestore = langPinecone.from_existing_index(
                     embedding=embedding,
                     index_name=self.index_name,
                     api_key=self.api_key
                     )
                 retriever = vectorestore.as_retriever()
+            elif self.type == "ubilityVectorDatabase":
+                UbilityVectorDatabase = load_class(".ubility_vector_database", "UbilityVectorDatabase", __package__)
+                vectorestore = UbilityVectorDatabase(
+                    embedding=embedding,
+                    path=self.collection_path,
+                    distance_strategy=self.distance_strategy
+                    )
+                retriever = vectorestore.as_retriever()
             return retriever
         except ValueError as error:
             raise ValueError(error)
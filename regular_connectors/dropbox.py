@@ -1,5 +1,6 @@
 import requests,json
 import base64
+from oauth_token_cache import get_cached_token
 
 
 def dropbox_create_access_token(creds):
@@ -25,9 +26,8 @@ def dropbox_create_access_token(creds):
         "Authorization": f"Basic {auth_header}",
     }
     try:
-        response = requests.post("https://api.dropbox.com/oauth2/token", data=data, headers=headers)
-        response_data = response.json()
-        if response.status_code == 200:
+        response_data = get_cached_token("dropbox", credential, lambda: requests.post("https://api.dropbox.com/oauth2/token", data=data, headers=headers).json())
+        if "access_token" in response_data:
             new_access_token = response_data["access_token"]
             return new_access_token
         else:
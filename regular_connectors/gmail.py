@@ -1,26 +1,17 @@
-from googleapiclient.discovery import build
+from google_service_cache import get_service
 import base64
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.base import MIMEBase
 from email import encoders
 import requests
-from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
 import json,re
 import logging
 
 
 def create_service(access_token, API_SERVICE_NAME, API_VERSION):
     try:
-        creds_data = json.loads(access_token)
-        creds = Credentials.from_authorized_user_info(creds_data)
-        if creds and creds.expired and creds.refresh_token:
-            # in this case the token is expired and we need to get a new access token
-            creds.refresh(Request())
-        service = build(
-            API_SERVICE_NAME, API_VERSION, credentials=creds, static_discovery=False
-        )
+        service = get_service(access_token, API_SERVICE_NAME, API_VERSION)
 
         logging.warning(API_SERVICE_NAME, API_VERSION, 'service created successfully')
         return service
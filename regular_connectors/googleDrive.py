@@ -3,9 +3,7 @@
 # from googleapiclient.http import MediaIoBaseDownload
 import json
 from io import BytesIO
-from googleapiclient.discovery import build
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
+from google_service_cache import get_service
 from googleapiclient.http import MediaIoBaseUpload
 import requests
 import base64
@@ -31,12 +29,7 @@ status=[200, 201, 202, 204, 206, 207, 208]
     # """
 def create_service(access_token, API_SERVICE_NAME, API_VERSION):
     try:
-        creds_data = json.loads(access_token)
-        creds = Credentials.from_authorized_user_info(creds_data)
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        service = build(API_SERVICE_NAME, API_VERSION,
-                        credentials=creds, static_discovery=False)
+        service = get_service(access_token, API_SERVICE_NAME, API_VERSION)
         return service
     except Exception as e:
         raise Exception(
@@ -1,6 +1,4 @@
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from google.auth.transport.requests import Request
+from google_service_cache import get_service
 import json
 import logging
 
@@ -14,13 +12,7 @@ def create_service(access_token, API_SERVICE_NAME, API_VERSION):
       Resource: An instance of the Google Sheets API service.
     """
     try:
-        creds_data = json.loads(access_token)
-        creds = Credentials.from_authorized_user_info(creds_data)
-        if creds and creds.expired and creds.refresh_token:
-            # in this case the token is expired and we need to get a new access token
-            creds.refresh(Request())
-        service = build(API_SERVICE_NAME, API_VERSION,
-                        credentials=creds, static_discovery=False)
+        service = get_service(access_token, API_SERVICE_NAME, API_VERSION)
         logging.warning(API_SERVICE_NAME, API_VERSION, 'service created successfully')
         return service
     except Exception as e:
@@ -1,6 +1,4 @@
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from google.auth.transport.requests import Request
+from google_service_cache import get_service
 import json
 import requests
 import base64
@@ -18,12 +16,7 @@ def create_service(ACCESS_TOKEN,API_SERVICE_NAME,API_VERSION):
     :rtype: dict  
     """
     try:
-        creds_data = json.loads(ACCESS_TOKEN)
-        creds = Credentials.from_authorized_user_info(creds_data)
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        service = build(API_SERVICE_NAME,API_VERSION,
-                        credentials=creds, static_discovery=False)
+        service = get_service(ACCESS_TOKEN, API_SERVICE_NAME, API_VERSION)
         return service
     except Exception as e:
         raise Exception(f'Failed to create service instance {e}')
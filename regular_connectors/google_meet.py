@@ -1,6 +1,4 @@
-from googleapiclient.discovery import build
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
+from google_service_cache import get_service
 import json
 import random
 import string
@@ -21,12 +19,7 @@ def create_token(cred):
 
 def create_service(access_token, API_SERVICE_NAME, API_VERSION):
     try:
-        creds_data = json.loads(access_token)
-        creds = Credentials.from_authorized_user_info(creds_data)
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        service = build(API_SERVICE_NAME, API_VERSION,
-                        credentials=creds, static_discovery=False)
+        service = get_service(access_token, API_SERVICE_NAME, API_VERSION)
         print(API_SERVICE_NAME, API_VERSION, 'service created successfully')
         return service
     except Exception as e:
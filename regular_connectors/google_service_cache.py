@@ -0,0 +1,148 @@
+import json
+import os
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from googleapiclient.discovery import build
+from googleapiclient.discovery_cache.base import Cache
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+from oauth_token_cache import credential_fingerprint
+
+# Optional on-disk tier for discovery documents, shared by every worker of the host
+DISCOVERY_CACHE_DIR = os.environ.get("GOOGLE_DISCOVERY_CACHE_DIR", "")
+DISCOVERY_CACHE_TTL = int(os.environ.get("GOOGLE_DISCOVERY_CACHE_TTL", 24 * 60 * 60))
+# Built services kept per thread, httplib2 connections must not be shared between threads
+MAX_SERVICES_PER_THREAD = 32
+
+_credentials = {}
+_credential_locks = {}
+_credentials_lock = threading.Lock()
+_local = threading.local()
+
+
+class DiscoveryCache(Cache):
+    """
+    Discovery document cache used by googleapiclient when building a service.
+    Documents are kept in memory and, when GOOGLE_DISCOVERY_CACHE_DIR is set, on disk.
+    """
+
+    def __init__(self, directory=DISCOVERY_CACHE_DIR, ttl=DISCOVERY_CACHE_TTL):
+        self.directory = directory
+        self.ttl = ttl
+        self._documents = {}
+        self._lock = threading.Lock()
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, url):
+        with self._lock:
+            entry = self._documents.get(url)
+        if entry is not None and entry[1] > time.time():
+            return entry[0]
+        if self.directory:
+            path = self._path(url)
+            try:
+                modified = os.path.getmtime(path)
+                if modified + self.ttl > time.time():
+                    with open(path, "r") as file:
+                        content = file.read()
+                    with self._lock:
+                        self._documents[url] = (content, modified + self.ttl)
+                    return content
+            except OSError:
+                pass
+        return None
+
+    def set(self, url, content):
+        with self._lock:
+            self._documents[url] = (content, time.time() + self.ttl)
+        if self.directory:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                path = self._path(url)
+                with open(path + ".tmp", "w") as file:
+                    file.write(content)
+                os.replace(path + ".tmp", path)
+            except OSError:
+                pass
+
+
+discovery_cache = DiscoveryCache()
+
+
+def _fingerprint(creds_data):
+    # the access token and its expiry change on every refresh, the grant itself does not
+    grant = {key: value for key, value in creds_data.items() if key not in ("token", "expiry")}
+    return credential_fingerprint("google", grant)
+
+
+def _get_lock(key):
+    with _credentials_lock:
+        if key not in _credential_locks:
+            _credential_locks[key] = threading.Lock()
+        return _credential_locks[key]
+
+
+def get_credentials(creds_data):
+    """
+    Return the Credentials of an authorized user, reusing (and refreshing) the ones already built.
+
+    :param dict creds_data: (dict,required) authorized user info as built by create_token
+    :return: valid credentials
+    :rtype: Credentials
+    """
+    key = _fingerprint(creds_data)
+    with _credentials_lock:
+        creds = _credentials.get(key)
+        if creds is None:
+            creds = Credentials.from_authorized_user_info(creds_data)
+            _credentials[key] = creds
+    if creds and creds.expired and creds.refresh_token:
+        # only the callers of this credential wait for its refresh
+        with _get_lock(key):
+            if creds.expired:
+                # in this case the token is expired and we need to get a new access token
+                creds.refresh(Request())
+    return creds
+
+
+def get_service(access_token, API_SERVICE_NAME, API_VERSION):
+    """
+    Return a Google API service, built once per (service, version, credential) and thread.
+
+    :param str access_token: (str,required) authorized user info JSON as built by create_token
+    :param str API_SERVICE_NAME: (str,required) name of the Google API, e.g. 'gmail'
+    :param str API_VERSION: (str,required) version of the Google API, e.g. 'v1'
+    :return: the service object
+    :rtype: Resource
+    """
+    creds_data = json.loads(access_token)
+    creds = get_credentials(creds_data)
+    services = getattr(_local, "services", None)
+    if services is None:
+        services = _local.services = OrderedDict()
+    key = (API_SERVICE_NAME, API_VERSION, _fingerprint(creds_data))
+    service = services.get(key)
+    if service is not None:
+        services.move_to_end(key)
+        return service
+    service = build(
+        API_SERVICE_NAME, API_VERSION, credentials=creds, static_discovery=False, cache=discovery_cache
+    )
+    services[key] = service
+    while len(services) > MAX_SERVICES_PER_THREAD:
+        services.popitem(last=False)
+    return service
+
+
+def clear_services():
+    """
+    Drop the cached credentials and the services built by the current thread.
+    """
+    with _credentials_lock:
+        _credentials.clear()
+        _credential_locks.clear()
+    _local.services = OrderedDict()
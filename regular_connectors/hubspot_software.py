@@ -1,4 +1,5 @@
 import requests,logging,json,datetime
+from oauth_token_cache import get_cached_token
 
 ################## AUTHENTICATION ######################################################################################
 
@@ -22,13 +23,15 @@ def hubspot_refresh_access_token(credentials):
             "refresh_token":refresh_token,
             "redirect_uri":redirect_uri
         }
-        response = requests.post(url=url,headers=headers,data=token_data)
-        if response.status_code == 200:
-            token_info = response.json()
-            accessToken = token_info['access_token']
-            return accessToken
-        else:
-            raise Exception(response.json())
+        def request_token():
+            response = requests.post(url=url,headers=headers,data=token_data)
+            if response.status_code == 200:
+                return response.json()
+            else:
+                raise Exception(response.json())
+        token_info = get_cached_token("hubspot", cred, request_token)
+        accessToken = token_info['access_token']
+        return accessToken
     except requests.exceptions.RequestException as error:
         raise Exception(f"RequestException: {error}")
     except Exception as e:
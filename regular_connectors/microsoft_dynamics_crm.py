@@ -1,5 +1,6 @@
 import requests
 import json
+from oauth_token_cache import get_cached_token
 
 def microsoft_dynamics_crm_refresh_access_token(cred):
     try:
@@ -15,8 +16,7 @@ def microsoft_dynamics_crm_refresh_access_token(cred):
             "refresh_token": creds["refreshToken"],
             "grant_type": "refresh_token",
         }
-        response = requests.post(token_endpoint, data=request_body)
-        response_json = response.json()
+        response_json = get_cached_token("microsoftDynamicsCrm", creds, lambda: requests.post(token_endpoint, data=request_body).json())
         if "access_token" in response_json:
             return response_json["access_token"]
         else:
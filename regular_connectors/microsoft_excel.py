@@ -1,5 +1,6 @@
 import requests
 import json
+from oauth_token_cache import get_cached_token
 status = [200, 201, 202, 204, 206, 207, 208]
     
 def ref_token(creds):   
@@ -13,11 +14,13 @@ def ref_token(creds):
             'refresh_token': cred['refreshToken'],
             "grant_type": "refresh_token",
         }
-        response = requests.post(token_endpoint, data=request_body)
-        if response.status_code in status:
-            return response.json()['access_token']
-        else:
-             raise Exception(f"Token request failed with status code {response.status_code}: {response.text}")
+        def request_token():
+            response = requests.post(token_endpoint, data=request_body)
+            if response.status_code in status:
+                return response.json()
+            else:
+                raise Exception(f"Token request failed with status code {response.status_code}: {response.text}")
+        return get_cached_token("microsoftGraph", cred, request_token)['access_token']
     except Exception as e:
         raise Exception(e)
     
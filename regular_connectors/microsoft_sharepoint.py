@@ -1,6 +1,7 @@
 import requests
 import json
 import base64
+from oauth_token_cache import get_cached_token
 
 status = [200, 201, 202, 204, 206, 207, 208]
 
@@ -16,8 +17,7 @@ def microsoft_sharepoint_refresh_access_token(creds):
             'refresh_token': cred['refreshToken'],
             "grant_type": "refresh_token",
         }
-        response = requests.post(token_endpoint, data=request_body)
-        response_json = response.json()
+        response_json = get_cached_token("microsoftGraph", cred, lambda: requests.post(token_endpoint, data=request_body).json())
         if "access_token" in response_json:
             return response_json["access_token"]
         else:
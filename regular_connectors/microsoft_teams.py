@@ -1,5 +1,6 @@
 import json
 import requests
+from oauth_token_cache import get_cached_token
 status = [200, 201, 202, 204, 206, 207, 208]
 def ref_token(creds):
     try:
@@ -12,8 +13,7 @@ def ref_token(creds):
             'refresh_token': cred['refreshToken'],
             'grant_type': 'refresh_token',
         }
-        response = requests.post(token_endpoint, data=request_body)
-        response_json = response.json()
+        response_json = get_cached_token("microsoftGraph", cred, lambda: requests.post(token_endpoint, data=request_body).json())
         if "access_token" in response_json:
             print(response_json["access_token"])
             return response_json["access_token"]
@@ -1,5 +1,6 @@
 import requests
 import json
+from oauth_token_cache import get_cached_token
 
 
 def microsoft_todo_generate_access_token(creds):
@@ -22,8 +23,7 @@ def microsoft_todo_generate_access_token(creds):
             'refresh_token': cred['refreshToken'],
             "grant_type": "refresh_token",
         }
-        response = requests.post(token_endpoint, data=request_body)
-        response_json = response.json()
+        response_json = get_cached_token("microsoftGraph", cred, lambda: requests.post(token_endpoint, data=request_body).json())
         if "access_token" in response_json:
             return response_json["access_token"]
         else:
@@ -1,15 +1,165 @@
 import json
-from pymongo import MongoClient,errors
+import atexit
+import datetime
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pymongo import MongoClient,errors,InsertOne,UpdateOne,UpdateMany,ReplaceOne,DeleteOne,DeleteMany
+from bson import ObjectId, Decimal128
+
+# Clients shared by every mongodb_* call of the process, one per connection string.
+# Pool options written in the URI take precedence over these defaults.
+CLIENT_OPTIONS = {
+    "maxPoolSize": 50,
+    "minPoolSize": 0,
+    "maxIdleTimeMS": 300000,
+}
+CLIENT_IDLE_TIMEOUT = 900
+# Number of operations sent per bulk_write call
+BULK_WRITE_CHUNK_SIZE = 1000
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def close_idle_clients():
+    """
+    Close the clients that nobody is using and that were not used during the last CLIENT_IDLE_TIMEOUT seconds.
+    """
+    now = time.monotonic()
+    with _clients_lock:
+        idle = [
+            uri for uri, entry in _clients.items()
+            if entry["users"] == 0 and now - entry["last_used"] > CLIENT_IDLE_TIMEOUT
+        ]
+        entries = [_clients.pop(uri) for uri in idle]
+    for entry in entries:
+        entry["client"].close()
+
+
+@atexit.register
+def close_clients():
+    """
+    Close every client, their connection pools and monitor threads.
+    """
+    with _clients_lock:
+        for entry in _clients.values():
+            entry["client"].close()
+        _clients.clear()
+
+
+#the caller holds _clients_lock
+def _get_entry(uri):
+    entry = _clients.get(uri)
+    if entry is None:
+        options = {
+            key: value
+            for key, value in CLIENT_OPTIONS.items()
+            if key.lower() + "=" not in uri.lower()
+        }
+        entry = _clients[uri] = {"client": MongoClient(uri, **options), "users": 0}
+    entry["last_used"] = time.monotonic()
+    return entry
+
+
+def get_client(uri):
+    """
+    Return the MongoClient of the connection string, creating it on first use.
+    Use borrow_client instead when the client must stay open while it is used.
+
+    :param string uri: The MongoDB connection string URI.
+
+    Returns:
+        MongoClient: A client shared by every call using the same URI.
+    """
+    close_idle_clients()
+    with _clients_lock:
+        return _get_entry(uri)["client"]
+
+
+@contextmanager
+def borrow_client(uri):
+    """
+    Borrow the MongoClient of the connection string, it is not closed as idle until given back.
+
+    :param string uri: The MongoDB connection string URI.
+
+    Returns:
+        MongoClient: A client shared by every call using the same URI.
+    """
+    close_idle_clients()
+    with _clients_lock:
+        entry = _get_entry(uri)
+        entry["users"] += 1
+    try:
+        yield entry["client"]
+    finally:
+        with _clients_lock:
+            entry["users"] -= 1
+            entry["last_used"] = time.monotonic()
+
 
 def connect_to_mongodb(uri, databaseName, collectionName):
-    # Connect to the MongoDB server
-    client = MongoClient(uri)
+    # Use the shared client of this MongoDB server, use borrow_collection to keep it open while in use
+    client = get_client(uri)
     # Select the database
     db = client[databaseName]
     # Select the collection
     collection = db[collectionName]
     return collection
 
+@contextmanager
+def borrow_collection(uri, databaseName, collectionName):
+    # Borrow the client of this MongoDB server for the duration of the block
+    with borrow_client(uri) as client:
+        # Select the database
+        db = client[databaseName]
+        # Select the collection
+        yield db[collectionName]
+
+def convert_value(value):
+    """
+    Convert a BSON value into a JSON friendly one: ObjectId and Decimal128 become strings,
+    datetimes become ISO 8601 strings, nested documents and arrays are converted in the same pass.
+    """
+    if isinstance(value, dict):
+        return {key: convert_value(item) for key, item in value.items()}
+    elif isinstance(value, list):
+        return [convert_value(item) for item in value]
+    elif isinstance(value, (ObjectId, Decimal128)):
+        return str(value)
+    elif isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    return value
+
+
+def stream_documents(cursor, batch_size, uri=None):
+    """
+    Yield the documents of a cursor as lists of converted documents.
+    Documents are read from the server batch by batch, the cursor is closed when the generator ends.
+    The client of the uri is borrowed while the generator is consumed.
+
+    :param cursor: A pymongo cursor or command cursor.
+    :param int batch_size: The number of documents per yielded list.
+    :param string uri: The MongoDB connection string URI of the cursor.
+
+    Returns:
+        generator: Lists of converted documents.
+    """
+    try:
+        with borrow_client(uri) if uri else nullcontext():
+            batch = []
+            for document in cursor:
+                batch.append(convert_value(document))
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+    finally:
+        cursor.close()
+
+
 def mongodb_find_documents(cred,params):
     """
     Find documents in a MongoDB collection based on the provided credentials and query parameters.
@@ -33,8 +183,14 @@ def mongodb_find_documents(cred,params):
                 
             If not provided, documents will not be sorted.
 
+        - :projection: (dict,optional) - The fields to return, e.g. {"name": 1, "_id": 0}.
+        - :hint: (string or list,optional) - The index to use, by name or as a list of (field, direction) pairs.
+        - :batch_size: (int,optional) - The number of documents per batch read from the server and per streamed list (default is 1000).
+        - :stream: (bool,optional) - Return a generator of document lists instead of all documents at once. Use a limit of 0 to stream the whole result.
+
     Returns:
-        dict: A dictionary containing the found documents with `_id` converted to strings. 
+        dict: A dictionary containing the found documents with ObjectIds and datetimes converted to strings,
+        or a generator of document lists when `stream` is set.
 
     """
     try:
@@ -46,23 +202,27 @@ def mongodb_find_documents(cred,params):
             limit = params.get("limit", 100)
             query = params.get("query",{})
             sortData = params.get("sort")
+            projection = params.get("projection")
+            hint = params.get("hint")
+            batch_size = int(params.get("batch_size") or 1000)
             sort = []
             if sortData:
                 for field, direction in sortData.items():
                     sort.append((field, direction))
-            collection = connect_to_mongodb(uri, databaseName, collectionName)
-            if sort:
-                documents = list(collection.find(query).limit(limit).sort(sort))
-            else:
-                documents = list(collection.find(query).limit(limit))
-            # Convert _id from ObjectId to string
-            for doc in documents:
-                if '_id' in doc:
-                    doc['_id'] = str(doc['_id'])
-            if documents:
-                return {"documents": documents}
-            else:
-                raise Exception("No document matches the provided query.")
+            with borrow_collection(uri, databaseName, collectionName) as collection:
+                cursor = collection.find(query, projection, batch_size=batch_size).limit(limit)
+                if sort:
+                    cursor = cursor.sort(sort)
+                if hint:
+                    cursor = cursor.hint(hint)
+                if params.get("stream", False):
+                    return stream_documents(cursor, batch_size, uri)
+                # Convert ObjectIds and datetimes to strings while reading
+                documents = [convert_value(doc) for doc in cursor]
+                if documents:
+                    return {"documents": documents}
+                else:
+                    raise Exception("No document matches the provided query.")
         else:
             raise Exception("missing input data")
     except errors.ConnectionFailure as conn_err:
@@ -93,9 +253,9 @@ def mongodb_delete_many_document(cred,params):
             databaseName = creds["databaseName"]
             collectionName = params["collectionName"]
             query = params.get("query", {})
-            collection = connect_to_mongodb(uri, databaseName, collectionName)
-            result = collection.delete_many(query)
-            return {"deletedCount": result.deleted_count}
+            with borrow_collection(uri, databaseName, collectionName) as collection:
+                result = collection.delete_many(query)
+                return {"deletedCount": result.deleted_count}
         else:
             raise Exception("missing input data")
     except errors.ConnectionFailure as conn_err:
@@ -123,11 +283,11 @@ def mongodb_insert_one_document(cred,params):
             databaseName = creds["databaseName"]
             collectionName = params["collectionName"]
             document = params["document"]
-            collection = connect_to_mongodb(uri, databaseName, collectionName)
-            result = collection.insert_one(document)
-            # Get the _id of the inserted document
-            inserted_id = str(result.inserted_id)
-            return {"inserted_id": inserted_id}
+            with borrow_collection(uri, databaseName, collectionName) as collection:
+                result = collection.insert_one(document)
+                # Get the _id of the inserted document
+                inserted_id = str(result.inserted_id)
+                return {"inserted_id": inserted_id}
         else:
             raise Exception("missing input data")
     except errors.ConnectionFailure as conn_err:
@@ -157,9 +317,9 @@ def mongodb_insert_many_document(cred,params):
             collectionName = params["collectionName"]
             if isinstance(params["documents"], list):
                 documents = params["documents"]
-                collection = connect_to_mongodb(uri, databaseName, collectionName)
-                result = collection.insert_many(documents)
-                return {"message": f"Successfully inserted {len(result.inserted_ids)} items!"}
+                with borrow_collection(uri, databaseName, collectionName) as collection:
+                    result = collection.insert_many(documents)
+                    return {"message": f"Successfully inserted {len(result.inserted_ids)} items!"}
             raise Exception("Input data must be a list of dictionaries.")
         else:
             raise Exception("missing input data")
@@ -201,12 +361,12 @@ def mongodb_update_documents(cred,params):
             update = params.get("update", {})
             upsert = params.get("upsert", False)
             if update :
-                collection = connect_to_mongodb(uri, databaseName, collectionName)
-                result = collection.update_many(query, update, upsert)
-                return {
-                    "matched_count": result.matched_count,
-                    "modified_count": result.modified_count
-                }
+                with borrow_collection(uri, databaseName, collectionName) as collection:
+                    result = collection.update_many(query, update, upsert)
+                    return {
+                        "matched_count": result.matched_count,
+                        "modified_count": result.modified_count
+                    }
             else:
                  raise Exception("The update document cannot be empty.")
         else:
@@ -244,12 +404,12 @@ def mongodb_find_one_and_update_document(cred,params):
             query = params.get("query", {})
             updateData = params.get("update", {})
             update = {"$set": updateData}
-            collection = connect_to_mongodb(uri, databaseName, collectionName)
-            updated_document = collection.find_one_and_update(query,update)
-            if updated_document:
-                return {"message": "Successfully updated document"}
-            else:
-                raise Exception("No document matches the provided query.")
+            with borrow_collection(uri, databaseName, collectionName) as collection:
+                updated_document = collection.find_one_and_update(query,update)
+                if updated_document:
+                    return {"message": "Successfully updated document"}
+                else:
+                    raise Exception("No document matches the provided query.")
         else:
             raise Exception("missing input data")
     except errors.ConnectionFailure as conn_err:
@@ -283,12 +443,12 @@ def mongodb_find_one_and_replace_document(cred,params):
             collectionName = params["collectionName"]
             filter  = params.get("query", {})
             replacement = params.get("replacement", {})
-            collection = connect_to_mongodb(uri, databaseName, collectionName)
-            updated_document = collection.find_one_and_replace(filter,replacement)
-            if updated_document:
-                return {"message": "Successfully replaced document"}
-            else:
-                raise Exception("No document matches the provided query.")
+            with borrow_collection(uri, databaseName, collectionName) as collection:
+                updated_document = collection.find_one_and_replace(filter,replacement)
+                if updated_document:
+                    return {"message": "Successfully replaced document"}
+                else:
+                    raise Exception("No document matches the provided query.")
         else:
             raise Exception("missing input data")
     except errors.ConnectionFailure as conn_err:
@@ -309,9 +469,14 @@ def mongodb_aggregate_documents(cred,params):
         - :collectionName: (string,required) - The name of the collection.
         - :matchData: (dict,required) - The match criteria for the aggregation `$match` stage.
         - :groupData: (dict,required) - The grouping criteria for the aggregation `$group` stage.
+        - :allowDiskUse: (bool,optional) - Let the stages write temporary files when they exceed the memory limit.
+        - :hint: (string or dict,optional) - The index to use for the `$match` stage.
+        - :batch_size: (int,optional) - The number of documents per batch read from the server and per streamed list (default is 1000).
+        - :stream: (bool,optional) - Return a generator of document lists instead of all documents at once.
 
     Returns:
-        list: A list of documents resulting from the aggregation pipeline.
+        list: A list of documents resulting from the aggregation pipeline, with ObjectIds and datetimes converted to strings,
+        or a generator of document lists when `stream` is set.
 
     """
     try:
@@ -333,13 +498,130 @@ def mongodb_aggregate_documents(cred,params):
                     "$group": groupData
                 }
             ]
-            collection = connect_to_mongodb(uri, databaseName, collectionName)
-            cursor = collection.aggregate(pipeline)
-            results = list(cursor)
-            return results
+            batch_size = int(params.get("batch_size") or 1000)
+            options = {"batchSize": batch_size}
+            if params.get("allowDiskUse", False):
+                options["allowDiskUse"] = True
+            if params.get("hint"):
+                options["hint"] = params["hint"]
+            with borrow_collection(uri, databaseName, collectionName) as collection:
+                cursor = collection.aggregate(pipeline, **options)
+                if params.get("stream", False):
+                    return stream_documents(cursor, batch_size, uri)
+                results = [convert_value(doc) for doc in cursor]
+                return results
         else:
             raise Exception("missing input data")
     except errors.ConnectionFailure as conn_err:
         raise Exception(f"Failed to connect to MongoDB: {conn_err}")
     except Exception as error:
-        raise Exception(error)
\ No newline at end of file
+        raise Exception(error)
+
+
+def bulk_operation(operation):
+    """
+    Build the pymongo write model of one bulk operation.
+
+    :param dict operation: The operation, its "type" is one of insertOne, updateOne, updateMany, replaceOne, deleteOne or deleteMany.
+
+    Returns:
+        The pymongo write model.
+    """
+    operation_type = operation.get("type")
+    if operation_type == "insertOne":
+        return InsertOne(operation["document"])
+    elif operation_type == "updateOne":
+        return UpdateOne(operation["filter"], operation["update"], upsert=operation.get("upsert", False))
+    elif operation_type == "updateMany":
+        return UpdateMany(operation["filter"], operation["update"], upsert=operation.get("upsert", False))
+    elif operation_type == "replaceOne":
+        return ReplaceOne(operation["filter"], operation["replacement"], upsert=operation.get("upsert", False))
+    elif operation_type == "deleteOne":
+        return DeleteOne(operation["filter"])
+    elif operation_type == "deleteMany":
+        return DeleteMany(operation["filter"])
+    raise Exception(f"Unsupported bulk operation type: {operation_type}")
+
+
+def mongodb_bulk_write(cred,params):
+    """
+    Sends a mixed list of insert, update, replace and delete operations to a MongoDB collection in chunks.
+
+    :param string cred: A JSON string containing MongoDB credentials, including:
+
+        - :uri: (string,required) - The MongoDB connection string URI.
+        - :databaseName: (string,required) - The name of the MongoDB database to connect to.
+    :param dict params: A dictionary containing parameters for the request.
+
+        - :collectionName: (string,required) - The name of the collection.
+        - :operations: (list of dicts,required) - The operations to run, each with a "type" and its arguments:
+
+            - insertOne: {"type": "insertOne", "document": {...}}
+            - updateOne / updateMany: {"type": "updateOne", "filter": {...}, "update": {"$set": {...}}, "upsert": false}
+            - replaceOne: {"type": "replaceOne", "filter": {...}, "replacement": {...}, "upsert": false}
+            - deleteOne / deleteMany: {"type": "deleteOne", "filter": {...}}
+
+        - :ordered: (bool,optional) - Stop at the first failing operation (default is False, the remaining operations still run).
+        - :chunk_size: (int,optional) - The number of operations sent per round trip (default is 1000).
+
+    Returns:
+        dict: The counts of the bulk write, the upserted ids keyed by operation index
+        and the errors, each with the index of the failing operation in `operations`.
+    """
+    try:
+        creds = json.loads(cred)
+        if "uri" in creds and "databaseName" in creds and "collectionName" in params and "operations" in params:
+            uri = creds["uri"]
+            databaseName = creds["databaseName"]
+            collectionName = params["collectionName"]
+            if not isinstance(params["operations"], list):
+                raise Exception("Operations must be a list of dictionaries.")
+            ordered = params.get("ordered", False)
+            chunk_size = int(params.get("chunk_size") or BULK_WRITE_CHUNK_SIZE)
+            requests = [bulk_operation(operation) for operation in params["operations"]]
+            with borrow_collection(uri, databaseName, collectionName) as collection:
+                response = {
+                    "inserted_count": 0,
+                    "matched_count": 0,
+                    "modified_count": 0,
+                    "deleted_count": 0,
+                    "upserted_count": 0,
+                    "upserted_ids": {},
+                    "errors": []
+                }
+                for start in range(0, len(requests), chunk_size):
+                    try:
+                        result = collection.bulk_write(requests[start:start + chunk_size], ordered=ordered)
+                        details = result.bulk_api_result
+                    except errors.BulkWriteError as bulk_error:
+                        details = bulk_error.details
+                    response["inserted_count"] += details.get("nInserted", 0)
+                    response["matched_count"] += details.get("nMatched", 0)
+                    response["modified_count"] += details.get("nModified", 0)
+                    response["deleted_count"] += details.get("nRemoved", 0)
+                    response["upserted_count"] += details.get("nUpserted", 0)
+                    # indexes reported by the server are relative to the chunk
+                    for upserted in details.get("upserted", []):
+                        response["upserted_ids"][str(start + upserted["index"])] = convert_value(upserted["_id"])
+                    for write_error in details.get("writeErrors", []):
+                        response["errors"].append({
+                            "index": start + write_error["index"],
+                            "code": write_error.get("code"),
+                            "message": write_error.get("errmsg")
+                        })
+                    for concern_error in details.get("writeConcernErrors", []):
+                        response["errors"].append({
+                            "index": None,
+                            "code": concern_error.get("code"),
+                            "message": concern_error.get("errmsg")
+                        })
+                    if ordered and details.get("writeErrors"):
+                        break
+                response["message"] = f"Bulk write done with {len(response['errors'])} error(s)"
+                return response
+        else:
+            raise Exception("missing input data")
+    except errors.ConnectionFailure as conn_err:
+        raise Exception(f"Failed to connect to MongoDB: {conn_err}")
+    except Exception as error:
+        raise Exception(error)
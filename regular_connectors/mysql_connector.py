@@ -1,9 +1,356 @@
-import time,json,datetime,decimal,base64
+import time,json,datetime,decimal,base64,hashlib,threading
 
 from sshtunnel import open_tunnel
 
 import mysql.connector
 from mysql.connector import errorcode
+from mysql.connector.pooling import MySQLConnectionPool, CNX_POOL_MAXSIZE
+
+# Connection pools shared by every mysql_* call of the process, keyed by connection config
+POOL_SIZE = 5
+POOL_MAX_IDLE = 300
+POOL_MAX_LIFETIME = 3600
+POOL_IDLE_TIMEOUT = 600
+POOL_WAIT_TIMEOUT = 10
+
+# SSH tunnels shared by every connection going through the same bastion, keyed by SSH config
+SSH_TUNNEL_IDLE_TIMEOUT = 600
+SSH_KEEPALIVE = 30.0
+
+_pools = {}
+_pool_locks = {}
+_pools_lock = threading.Lock()
+_tunnels = {}
+_tunnel_locks = {}
+_tunnels_lock = threading.Lock()
+
+
+def close_pools():
+    """
+    Close every idle connection of every pool, forget the pools and close the SSH tunnels.
+    Connections still borrowed are closed when they are returned.
+    """
+    with _pools_lock:
+        entries = list(_pools.values())
+        _pools.clear()
+    for entry in entries:
+        drop_pool(entry)
+    close_ssh_tunnels()
+
+
+def close_ssh_tunnels():
+    """
+    Stop every SSH tunnel and forget them.
+    """
+    with _tunnels_lock:
+        entries = list(_tunnels.values())
+        _tunnels.clear()
+    for entry in entries:
+        stop_ssh_tunnel(entry)
+
+
+def close_idle_ssh_tunnels():
+    """
+    Stop the SSH tunnels that nobody is using and that were not used during the last SSH_TUNNEL_IDLE_TIMEOUT seconds.
+    """
+    now = time.monotonic()
+    with _tunnels_lock:
+        idle = [
+            key for key, entry in _tunnels.items()
+            if entry["borrows"] == 0 and now - entry["last_used"] > SSH_TUNNEL_IDLE_TIMEOUT
+        ]
+        entries = [_tunnels.pop(key) for key in idle]
+    for entry in entries:
+        stop_ssh_tunnel(entry)
+
+
+def stop_ssh_tunnel(entry):
+    """
+    Stop a tunnel and close the pools connected through its local port, their connections are dead.
+
+    :param dict entry: Registry entry of the tunnel.
+    """
+    entry["tunnel"].stop(force=True)
+    if entry.get("address") is not None:
+        drop_pools(entry["address"])
+
+
+def _get_tunnel_lock(key):
+    with _tunnels_lock:
+        if key not in _tunnel_locks:
+            _tunnel_locks[key] = threading.Lock()
+        return _tunnel_locks[key]
+
+
+def ssh_tunnel_key(ssh_config):
+    """
+    Return the registry key of an SSH config: SSH host, user and remote bind, plus a digest of the secrets
+    so that a tunnel is never shared between different SSH credentials.
+
+    :param dict ssh_config: Arguments of sshtunnel.open_tunnel.
+
+    :return: The registry key.
+    :rtype: tuple
+    """
+    secrets = json.dumps(
+        [ssh_config.get(key) for key in ("ssh_password", "ssh_pkey", "ssh_private_key_password")],
+        default=str,
+    )
+    return (
+        ssh_config["ssh_address_or_host"],
+        ssh_config["ssh_username"],
+        ssh_config["remote_bind_address"],
+        hashlib.sha256(secrets.encode("utf-8")).hexdigest(),
+    )
+
+
+def get_ssh_tunnel(ssh_config):
+    """
+    Borrow a started SSH tunnel for the SSH config, opening it only if no live tunnel exists yet.
+
+    Tunnels are kept alive with SSH keepalives, restarted when their transport went down
+    and stopped after SSH_TUNNEL_IDLE_TIMEOUT seconds without borrower.
+    Only the callers of the same SSH config wait while a tunnel is being opened.
+    Every borrowed tunnel must be given back with release_ssh_tunnel.
+
+    :param dict ssh_config: Arguments of sshtunnel.open_tunnel.
+
+    :return: The started tunnel.
+    :rtype: sshtunnel.SSHTunnelForwarder
+    """
+    key = ssh_tunnel_key(ssh_config)
+    close_idle_ssh_tunnels()
+    with _get_tunnel_lock(key):
+        with _tunnels_lock:
+            entry = _tunnels.get(key)
+        if entry is not None and not entry["tunnel"].is_active:
+            try:
+                entry["tunnel"].restart()
+            except Exception:
+                with _tunnels_lock:
+                    _tunnels.pop(key, None)
+                stop_ssh_tunnel(entry)
+                entry = None
+        if entry is None:
+            tunnel = open_tunnel(**ssh_config, set_keepalive=SSH_KEEPALIVE)
+            tunnel.start()
+            entry = {"tunnel": tunnel, "borrows": 0, "address": None}
+        address = (entry["tunnel"].local_bind_host, entry["tunnel"].local_bind_port)
+        if entry["address"] not in (None, address):
+            # the tunnel was restarted on another local port, the pools of the previous one are orphaned
+            drop_pools(entry["address"])
+        entry["address"] = address
+        with _tunnels_lock:
+            _tunnels[key] = entry
+            entry["borrows"] += 1
+            entry["last_used"] = time.monotonic()
+        return entry["tunnel"]
+
+
+def release_ssh_tunnel(tunnel):
+    """
+    Give back a tunnel borrowed with get_ssh_tunnel.
+
+    :param sshtunnel.SSHTunnelForwarder tunnel: The borrowed tunnel.
+    """
+    with _tunnels_lock:
+        for entry in _tunnels.values():
+            if entry["tunnel"] is tunnel:
+                entry["borrows"] = max(entry["borrows"] - 1, 0)
+                entry["last_used"] = time.monotonic()
+                break
+
+
+def drop_ssh_tunnel(ssh_config):
+    """
+    Stop and forget the SSH tunnel of the SSH config, so that the next call opens a new one.
+
+    :param dict ssh_config: Arguments of sshtunnel.open_tunnel.
+    """
+    with _tunnels_lock:
+        entry = _tunnels.pop(ssh_tunnel_key(ssh_config), None)
+    if entry is not None:
+        stop_ssh_tunnel(entry)
+
+
+def drop_pools(address):
+    """
+    Close and forget the pools connected to a (host, port) address.
+
+    :param tuple address: Host and port of the pools to drop.
+    """
+    with _pools_lock:
+        entries = [
+            _pools.pop(key) for key in [key for key, entry in _pools.items() if entry["address"] == tuple(address)]
+        ]
+    for entry in entries:
+        drop_pool(entry)
+
+
+def evict_idle_pools():
+    """
+    Close the pools that nobody is using and that were not used during the last POOL_IDLE_TIMEOUT seconds.
+    """
+    now = time.monotonic()
+    with _pools_lock:
+        idle = [
+            key for key, entry in _pools.items()
+            if entry["borrows"] == 0 and now - entry["last_used"] > POOL_IDLE_TIMEOUT
+        ]
+        entries = [_pools.pop(key) for key in idle]
+    for entry in entries:
+        drop_pool(entry)
+
+
+def drop_pool(entry):
+    """
+    Close the idle connections of a pool removed from the registry,
+    its borrowed connections are closed when they are returned instead of being queued again.
+
+    :param dict entry: Registry entry of the pool.
+    """
+    with _pools_lock:
+        entry["dropped"] = True
+    entry["pool"]._remove_connections()
+
+
+def release_pool(entry):
+    """
+    Count a connection borrowed with get_pooled_connection as given back to its pool.
+
+    :param dict entry: Registry entry of the pool.
+    """
+    with _pools_lock:
+        entry["borrows"] = max(entry["borrows"] - 1, 0)
+        entry["last_used"] = time.monotonic()
+        dropped = entry["dropped"]
+    if dropped:
+        # the connection was just queued in a pool nobody uses anymore
+        entry["pool"]._remove_connections()
+
+
+def _get_pool_lock(key):
+    with _pools_lock:
+        if key not in _pool_locks:
+            _pool_locks[key] = threading.Lock()
+        return _pool_locks[key]
+
+
+def _borrow_pool(key):
+    # caller holds _pools_lock
+    entry = _pools.get(key)
+    if entry is not None:
+        entry["borrows"] += 1
+        entry["last_used"] = time.monotonic()
+    return entry
+
+
+def get_pooled_connection(config):
+    """
+    Borrow a connection from the pool matching the connection config, creating the pool if needed.
+
+    The pool checks the connection is alive before handing it over, connections idle for more than
+    POOL_MAX_IDLE seconds or older than POOL_MAX_LIFETIME seconds are reconnected.
+    Closing the returned connection gives it back to the pool, a pool is never evicted while one of its
+    connections is borrowed. Only the callers of the same config wait while a pool is being opened.
+
+    :param dict config: Connection parameters accepted by mysql.connector, "pool_size" is honoured (default: 5, max: 32).
+
+    :return: A pooled MySQL connection object.
+    :rtype: mysql.connector.pooling.PooledMySQLConnection
+
+    :raises mysql.connector.errors.PoolError: If no connection is given back to the pool in time.
+    """
+    config = dict(config)
+    pool_size = min(int(config.pop("pool_size", None) or POOL_SIZE), CNX_POOL_MAXSIZE)
+    key = hashlib.sha256(
+        json.dumps([config, pool_size], sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+    evict_idle_pools()
+    with _pools_lock:
+        entry = _borrow_pool(key)
+    if entry is None:
+        # the pool opens its connections eagerly, outside of the registry lock
+        with _get_pool_lock(key):
+            with _pools_lock:
+                entry = _borrow_pool(key)
+            if entry is None:
+                pool = MySQLConnectionPool(
+                    pool_name="ubility_" + key[:32], pool_size=pool_size, **config
+                )
+                entry = {
+                    "pool": pool,
+                    "address": (config.get("host"), config.get("port")),
+                    "borrows": 1,
+                    "dropped": False,
+                    "last_used": time.monotonic(),
+                }
+                with _pools_lock:
+                    _pools[key] = entry
+
+    try:
+        deadline = time.monotonic() + int(config.get("connection_timeout") or POOL_WAIT_TIMEOUT)
+        while True:
+            try:
+                cnx = entry["pool"].get_connection()
+                break
+            except mysql.connector.errors.PoolError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.05)
+    except Exception:
+        release_pool(entry)
+        raise
+
+    close = cnx.close
+    released = []
+
+    def close_and_release():
+        try:
+            close()
+        finally:
+            if not released:
+                released.append(True)
+                release_pool(entry)
+
+    cnx.close = close_and_release
+
+    try:
+        raw_cnx = cnx._cnx
+        now = time.monotonic()
+        created_at = getattr(raw_cnx, "_ubility_created_at", now)
+        last_used = getattr(raw_cnx, "_ubility_last_used", now)
+        if now - created_at > POOL_MAX_LIFETIME or now - last_used > POOL_MAX_IDLE:
+            raw_cnx.reconnect()
+            created_at = now
+        raw_cnx._ubility_created_at = created_at
+        raw_cnx._ubility_last_used = now
+    except Exception:
+        cnx.close()
+        raise
+    return cnx
+
+
+def release_tunnel_on_close(cnx, tunnel):
+    """
+    Make closing a pooled connection also give back the SSH tunnel it goes through.
+
+    :param mysql.connector.pooling.PooledMySQLConnection cnx: The pooled connection.
+    :param sshtunnel.SSHTunnelForwarder tunnel: The tunnel borrowed for the connection.
+    """
+    close = cnx.close
+    released = []
+
+    def close_and_release():
+        try:
+            close()
+        finally:
+            if not released:
+                released.append(True)
+                release_ssh_tunnel(tunnel)
+
+    cnx.close = close_and_release
 
 
 def create_connection(credentials):
@@ -32,8 +379,11 @@ def create_connection(credentials):
     - :sshPrivateKey: (str) - Path to the private key file for SSH authentication (required if SSH authentication method is 'Private Key').
     - :sshPassphrase: (str) - Passphrase for the private key file (required if SSH authentication method is 'Private Key').
 
-    :return: A MySQL connection object.
-    :rtype: mysql.connector.connection.MySQLConnection
+    - :pool_size: (int) - Size of the connection pool shared by the calls using these credentials (default: 5).
+
+    :return: A pooled MySQL connection object, going through a shared SSH tunnel when SSH is enabled.
+        Closing it gives it back to the pool.
+    :rtype: mysql.connector.pooling.PooledMySQLConnection
 
     :raises Exception: If there's an issue with the input data or if an error occurs during connection setup.
 
@@ -171,28 +521,36 @@ def create_connection(credentials):
                 attempts = 3
                 delay = 2
                 while attempt < attempts + 1:
-                    with open_tunnel(**ssh_config) as tunnel:
-                        try:
-                            cnx = mysql.connector.MySQLConnection(
+                    tunnel = get_ssh_tunnel(ssh_config)
+                    try:
+                        cnx = get_pooled_connection(
+                            {
                                 **config,
-                                port=tunnel.local_bind_port,
+                                "host": tunnel.local_bind_host,
+                                "port": tunnel.local_bind_port,
+                            }
+                        )
+                    except IOError as e:
+                        release_ssh_tunnel(tunnel)
+                        drop_ssh_tunnel(ssh_config)
+                        if attempts is attempt:
+                            raise Exception(f"Error creating connection: {e}")
+                        time.sleep(delay**attempt)
+                        attempt += 1
+                    except mysql.connector.Error as err:
+                        release_ssh_tunnel(tunnel)
+                        if err.errno == errorcode.ER_ACCESS_DENIED_ERROR:
+                            raise Exception(
+                                "Something is wrong with your user name or password"
                             )
-                        except IOError as e:
-                            if attempts is attempt:
-                                raise Exception(f"Error creating connection: {e}")
-                            time.sleep(delay**attempt)
-                            attempt += 1
-                        except mysql.connector.Error as err:
-                            if err.errno == errorcode.ER_ACCESS_DENIED_ERROR:
-                                raise Exception(
-                                    "Something is wrong with your user name or password"
-                                )
-                            elif err.errno == errorcode.ER_BAD_DB_ERROR:
-                                raise Exception("Database does not exist")
-                            else:
-                                raise Exception(err)
+                        elif err.errno == errorcode.ER_BAD_DB_ERROR:
+                            raise Exception("Database does not exist")
                         else:
-                            return cnx
+                            raise Exception(err)
+                    else:
+                        # the tunnel stays borrowed until the connection goes back to the pool
+                        release_tunnel_on_close(cnx, tunnel)
+                        return cnx
             else:
                 config = {
                     key: value
@@ -205,7 +563,7 @@ def create_connection(credentials):
                 delay = 2
                 while attempt < attempts + 1:
                     try:
-                        cnx = mysql.connector.connect(**config)
+                        cnx = get_pooled_connection(config)
                     except IOError as e:
                         if attempts is attempt:
                             raise Exception(f"Error creating connection: {e}")
@@ -331,6 +689,39 @@ def query_exec_info_insert(i, cnx, cursor, query, values):
     }
 
 
+def query_exec_info_insert_batch(i, cnx, cursor, query, values):
+    """
+    Return a dictionary containing information about an executed multi-row insert query.
+
+    :param int i: The index of the insert batch.
+    :param mysql.connector.connection.MySQLConnection cnx: The MySQL connection object.
+    :param mysql.connector.cursor.MySQLCursor cursor: The MySQL cursor object.
+    :param str query: The multi-row insert query.
+    :param tuple values: The values of every row of the batch.
+
+    :return: A dictionary containing information about the executed insert batch.
+    :rtype: dict
+    """
+    connection_info = {
+        "connection_id": cnx.connection_id,
+        "server_version": cnx.get_server_info(),
+    }
+
+    query_info = {
+        "affected_rows": cursor.rowcount,
+        "last_insert_id": cursor.lastrowid,
+        "warnings": cursor.fetchwarnings(),
+    }
+
+    return {
+        "query_index": i,
+        "query": query.split(" VALUES ")[0] + " VALUES ...",
+        "values_count": len(values),
+        "connection_info": connection_info,
+        "query_info": query_info,
+    }
+
+
 def query_exec_info_update(i, cnx, cursor, query, values):
     """
     Return a dictionary containing information about the executed update query.
@@ -508,7 +899,7 @@ def query_exec_info(
     """
     Choose the function to use depending on the type of the query and return information about the executed query.
 
-    :param str operation: The type of SQL operation ("insert", "update", "delete", "delete_row", "select", "execute_sql").
+    :param str operation: The type of SQL operation ("insert", "insert_batch", "update", "delete", "delete_row", "select", "execute_sql").
     :param args: Variable-length arguments for the corresponding operation function.
 
     :return: A dictionary containing information about the executed query.
@@ -518,6 +909,8 @@ def query_exec_info(
     """
     if operation == "insert":
         return query_exec_info_insert(*args)
+    elif operation == "insert_batch":
+        return query_exec_info_insert_batch(*args)
     elif operation == "update":
         return query_exec_info_update(*args)
     elif operation == "delete":
@@ -552,7 +945,7 @@ def execute_queries(
     :param list queries: List of SQL query tuples (query, values).
     :param str query_batching: The type of query batching ("transaction" or "none").
     :param bool skip_on_conflict: Whether to skip insertion on conflict (applies to IntegrityError).
-    :param str operation: The type of SQL operation ("insert", "update", "delete", "delete_row", "select", "execute_sql").
+    :param str operation: The type of SQL operation ("insert", "insert_batch", "update", "delete", "delete_row", "select", "execute_sql").
     :param bool output_details: Whether to include detailed information about query execution in the response.
 
     :return: A tuple containing the updated response, MySQL connection, and MySQL cursor.
@@ -596,6 +989,102 @@ def execute_queries(
     return (response, cnx, cursor)
 
 
+def convert_value(value):
+    """
+    Convert a value read from MySQL into a JSON friendly one.
+
+    :param value: A column value as returned by the cursor.
+
+    :return: The converted value (dates as 'YYYY-MM-DD', decimals as strings, bytes base64 decoded).
+    """
+    if isinstance(value, datetime.date):
+        return value.strftime('%Y-%m-%d')
+    elif isinstance(value, decimal.Decimal):
+        return str(value)
+    elif isinstance(value, bytes):
+        return base64.b64decode(value)
+    return value
+
+
+def format_rows(columns, rows, row_format):
+    """
+    Convert a chunk of tuple rows in a single pass.
+
+    :param list columns: The column names of the result.
+    :param list rows: The rows as tuples.
+    :param str row_format: "dict" (one dictionary per row), "tuple" (one tuple per row) or "columnar" (one list per column).
+
+    :return: The formatted chunk.
+    :rtype: list or dict
+    """
+    if row_format == "tuple":
+        return [tuple(convert_value(value) for value in row) for row in rows]
+    elif row_format == "columnar":
+        return {
+            column: [convert_value(value) for value in values]
+            for column, values in zip(columns, zip(*rows))
+        }
+    return [dict(zip(columns, (convert_value(value) for value in row))) for row in rows]
+
+
+def stream_query_results(credentials, queries, query_batching, chunk_size, row_format):
+    """
+    Execute queries on an unbuffered cursor and yield their rows chunk by chunk.
+
+    The connection is only borrowed when the generator is first iterated, so a generator that is never
+    consumed holds nothing. Rows are read from the server as the generator is consumed, so only one chunk
+    is held in memory. The connection is committed once every query ran and is given back when the
+    generator ends; if it is abandoned before the end, the connection is dropped instead of reading the
+    remaining rows.
+
+    :param dict credentials: Connection credentials, see create_connection.
+    :param list queries: List of SQL query tuples (query, values).
+    :param str query_batching: The type of query batching ("transaction" or "none").
+    :param int chunk_size: Number of rows fetched per chunk.
+    :param str row_format: "dict", "tuple" or "columnar", see format_rows.
+
+    :return: Generator of (query index, formatted chunk) tuples.
+    :rtype: generator
+    """
+    cnx = create_connection(credentials)
+    cursor = None
+    finished = False
+    try:
+        if query_batching == "transaction":
+            cnx.start_transaction()
+        cursor = cnx.cursor()
+        for i, query in enumerate(queries):
+            cursor.execute(*query)
+            if cursor.with_rows:
+                columns = list(cursor.column_names)
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    yield (i, format_rows(columns, rows, row_format))
+        cnx.commit()
+        finished = True
+    except GeneratorExit:
+        raise
+    except Exception as e:
+        if query_batching == "transaction":
+            try:
+                cnx.rollback()
+            except Exception:
+                pass
+        raise Exception(f"Error Streaming Data: {e} ///// queries: {queries}")
+    finally:
+        if not finished:
+            # dropping the socket is cheaper than reading the rest of the result
+            cnx.disconnect()
+        elif cursor:
+            cursor.close()
+        try:
+            cnx.close()
+        except Exception:
+            pass
+
+
 def return_operator(condition_operator):
     """
     Return the SQL operator corresponding to the input condition operator.
@@ -673,6 +1162,62 @@ def condition_group_creator(combine_conditions, conditions):
     return (condition_group, values)
 
 
+def batch_insert_queries(cursor, table, priority, rows, batch_size):
+    """
+    Group insert rows by column set and build one multi-row INSERT query per batch.
+
+    Batches hold at most batch_size rows and stay under half of the server's max_allowed_packet,
+    leaving room for the escaping done by the connector.
+
+    :param mysql.connector.cursor.MySQLCursor cursor: The MySQL cursor object, used to read max_allowed_packet.
+    :param str table: The name of the table for the INSERT operation.
+    :param str priority: The priority keyword returned by operation_priority.
+    :param list rows: List of (columns, values) tuples, one per row.
+    :param int batch_size: Maximum number of rows per batch.
+
+    :return: List of SQL query tuples (query, values).
+    :rtype: list
+    """
+    cursor.execute("SELECT @@max_allowed_packet;")
+    packet_budget = int(cursor.fetchone()[0]) // 2
+
+    groups = {}
+    for columns, values in rows:
+        groups.setdefault(columns, []).append(values)
+
+    insert_queries = []
+    for columns, group in groups.items():
+        query_head = (
+            "INSERT "
+            + priority
+            + "INTO "
+            + table
+            + " ("
+            + ", ".join(columns)
+            + ") VALUES "
+        )
+        row_variables = "(" + ", ".join(["%" + "s"] * len(columns)) + ")"
+        batch = []
+        batch_bytes = len(query_head)
+        for values in group:
+            row_bytes = len(str(values)) + len(row_variables)
+            if batch and (len(batch) >= batch_size or batch_bytes + row_bytes > packet_budget):
+                insert_queries.append(
+                    (query_head + ", ".join([row_variables] * len(batch)) + ";",
+                     tuple(value for row in batch for value in row))
+                )
+                batch = []
+                batch_bytes = len(query_head)
+            batch.append(values)
+            batch_bytes += row_bytes
+        if batch:
+            insert_queries.append(
+                (query_head + ", ".join([row_variables] * len(batch)) + ";",
+                 tuple(value for row in batch for value in row))
+            )
+    return insert_queries
+
+
 def mysql_insert(credentials, params):
     """
     Perform MySQL INSERT operation according to user input.
@@ -689,6 +1234,9 @@ def mysql_insert(credentials, params):
     - :insert_rows: (list, required) - List of dictionaries representing rows to be inserted.
     - :priority: (str, optional) - Priority level for the INSERT operation ("low", "high", or None).
     - :table: (str, required) - The name of the table for the INSERT operation.
+    - :batch_insert: (bool, optional) - Send rows sharing the same columns as multi-row INSERT queries instead of one query per row.
+        Query execution information is then reported per batch.
+    - :batch_size: (int, optional) - Maximum number of rows per batch (default: 1000), batches are also kept under max_allowed_packet.
 
     :return: A dictionary containing the result of the INSERT operation.
     :rtype: dict
@@ -734,11 +1282,15 @@ def mysql_insert(credentials, params):
         insert_rows = params.get("insert_rows", None)
         priority_input = params.get("priority", None)
         table = params.get("table", None)
+        batch_insert = params.get("batch_insert", False)
+        batch_size = int(params.get("batch_size", None) or 1000)
         credentials = cnx_timeout_and_pool_size(
             credentials, connection_timeout, pool_size
         )
         if table and insert_rows:
             insert_queries = []
+            batch_rows = []
+            operation_type = "insert"
 
             priority = operation_priority(priority_input)
 
@@ -753,6 +1305,9 @@ def mysql_insert(credentials, params):
                         values.append(None)
                     else:
                         values.append(value)
+                if batch_insert:
+                    batch_rows.append((tuple(columns), tuple(values)))
+                    continue
                 insert_query = (
                     "INSERT "
                     + priority
@@ -768,6 +1323,13 @@ def mysql_insert(credentials, params):
             cnx = create_connection(credentials)
             cursor = cnx.cursor()
 
+            if batch_insert:
+                operation_type = "insert_batch"
+                insert_queries = batch_insert_queries(
+                    cursor, table, priority, batch_rows, batch_size
+                )
+                response["batches"] = len(insert_queries)
+
             response, cnx, cursor = execute_queries(
                 cnx,
                 cursor,
@@ -775,7 +1337,7 @@ def mysql_insert(credentials, params):
                 insert_queries,
                 query_batching,
                 skip_on_conflict,
-                "insert",
+                operation_type,
                 output_details,
             )
 
@@ -1041,9 +1603,13 @@ def mysql_select(credentials, params):
     - :sort_rules: (list, optional) - List of sorting rules for the SELECT operation.
     - :output_columns: (list, optional) - List of columns to be included in the SELECT output.
     - :select_distinct: (bool, optional) - Use DISTINCT in the SELECT query.
+    - :stream: (bool, optional) - Stream the rows from an unbuffered cursor instead of returning them all at once.
+    - :chunk_size: (int, optional) - Number of rows per streamed chunk (default: 1000).
+    - :row_format: (str, optional) - Format of the streamed chunks: "dict" (default), "tuple" or "columnar".
 
-    :return: A dictionary containing the result of the SELECT operation.
-    :rtype: dict
+    :return: A dictionary containing the result of the SELECT operation,
+        or a generator of row chunks when stream is set.
+    :rtype: dict or generator
 
     :raises Exception: If there is an error during the SELECT operation or if required input data is missing.
 
@@ -1089,6 +1655,9 @@ def mysql_select(credentials, params):
         sort_rules = params.get("sort_rules", {})
         output_columns = params.get("output_columns", [])
         select_distinct = params.get("select_distinct", False)
+        stream = params.get("stream", False)
+        chunk_size = int(params.get("chunk_size", None) or 1000)
+        row_format = params.get("row_format", "dict")
 
         credentials = cnx_timeout_and_pool_size(
             credentials, connection_timeout, pool_size
@@ -1158,6 +1727,14 @@ def mysql_select(credentials, params):
             else:
                 select_query = [(query,)]
 
+            if stream:
+                return (
+                    chunk
+                    for _, chunk in stream_query_results(
+                        credentials, select_query, query_batching, chunk_size, row_format
+                    )
+                )
+
             cnx = create_connection(credentials)
             cursor = cnx.cursor(dictionary=True, buffered=True)
 
@@ -1175,16 +1752,7 @@ def mysql_select(credentials, params):
             response["result_rows"] = cursor.fetchall()
             for record in response['result_rows']:
                 for key,value in record.items():
-                    if isinstance(value, datetime.date):
-                        record[key] = value.strftime('%Y-%m-%d')
-                    elif isinstance(value, decimal.Decimal):
-                        record[key] = str(value)
-                    elif isinstance(value, datetime.datetime):
-                        record[key] = value.strftime('%Y-%m-%d')
-                    elif isinstance(value, bytes):
-                        record[key] = base64.b64decode(value)
-                    else:
-                        continue
+                    record[key] = convert_value(value)
             return response
         else:
             raise Exception("Missing Input Data")
@@ -1211,9 +1779,13 @@ def mysql_execute_sql(credentials, params):
     - :query_batching: (str, optional) - The type of query batching ("transaction" or "none").
     - :queries_with_values: (list, required) - List of dictionaries containing queries and values to execute.
         Each dictionary should have "query" and "values" (optional) keys.
+    - :stream: (bool, optional) - Stream the rows from an unbuffered cursor instead of returning them all at once.
+    - :chunk_size: (int, optional) - Number of rows per streamed chunk (default: 1000).
+    - :row_format: (str, optional) - Format of the streamed chunks: "dict" (default), "tuple" or "columnar".
 
-    :return: A dictionary containing the result of the SQL execution.
-    :rtype: dict
+    :return: A dictionary containing the result of the SQL execution,
+        or a generator of {"query_index": ..., "rows": ...} chunks when stream is set.
+    :rtype: dict or generator
 
     :raises Exception: If there is an error during the SQL execution or if required input data is missing.
 
@@ -1251,6 +1823,9 @@ def mysql_execute_sql(credentials, params):
         output_details = params.get("output_details", False)
         query_batching = params.get("query_batching", None)
         queries_with_values = params.get("queries_with_values", [])
+        stream = params.get("stream", False)
+        chunk_size = int(params.get("chunk_size", None) or 1000)
+        row_format = params.get("row_format", "dict")
         operation_type = "execute_sql"
 
         credentials = cnx_timeout_and_pool_size(
@@ -1278,6 +1853,14 @@ def mysql_execute_sql(credentials, params):
                 else:
                     queries_to_execute.append((query,))
 
+            if stream:
+                return (
+                    {"query_index": i, "rows": chunk}
+                    for i, chunk in stream_query_results(
+                        credentials, queries_to_execute, query_batching, chunk_size, row_format
+                    )
+                )
+
             cnx = create_connection(credentials)
             cursor = cnx.cursor(dictionary=True, buffered=True)
 
@@ -1330,16 +1913,7 @@ def mysql_execute_sql(credentials, params):
             for list in response['result_rows']:
                 for record in list:
                     for key,value in record.items():
-                        if isinstance(value, datetime.date):
-                            record[key] = value.strftime('%Y-%m-%d')
-                        elif isinstance(value, decimal.Decimal):
-                            record[key] = str(value)
-                        elif isinstance(value, datetime.datetime):
-                            record[key] = value.strftime('%Y-%m-%d')
-                        elif isinstance(value, bytes):
-                            record[key] = base64.b64decode(value)
-                        else:
-                            continue
+                        record[key] = convert_value(value)
             return response
         else:
             raise Exception("Missing Input Data")
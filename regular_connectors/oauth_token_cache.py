@@ -0,0 +1,88 @@
+import hashlib
+import json
+import threading
+import time
+
+# Used when the identity endpoint does not return "expires_in" (e.g. Salesforce)
+DEFAULT_EXPIRES_IN = 1800
+# Refresh this many seconds before the token actually expires
+REFRESH_MARGIN = 120
+
+_tokens = {}
+_locks = {}
+_registry_lock = threading.Lock()
+
+
+def credential_fingerprint(provider, creds):
+    """
+    Build the cache key of a credential without keeping the secrets themselves.
+
+    :param str provider: (str,required) name of the app the token belongs to
+    :param creds: (str or dict,required) credentials JSON as received by the connector
+    :return: sha256 hex digest
+    :rtype: str
+    """
+    if isinstance(creds, str):
+        creds = json.loads(creds)
+    raw = json.dumps([provider, creds], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _expires_at(token_json):
+    try:
+        expires_in = int(float(token_json.get("expires_in", DEFAULT_EXPIRES_IN)))
+    except (TypeError, ValueError):
+        expires_in = DEFAULT_EXPIRES_IN
+    margin = min(REFRESH_MARGIN, expires_in // 2)
+    return time.monotonic() + expires_in - margin
+
+
+def _get_lock(key):
+    with _registry_lock:
+        if key not in _locks:
+            _locks[key] = threading.Lock()
+        return _locks[key]
+
+
+def get_cached_token(provider, creds, request_token):
+    """
+    Return the token response of a credential, calling the identity endpoint only when needed.
+
+    Tokens are shared by the whole process and kept until shortly before "expires_in".
+    Concurrent callers with the same credential wait for a single refresh.
+
+    :param str provider: (str,required) name of the app the token belongs to
+    :param creds: (str or dict,required) credentials JSON as received by the connector
+    :param request_token: (callable,required) performs the token request and returns its JSON
+    :return: token response JSON, only cached when it contains "access_token"
+    :rtype: dict
+    """
+    key = credential_fingerprint(provider, creds)
+    entry = _tokens.get(key)
+    if entry is not None and entry[1] > time.monotonic():
+        return entry[0]
+    with _get_lock(key):
+        entry = _tokens.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            return entry[0]
+        token_json = request_token()
+        if isinstance(token_json, dict) and "access_token" in token_json:
+            _tokens[key] = (token_json, _expires_at(token_json))
+        return token_json
+
+
+def invalidate_token(provider, creds):
+    """
+    Drop the cached token of a credential, e.g. after the app answered 401.
+
+    :param str provider: (str,required) name of the app the token belongs to
+    :param creds: (str or dict,required) credentials JSON as received by the connector
+    """
+    _tokens.pop(credential_fingerprint(provider, creds), None)
+
+
+def clear_tokens():
+    """
+    Drop every cached token.
+    """
+    _tokens.clear()
@@ -1,5 +1,154 @@
 import xmlrpc.client
 import json
+import hashlib
+import threading
+import time
+
+# Sessions unused for this long are dropped by close_idle_sessions
+SESSION_IDLE_TIMEOUT = 1800
+# Records fetched per search_read call when streaming a whole model
+PAGE_SIZE = 500
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+class OdooSession:
+    """
+    Authenticated XML-RPC session on an Odoo database.
+
+    The uid is obtained once and kept, every thread gets its own proxies so that their
+    HTTP/1.1 connection stays open between calls (ServerProxy is not thread safe).
+    """
+
+    def __init__(self, url, db, username, apiPassword):
+        self.url = url
+        self.db = db
+        self.username = username
+        self.apiPassword = apiPassword
+        self.uid = None
+        self.last_used = time.monotonic()
+        self._local = threading.local()
+
+    def _proxy(self, endpoint):
+        proxies = getattr(self._local, "proxies", None)
+        if proxies is None:
+            proxies = self._local.proxies = {}
+        if endpoint not in proxies:
+            proxies[endpoint] = xmlrpc.client.ServerProxy(f"{self.url}/xmlrpc/2/{endpoint}", allow_none=True)
+        return proxies[endpoint]
+
+    def authenticate(self):
+        self.uid = self._proxy("common").authenticate(self.db, self.username, self.apiPassword, {})
+        return self.uid
+
+    def execute_kw(self, model, method, args, kwargs=None):
+        """
+        Call a model method with the session uid.
+        When Odoo denies access (e.g. the user was archived meanwhile), authenticate again and retry once.
+        """
+        self.last_used = time.monotonic()
+        try:
+            return self._proxy("object").execute_kw(self.db, self.uid, self.apiPassword, model, method, args, kwargs or {})
+        except xmlrpc.client.Fault as fault:
+            if "AccessDenied" not in fault.faultString and "Access Denied" not in fault.faultString:
+                raise
+            if not self.authenticate():
+                drop_odoo_session(self.url, self.db, self.username)
+                raise
+            return self._proxy("object").execute_kw(self.db, self.uid, self.apiPassword, model, method, args, kwargs or {})
+
+    def search_read(self, model, domain=None, fields=None, limit=None, offset=0, order=None):
+        """
+        Search and read records in one call, filtering, paging and sorting on the server.
+        """
+        options = {"fields": fields or []}
+        if limit is not None:
+            if int(limit) == 0:
+                # Odoo reads a limit of 0 as no limit, an explicit 0 asks for no record
+                return []
+            options["limit"] = int(limit)
+        if offset:
+            options["offset"] = int(offset)
+        if order:
+            options["order"] = order
+        return self.execute_kw(model, "search_read", [domain or []], options)
+
+    def iter_records(self, model, domain=None, fields=None, page_size=PAGE_SIZE, order=None, offset=0, limit=None):
+        """
+        Yield the matching records page by page, e.g. for a full export.
+        Pages are sorted by id unless an order is given, so that the offsets stay stable.
+        """
+        page_size = int(page_size or PAGE_SIZE)
+        offset = int(offset or 0)
+        remaining = int(limit) if limit is not None else None
+        while remaining is None or remaining > 0:
+            size = page_size if remaining is None else min(page_size, remaining)
+            page = self.search_read(model, domain, fields, size, offset, order or "id")
+            if page:
+                yield page
+            if len(page) < size:
+                return
+            offset += size
+            if remaining is not None:
+                remaining -= size
+
+
+def get_odoo_session(url, db, username, apiPassword):
+    """
+    Return the session of an Odoo account, authenticating only the first time.
+    Sessions unused for SESSION_IDLE_TIMEOUT seconds are forgotten on the way.
+
+    :param str url: The URL of the Odoo instance.
+    :param str db: The name of the Odoo database.
+    :param str username: The username for authentication.
+    :param str apiPassword: The API password for authentication.
+
+    Returns:
+        OdooSession: The session, its uid is falsy when authentication failed.
+    """
+    close_idle_sessions()
+    key = (url, db, username)
+    secret = hashlib.sha256(apiPassword.encode("utf-8")).hexdigest()
+    with _sessions_lock:
+        entry = _sessions.get(key)
+    if entry is not None and entry[0] == secret:
+        entry[1].last_used = time.monotonic()
+        return entry[1]
+    session = OdooSession(url, db, username, apiPassword)
+    # failed logins are not kept, the next call tries again
+    if session.authenticate():
+        with _sessions_lock:
+            _sessions[key] = (secret, session)
+    return session
+
+
+def drop_odoo_session(url, db, username):
+    """
+    Forget the session of an Odoo account.
+    """
+    with _sessions_lock:
+        _sessions.pop((url, db, username), None)
+
+
+def close_idle_sessions(max_idle=SESSION_IDLE_TIMEOUT):
+    """
+    Forget the sessions unused for more than max_idle seconds.
+    """
+    now = time.monotonic()
+    with _sessions_lock:
+        for key, (_, session) in list(_sessions.items()):
+            if now - session.last_used > max_idle:
+                del _sessions[key]
+
+
+def close_sessions():
+    """
+    Forget every session.
+    """
+    with _sessions_lock:
+        _sessions.clear()
+
 
 def odoo_create_contact(cred,params):
     """
@@ -36,16 +185,14 @@ def odoo_create_contact(cred,params):
             db = creds["db"]
             username = creds["username"]
             apiPassword = creds["apiPassword"]
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "res.partner"
                 data = {}
                 for key, value in params.items():
                     if value:
                         data[key] = value
-                id = models.execute_kw(db, uid, apiPassword, model, "create", [data])
+                id = session.execute_kw(model, "create", [data])
                 return {"id": id}
             else:
                 raise Exception("Authentication failed. Please check your credentials.")
@@ -81,13 +228,11 @@ def odoo_get_contact_by_id(cred,params):
             apiPassword = creds["apiPassword"]
             id = params.get("contact_id")
             fields = params.get("fields", [])
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "res.partner"
-                data = models.execute_kw(
-                    db, uid, apiPassword, model, "read", [int(id)], {"fields": fields}
+                data = session.execute_kw(
+                    model, "read", [int(id)], {"fields": fields}
                 )
                 if data:
                     return {"Contact": data}
@@ -114,6 +259,11 @@ def odoo_get_many_contact(cred,params):
         - :limit: (int,optional) - The maximum number of contacts to retrieve.
         - :fields: (list,optional) - List of fields to include in the response.
             Available fields: name, email, phone, mobile, website, comment, function, vat,city, country_id, state_id, street, street2, zip.
+        - :domain: (list,optional) - Odoo search domain, e.g. [["create_date", ">=", "2024-01-01"]].
+        - :offset: (int,optional) - The number of records to skip.
+        - :order: (str,optional) - The sort order, e.g. "name asc, id desc".
+        - :stream: (bool,optional) - Return a generator of record pages instead of one list, for full exports.
+        - :page_size: (int,optional) - The number of records per page when streaming (default is 500).
 
     Returns:
         dict: A dictionary containing the retrieved contacts.
@@ -127,16 +277,16 @@ def odoo_get_many_contact(cred,params):
             apiPassword = creds["apiPassword"]
             limit = params.get("limit")
             fields = params.get("fields", [])
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            domain = params.get("domain", [])
+            offset = params.get("offset", 0)
+            order = params.get("order")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "res.partner"
-                ids = models.execute_kw(db, uid, apiPassword, model, "search", [[]])
-                data = models.execute_kw(
-                    db, uid, apiPassword, model, "read", [ids], {"fields": fields}
-                )
-                return {"Contacts": data[:limit]}
+                if params.get("stream", False):
+                    return session.iter_records(model, domain, fields, params.get("page_size"), order, offset, limit)
+                data = session.search_read(model, domain, fields, limit, offset, order)
+                return {"Contacts": data}
             else:
                 raise Exception("Authentication failed. Please check your credentials.")
         else:
@@ -169,15 +319,13 @@ def odoo_delete_contact(cred,params):
             username = creds["username"]
             apiPassword = creds["apiPassword"]
             id = params.get("contact_id")
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "res.partner"
-                if models.execute_kw(
-                    db, uid, apiPassword, model, "search", [[("id", "=", int(id))]]
+                if session.execute_kw(
+                    model, "search", [[("id", "=", int(id))]]
                 ):
-                    models.execute_kw(db, uid, apiPassword, model, "unlink", [[id]])
+                    session.execute_kw(model, "unlink", [[id]])
                     return {"message": "Deleted successfully"}
                 else:
                     raise Exception("ID not found or could not be deleted.")
@@ -226,10 +374,8 @@ def odoo_update_contact(cred,params):
             username = creds["username"]
             apiPassword = creds["apiPassword"]
             id = params["contact_id"]
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "res.partner"
                 data = {}
                 for key, value in params.items():
@@ -239,11 +385,11 @@ def odoo_update_contact(cred,params):
                     if value:
                         data[key] = value
                 if data:
-                    if models.execute_kw(
-                        db, uid, apiPassword, model, "search", [[("id", "=", int(id))]]
+                    if session.execute_kw(
+                        model, "search", [[("id", "=", int(id))]]
                     ):
-                        models.execute_kw(
-                            db, uid, apiPassword, model, "write", [[int(id)], data]
+                        session.execute_kw(
+                            model, "write", [[int(id)], data]
                         )
                         return {"message": "Updated successfully"}
                     else:
@@ -282,16 +428,14 @@ def odoo_create_user(cred,params):
             db = creds["db"]
             username = creds["username"]
             apiPassword = creds["apiPassword"]
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "res.users"
                 data = {}
                 for key, value in params.items():
                     if value:
                         data[key] = value
-                id = models.execute_kw(db, uid, apiPassword, model, "create", [data])
+                id = session.execute_kw(model, "create", [data])
                 return {"id": id}
             else:
                 raise Exception("Authentication failed. Please check your credentials.")
@@ -328,13 +472,11 @@ def odoo_get_user_by_id(cred,params):
             apiPassword = creds["apiPassword"]
             id = params.get("user_id")
             fields = params.get("fields", [])
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "res.users"
-                data = models.execute_kw(
-                    db, uid, apiPassword, model, "read", [int(id)], {"fields": fields}
+                data = session.execute_kw(
+                    model, "read", [int(id)], {"fields": fields}
                 )
                 if data:
                     return {"User": data}
@@ -361,6 +503,11 @@ def odoo_get_many_users(cred,params):
         - :limit: (int,optional) - The maximum number of users to retrieve.
         - :fields: (list,optional) - List of fields to include in the response.
             Available fields: name, email, opportunity_count .
+        - :domain: (list,optional) - Odoo search domain, e.g. [["create_date", ">=", "2024-01-01"]].
+        - :offset: (int,optional) - The number of records to skip.
+        - :order: (str,optional) - The sort order, e.g. "name asc, id desc".
+        - :stream: (bool,optional) - Return a generator of record pages instead of one list, for full exports.
+        - :page_size: (int,optional) - The number of records per page when streaming (default is 500).
 
     Returns:
         dict: A dictionary containing the retrieved users.
@@ -375,16 +522,16 @@ def odoo_get_many_users(cred,params):
             apiPassword = creds["apiPassword"]
             limit = params.get("limit")
             fields = params.get("fields", [])
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            domain = params.get("domain", [])
+            offset = params.get("offset", 0)
+            order = params.get("order")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "res.users"
-                ids = models.execute_kw(db, uid, apiPassword, model, "search", [[]])
-                data = models.execute_kw(
-                    db, uid, apiPassword, model, "read", [ids], {"fields": fields}
-                )
-                return {"Users": data[:limit]}
+                if params.get("stream", False):
+                    return session.iter_records(model, domain, fields, params.get("page_size"), order, offset, limit)
+                data = session.search_read(model, domain, fields, limit, offset, order)
+                return {"Users": data}
             else:
                 raise Exception("Authentication failed. Please check your credentials.")
         else:
@@ -417,15 +564,13 @@ def odoo_delete_user(cred,params):
             username = creds["username"]
             apiPassword = creds["apiPassword"]
             id = params.get("user_id")
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "res.users"
-                if models.execute_kw(
-                    db, uid, apiPassword, model, "search", [[("id", "=", int(id))]]
+                if session.execute_kw(
+                    model, "search", [[("id", "=", int(id))]]
                 ):
-                    models.execute_kw(db, uid, apiPassword, model, "unlink", [[id]])
+                    session.execute_kw(model, "unlink", [[id]])
                     return {"message": "Deleted successfully"}
                 else:
                     raise Exception("ID not found or could not be deleted.")
@@ -463,10 +608,8 @@ def odoo_update_user(cred,params):
             username = creds["username"]
             apiPassword = creds["apiPassword"]
             id = params["user_id"]
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "res.users"
                 data = {}
                 for key, value in params.items():
@@ -476,11 +619,11 @@ def odoo_update_user(cred,params):
                     if value:
                         data[key] = value
                 if data:
-                    if models.execute_kw(
-                        db, uid, apiPassword, model, "search", [[("id", "=", int(id))]]
+                    if session.execute_kw(
+                        model, "search", [[("id", "=", int(id))]]
                     ):
-                        models.execute_kw(
-                            db, uid, apiPassword, model, "write", [[int(id)], data]
+                        session.execute_kw(
+                            model, "write", [[int(id)], data]
                         )
                         return {"message": "Updated successfully"}
                     else:
@@ -531,16 +674,14 @@ def odoo_create_opportunity(cred,params):
             db = creds["db"]
             username = creds["username"]
             apiPassword = creds["apiPassword"]
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "crm.lead"
                 data = {}
                 for key, value in params.items():
                     if value:
                         data[key] = value
-                id = models.execute_kw(db, uid, apiPassword, model, "create", [data])
+                id = session.execute_kw(model, "create", [data])
                 return {"id": id}
             else:
                 raise Exception("Authentication failed. Please check your credentials.")
@@ -576,13 +717,11 @@ def odoo_get_opportunity_by_id(cred,params):
             apiPassword = creds["apiPassword"]
             id = params.get("opportunity_id")
             fields = params.get("fields", [])
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "crm.lead"
-                data = models.execute_kw(
-                    db, uid, apiPassword, model, "read", [int(id)], {"fields": fields}
+                data = session.execute_kw(
+                    model, "read", [int(id)], {"fields": fields}
                 )
                 if data:
                     return {"Opportunity": data}
@@ -609,6 +748,11 @@ def odoo_get_many_opportunity(cred,params):
         - :limit: (int,optional) - The maximum number of opportunities to retrieve.
         - :fields: (list,optional) - List of fields to include in the response.
             Available fields: name, email_normalized, expected_revenue , description , phone , priority , probability .
+        - :domain: (list,optional) - Odoo search domain, e.g. [["create_date", ">=", "2024-01-01"]].
+        - :offset: (int,optional) - The number of records to skip.
+        - :order: (str,optional) - The sort order, e.g. "name asc, id desc".
+        - :stream: (bool,optional) - Return a generator of record pages instead of one list, for full exports.
+        - :page_size: (int,optional) - The number of records per page when streaming (default is 500).
 
     Returns:
         dict: A dictionary containing the retrieved opportunities.
@@ -622,16 +766,16 @@ def odoo_get_many_opportunity(cred,params):
             apiPassword = creds["apiPassword"]
             limit = params.get("limit")
             fields = params.get("fields", [])
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            domain = params.get("domain", [])
+            offset = params.get("offset", 0)
+            order = params.get("order")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "crm.lead"
-                ids = models.execute_kw(db, uid, apiPassword, model, "search", [[]])
-                data = models.execute_kw(
-                    db, uid, apiPassword, model, "read", [ids], {"fields": fields}
-                )
-                return {"Opportunities": data[:limit]}
+                if params.get("stream", False):
+                    return session.iter_records(model, domain, fields, params.get("page_size"), order, offset, limit)
+                data = session.search_read(model, domain, fields, limit, offset, order)
+                return {"Opportunities": data}
             else:
                 raise Exception("Authentication failed. Please check your credentials.")
         else:
@@ -663,15 +807,13 @@ def odoo_delete_opportunity(cred,params):
             username = creds["username"]
             apiPassword = creds["apiPassword"]
             id = params.get("opportunity_id")
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "crm.lead"
-                if models.execute_kw(
-                    db, uid, apiPassword, model, "search", [[("id", "=", int(id))]]
+                if session.execute_kw(
+                    model, "search", [[("id", "=", int(id))]]
                 ):
-                    models.execute_kw(db, uid, apiPassword, model, "unlink", [[id]])
+                    session.execute_kw(model, "unlink", [[id]])
                     return {"message": "Deleted successfully"}
                 else:
                     raise Exception("ID not found or could not be deleted.")
@@ -713,10 +855,8 @@ def odoo_update_opportunity(cred,params):
             username = creds["username"]
             apiPassword = creds["apiPassword"]
             id = params["opportunity_id"]
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "crm.lead"
                 data = {}
                 for key, value in params.items():
@@ -726,11 +866,11 @@ def odoo_update_opportunity(cred,params):
                     if value:
                         data[key] = value
                 if data:
-                    if models.execute_kw(
-                        db, uid, apiPassword, model, "search", [[("id", "=", int(id))]]
+                    if session.execute_kw(
+                        model, "search", [[("id", "=", int(id))]]
                     ):
-                        models.execute_kw(
-                            db, uid, apiPassword, model, "write", [[int(id)], data]
+                        session.execute_kw(
+                            model, "write", [[int(id)], data]
                         )
                         return {"message": "Updated successfully"}
                     else:
@@ -771,16 +911,14 @@ def odoo_create_sales_team(cred,params):
             db = creds["db"]
             username = creds["username"]
             apiPassword = creds["apiPassword"]
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "crm.team"
                 data = {}
                 for key, value in params.items():
                     if value:
                         data[key] = value
-                id = models.execute_kw(db, uid, apiPassword, model, "create", [data])
+                id = session.execute_kw(model, "create", [data])
                 return {"id": id}
             else:
                 raise Exception("Authentication failed. Please check your credentials.")
@@ -816,13 +954,11 @@ def odoo_get_sales_team_by_id(cred,params):
             apiPassword = creds["apiPassword"]
             id = params.get("sales_team_id")
             fields = params.get("fields", [])
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "crm.team"
-                data = models.execute_kw(
-                    db, uid, apiPassword, model, "read", [int(id)], {"fields": fields}
+                data = session.execute_kw(
+                    model, "read", [int(id)], {"fields": fields}
                 )
                 if data:
                     return {"SalesTeam": data}
@@ -849,6 +985,11 @@ def odoo_get_many_sales_team(cred,params):
         - :limit: (int,optional) - The maximum number of sales team to retrieve.
         - :fields: (list,optional) - List of fields to include in the response.
             Available fields: name, alias_name, alias_email , user_id , opportunities_count , invoiced_target .
+        - :domain: (list,optional) - Odoo search domain, e.g. [["create_date", ">=", "2024-01-01"]].
+        - :offset: (int,optional) - The number of records to skip.
+        - :order: (str,optional) - The sort order, e.g. "name asc, id desc".
+        - :stream: (bool,optional) - Return a generator of record pages instead of one list, for full exports.
+        - :page_size: (int,optional) - The number of records per page when streaming (default is 500).
 
     Returns:
         dict: A dictionary containing the retrieved sales team.
@@ -863,16 +1004,16 @@ def odoo_get_many_sales_team(cred,params):
             apiPassword = creds["apiPassword"]
             limit = params.get("limit")
             fields = params.get("fields", [])
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            domain = params.get("domain", [])
+            offset = params.get("offset", 0)
+            order = params.get("order")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "crm.team"
-                ids = models.execute_kw(db, uid, apiPassword, model, "search", [[]])
-                data = models.execute_kw(
-                    db, uid, apiPassword, model, "read", [ids], {"fields": fields}
-                )
-                return {"SalesTeams": data[:limit]}
+                if params.get("stream", False):
+                    return session.iter_records(model, domain, fields, params.get("page_size"), order, offset, limit)
+                data = session.search_read(model, domain, fields, limit, offset, order)
+                return {"SalesTeams": data}
             else:
                 raise Exception(
                     {"error": "Authentication failed. Please check your credentials."}
@@ -906,15 +1047,13 @@ def odoo_delete_sales_team(cred,params):
             username = creds["username"]
             apiPassword = creds["apiPassword"]
             id = params.get("sales_team_id")
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "crm.team"
-                if models.execute_kw(
-                    db, uid, apiPassword, model, "search", [[("id", "=", int(id))]]
+                if session.execute_kw(
+                    model, "search", [[("id", "=", int(id))]]
                 ):
-                    models.execute_kw(db, uid, apiPassword, model, "unlink", [[id]])
+                    session.execute_kw(model, "unlink", [[id]])
                     return {"message": "Deleted successfully"}
                 else:
                     raise Exception("ID not found or could not be deleted.")
@@ -953,10 +1092,8 @@ def odoo_update_sales_team(cred,params):
             username = creds["username"]
             apiPassword = creds["apiPassword"]
             id = params["sales_team_id"]
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "crm.team"
                 data = {}
                 for key, value in params.items():
@@ -966,11 +1103,11 @@ def odoo_update_sales_team(cred,params):
                     if value:
                         data[key] = value
                 if data:
-                    if models.execute_kw(
-                        db, uid, apiPassword, model, "search", [[("id", "=", int(id))]]
+                    if session.execute_kw(
+                        model, "search", [[("id", "=", int(id))]]
                     ):
-                        models.execute_kw(
-                            db, uid, apiPassword, model, "write", [[int(id)], data]
+                        session.execute_kw(
+                            model, "write", [[int(id)], data]
                         )
                         return {"message": "Updated successfully"}
                     else:
@@ -1008,16 +1145,14 @@ def odoo_create_sales_team_member(cred,params):
             db = creds["db"]
             username = creds["username"]
             apiPassword = creds["apiPassword"]
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "crm.team.member"
                 data = {}
                 for key, value in params.items():
                     if value:
                         data[key] = value
-                id = models.execute_kw(db, uid, apiPassword, model, "create", [data])
+                id = session.execute_kw(model, "create", [data])
                 return {"id": id}
             else:
                 raise Exception("Authentication failed. Please check your credentials.")
@@ -1054,13 +1189,11 @@ def odoo_get_sales_team_member_by_id(cred,params):
             apiPassword = creds["apiPassword"]
             id = params.get("crm_team_id")
             fields = params.get("fields", [])
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "crm.team.member"
-                data = models.execute_kw(
-                    db, uid, apiPassword, model, "read", [int(id)], {"fields": fields}
+                data = session.execute_kw(
+                    model, "read", [int(id)], {"fields": fields}
                 )
                 if data:
                     return {"SalesTeamMember": data}
@@ -1087,6 +1220,11 @@ def odoo_get_many_sales_team_member(cred,params):
         - :limit: (int,optional) - The maximum number of sales team member to retrieve.
         - :fields: (list,optional) - List of fields to include in the response.
             Available fields: name, crm_team_id, email , user_id , lead_month_count .
+        - :domain: (list,optional) - Odoo search domain, e.g. [["create_date", ">=", "2024-01-01"]].
+        - :offset: (int,optional) - The number of records to skip.
+        - :order: (str,optional) - The sort order, e.g. "name asc, id desc".
+        - :stream: (bool,optional) - Return a generator of record pages instead of one list, for full exports.
+        - :page_size: (int,optional) - The number of records per page when streaming (default is 500).
 
     Returns:
         dict: A dictionary containing the retrieved sales team member.
@@ -1100,16 +1238,16 @@ def odoo_get_many_sales_team_member(cred,params):
             apiPassword = creds["apiPassword"]
             limit = params.get("limit")
             fields = params.get("fields", [])
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            domain = params.get("domain", [])
+            offset = params.get("offset", 0)
+            order = params.get("order")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "crm.team.member"
-                ids = models.execute_kw(db, uid, apiPassword, model, "search", [[]])
-                data = models.execute_kw(
-                    db, uid, apiPassword, model, "read", [ids], {"fields": fields}
-                )
-                return {"SalesTeamMembers": data[:limit]}
+                if params.get("stream", False):
+                    return session.iter_records(model, domain, fields, params.get("page_size"), order, offset, limit)
+                data = session.search_read(model, domain, fields, limit, offset, order)
+                return {"SalesTeamMembers": data}
             else:
                 raise Exception("Authentication failed. Please check your credentials.")
         else:
@@ -1141,15 +1279,13 @@ def odoo_delete_sales_team_member(cred,params):
             username = creds["username"]
             apiPassword = creds["apiPassword"]
             id = params.get("crm_team_id")
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "crm.team.member"
-                if models.execute_kw(
-                    db, uid, apiPassword, model, "search", [[("id", "=", int(id))]]
+                if session.execute_kw(
+                    model, "search", [[("id", "=", int(id))]]
                 ):
-                    models.execute_kw(db, uid, apiPassword, model, "unlink", [[id]])
+                    session.execute_kw(model, "unlink", [[id]])
                     return {"message": "Deleted successfully"}
                 else:
                     raise Exception("ID not found or could not be deleted.")
@@ -1174,7 +1310,12 @@ def odoo_get_many_sale_orders(cred,params):
         - :limit: (int,optional) - The maximum number of sales orders to retrieve.
         - :fields: (list,optional) - List of fields to include in the response.
             Available fields: name, partner_id, user_id , team_id , order_line , note .
-          
+        - :domain: (list,optional) - Odoo search domain, e.g. [["create_date", ">=", "2024-01-01"]].
+        - :offset: (int,optional) - The number of records to skip.
+        - :order: (str,optional) - The sort order, e.g. "name asc, id desc".
+        - :stream: (bool,optional) - Return a generator of record pages instead of one list, for full exports.
+        - :page_size: (int,optional) - The number of records per page when streaming (default is 500).
+
     Returns:
         dict: A dictionary containing the retrieved sales orders.
     """
@@ -1187,16 +1328,16 @@ def odoo_get_many_sale_orders(cred,params):
             apiPassword = creds["apiPassword"]
             limit = params.get("limit")
             fields = params.get("fields", [])
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            domain = params.get("domain", [])
+            offset = params.get("offset", 0)
+            order = params.get("order")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "sale.order"
-                ids = models.execute_kw(db, uid, apiPassword, model, "search", [[]])
-                data = models.execute_kw(
-                    db, uid, apiPassword, model, "read", [ids], {"fields": fields}
-                )
-                return {"SalesOrders": data[:limit]}
+                if params.get("stream", False):
+                    return session.iter_records(model, domain, fields, params.get("page_size"), order, offset, limit)
+                data = session.search_read(model, domain, fields, limit, offset, order)
+                return {"SalesOrders": data}
             else:
                 raise Exception("Authentication failed. Please check your credentials.")
         else:
@@ -1232,10 +1373,8 @@ def odoo_create_sale_order(cred,params):
             username = creds["username"]
             apiPassword = creds["apiPassword"]
             order_lines_data = params.get("order_lines_data")
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "sale.order"
                 order_lines = [
                     (
@@ -1259,7 +1398,7 @@ def odoo_create_sale_order(cred,params):
                         continue
                     if value:
                         data[key] = value
-                id = models.execute_kw(db, uid, apiPassword, model, "create", [data])
+                id = session.execute_kw(model, "create", [data])
                 return {"id": id}
             else:
                 raise Exception("Authentication failed. Please check your credentials.")
@@ -1297,11 +1436,9 @@ def odoo_update_sale_order(cred,params):
             apiPassword = creds["apiPassword"]
             id = params["order_id"]
             order_lines_data = params.get("order_lines_data", [])
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
+            session = get_odoo_session(url, db, username, apiPassword)
             data = {}
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            if session.uid:
                 model = "sale.order"
                 if order_lines_data:
                     order_lines = [
@@ -1323,11 +1460,11 @@ def odoo_update_sale_order(cred,params):
                     if value:
                         data[key] = value
                 if data:
-                    if models.execute_kw(
-                        db, uid, apiPassword, model, "search", [[("id", "=", int(id))]]
+                    if session.execute_kw(
+                        model, "search", [[("id", "=", int(id))]]
                     ):
-                        models.execute_kw(
-                            db, uid, apiPassword, model, "write", [[int(id)], data]
+                        session.execute_kw(
+                            model, "write", [[int(id)], data]
                         )
                         return {"message": "Updated successfully"}
                     else:
@@ -1366,15 +1503,13 @@ def odoo_delete_sale_order(cred,params):
             username = creds["username"]
             apiPassword = creds["apiPassword"]
             id = params.get("order_id")
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "sale.order"
-                if models.execute_kw(
-                    db, uid, apiPassword, model, "search", [[("id", "=", int(id))]]
+                if session.execute_kw(
+                    model, "search", [[("id", "=", int(id))]]
                 ):
-                    models.execute_kw(db, uid, apiPassword, model, "unlink", [[id]])
+                    session.execute_kw(model, "unlink", [[id]])
                     return {"message": "Deleted successfully"}
                 else:
                     raise Exception("ID not found or could not be deleted.")
@@ -1413,13 +1548,11 @@ def odoo_get_sale_order_by_id(cred,params):
             apiPassword = creds["apiPassword"]
             id = params.get("order_id")
             fields = params.get("fields", [])
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "sale.order"
-                data = models.execute_kw(
-                    db, uid, apiPassword, model, "read", [int(id)], {"fields": fields}
+                data = session.execute_kw(
+                    model, "read", [int(id)], {"fields": fields}
                 )
                 if data:
                     return {"SalesOrder": data}
@@ -1446,6 +1579,11 @@ def odoo_get_many_company(cred,params):
         - :limit: (int,optional) - The maximum number of companies to retrieve.
         - :fields: (list,optional) - List of fields to include in the response.
             Available fields: name, email, phone, mobile, website, vat, city, country_id, state_id, street, street2, zip.
+        - :domain: (list,optional) - Odoo search domain, e.g. [["create_date", ">=", "2024-01-01"]].
+        - :offset: (int,optional) - The number of records to skip.
+        - :order: (str,optional) - The sort order, e.g. "name asc, id desc".
+        - :stream: (bool,optional) - Return a generator of record pages instead of one list, for full exports.
+        - :page_size: (int,optional) - The number of records per page when streaming (default is 500).
 
     Returns:
         dict: A dictionary containing the retrieved companies.
@@ -1460,16 +1598,16 @@ def odoo_get_many_company(cred,params):
             apiPassword = creds["apiPassword"]
             limit = params.get("limit")
             fields = params.get("fields", [])
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            domain = params.get("domain", [])
+            offset = params.get("offset", 0)
+            order = params.get("order")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "res.company"
-                ids = models.execute_kw(db, uid, apiPassword, model, "search", [[]])
-                data = models.execute_kw(
-                    db, uid, apiPassword, model, "read", [ids], {"fields": fields}
-                )
-                return {"Companies": data[:limit]}
+                if params.get("stream", False):
+                    return session.iter_records(model, domain, fields, params.get("page_size"), order, offset, limit)
+                data = session.search_read(model, domain, fields, limit, offset, order)
+                return {"Companies": data}
             else:
                 raise Exception("Authentication failed. Please check your credentials.")
         else:
@@ -1512,16 +1650,14 @@ def odoo_create_company(cred,params):
             db = creds["db"]
             username = creds["username"]
             apiPassword = creds["apiPassword"]
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "res.company"
                 data = {}
                 for key, value in params.items():
                     if value:
                         data[key] = value
-                id = models.execute_kw(db, uid, apiPassword, model, "create", [data])
+                id = session.execute_kw(model, "create", [data])
                 return {"id": id}
             else:
                 raise Exception("Authentication failed. Please check your credentials.")
@@ -1558,13 +1694,11 @@ def odoo_get_company_by_id(cred,params):
             apiPassword = creds["apiPassword"]
             id = params.get("company_id")
             fields = params.get("fields", [])
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "res.company"
-                data = models.execute_kw(
-                    db, uid, apiPassword, model, "read", [int(id)], {"fields": fields}
+                data = session.execute_kw(
+                    model, "read", [int(id)], {"fields": fields}
                 )
                 if data:
                     return {"Company": data}
@@ -1614,10 +1748,8 @@ def odoo_update_company(cred,params):
             username = creds["username"]
             apiPassword = creds["apiPassword"]
             id = params["company_id"]
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "res.company"
                 data = {}
                 for key, value in params.items():
@@ -1627,11 +1759,11 @@ def odoo_update_company(cred,params):
                     if value:
                         data[key] = value
                 if data:
-                    if models.execute_kw(
-                        db, uid, apiPassword, model, "search", [[("id", "=", int(id))]]
+                    if session.execute_kw(
+                        model, "search", [[("id", "=", int(id))]]
                     ):
-                        models.execute_kw(
-                            db, uid, apiPassword, model, "write", [[int(id)], data]
+                        session.execute_kw(
+                            model, "write", [[int(id)], data]
                         )
                         return {"message": "Updated successfully"}
                     else:
@@ -1659,7 +1791,12 @@ def odoo_get_many_product(cred,params):
         - :limit: (int,optional) - The maximum number of products to retrieve.
         - :fields: (list,optional) - List of fields to include in the response.
             Available fields: name, standard_price, list_price, description .
-          
+        - :domain: (list,optional) - Odoo search domain, e.g. [["create_date", ">=", "2024-01-01"]].
+        - :offset: (int,optional) - The number of records to skip.
+        - :order: (str,optional) - The sort order, e.g. "name asc, id desc".
+        - :stream: (bool,optional) - Return a generator of record pages instead of one list, for full exports.
+        - :page_size: (int,optional) - The number of records per page when streaming (default is 500).
+
     Returns:
         dict: A dictionary containing the retrieved products.
     """
@@ -1673,16 +1810,16 @@ def odoo_get_many_product(cred,params):
             apiPassword = creds["apiPassword"]        
             limit = params.get("limit")
             fields = params.get("fields", [])
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            domain = params.get("domain", [])
+            offset = params.get("offset", 0)
+            order = params.get("order")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "product.template"
-                ids = models.execute_kw(db, uid, apiPassword, model, "search", [[]])
-                data = models.execute_kw(
-                    db, uid, apiPassword, model, "read", [ids], {"fields": fields}
-                )
-                return {"Products": data[:limit]}
+                if params.get("stream", False):
+                    return session.iter_records(model, domain, fields, params.get("page_size"), order, offset, limit)
+                data = session.search_read(model, domain, fields, limit, offset, order)
+                return {"Products": data}
             else:
                 raise Exception("Authentication failed. Please check your credentials.")
         else:
@@ -1717,16 +1854,14 @@ def odoo_create_product(cred,params):
             db = creds["db"]
             username = creds["username"]
             apiPassword = creds["apiPassword"]  
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "product.template"
                 data = {}
                 for key, value in params.items():
                     if value:
                         data[key] = value
-                id = models.execute_kw(db, uid, apiPassword, model, "create", [data])
+                id = session.execute_kw(model, "create", [data])
                 return {"id": id}
             else:
                 raise Exception("Authentication failed. Please check your credentials.")
@@ -1763,13 +1898,11 @@ def odoo_get_product_by_id(cred,params):
             apiPassword = creds["apiPassword"]  
             id = params.get("product_id")
             fields = params.get("fields", [])
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "product.template"
-                data = models.execute_kw(
-                    db, uid, apiPassword, model, "read", [int(id)], {"fields": fields}
+                data = session.execute_kw(
+                    model, "read", [int(id)], {"fields": fields}
                 )
                 if data:
                     return {"Product": data}
@@ -1807,15 +1940,13 @@ def odoo_delete_product(cred,params):
             username = creds["username"]
             apiPassword = creds["apiPassword"]  
             id = params.get("product_id")
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "product.template"
-                if models.execute_kw(
-                    db, uid, apiPassword, model, "search", [[("id", "=", int(id))]]
+                if session.execute_kw(
+                    model, "search", [[("id", "=", int(id))]]
                 ):
-                    models.execute_kw(db, uid, apiPassword, model, "unlink", [[id]])
+                    session.execute_kw(model, "unlink", [[id]])
                     return {"message": "Deleted successfully"}
                 else:
                     raise Exception("ID not found or could not be deleted.")
@@ -1855,10 +1986,8 @@ def odoo_update_product(cred,params):
             username = creds["username"]
             apiPassword = creds["apiPassword"]  
             id = params["product_id"]
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "product.template"
                 data = {}
                 for key, value in params.items():
@@ -1868,11 +1997,11 @@ def odoo_update_product(cred,params):
                     if value:
                         data[key] = value
                 if data:
-                    if models.execute_kw(
-                        db, uid, apiPassword, model, "search", [[("id", "=", int(id))]]
+                    if session.execute_kw(
+                        model, "search", [[("id", "=", int(id))]]
                     ):
-                        models.execute_kw(
-                            db, uid, apiPassword, model, "write", [[int(id)], data]
+                        session.execute_kw(
+                            model, "write", [[int(id)], data]
                         )
                         return {"message": "Updated successfully"}
                     else:
@@ -1900,7 +2029,12 @@ def odoo_get_many_product_category(cred,params):
         - :limit: (int,optional) - The maximum number of product category to retrieve.
         - :fields: (list,optional) - List of fields to include in the response.
             Available fields: name .
-          
+        - :domain: (list,optional) - Odoo search domain, e.g. [["create_date", ">=", "2024-01-01"]].
+        - :offset: (int,optional) - The number of records to skip.
+        - :order: (str,optional) - The sort order, e.g. "name asc, id desc".
+        - :stream: (bool,optional) - Return a generator of record pages instead of one list, for full exports.
+        - :page_size: (int,optional) - The number of records per page when streaming (default is 500).
+
     Returns:
         dict: A dictionary containing the retrieved product category.
     """
@@ -1914,16 +2048,16 @@ def odoo_get_many_product_category(cred,params):
             apiPassword = creds["apiPassword"]  
             limit = params.get("limit")
             fields = params.get("fields", [])
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            domain = params.get("domain", [])
+            offset = params.get("offset", 0)
+            order = params.get("order")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "product.category"
-                ids = models.execute_kw(db, uid, apiPassword, model, "search", [[]])
-                data = models.execute_kw(
-                    db, uid, apiPassword, model, "read", [ids], {"fields": fields}
-                )
-                return {"Categories": data[:limit]}
+                if params.get("stream", False):
+                    return session.iter_records(model, domain, fields, params.get("page_size"), order, offset, limit)
+                data = session.search_read(model, domain, fields, limit, offset, order)
+                return {"Categories": data}
             else:
                 raise Exception("Authentication failed. Please check your credentials.")
         else:
@@ -1955,16 +2089,14 @@ def odoo_create_product_category(cred,params):
             db = creds["db"]
             username = creds["username"]
             apiPassword = creds["apiPassword"]  
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "product.category"
                 data = {}
                 for key, value in params.items():
                     if value:
                         data[key] = value
-                id = models.execute_kw(db, uid, apiPassword, model, "create", [data])
+                id = session.execute_kw(model, "create", [data])
                 return {"id": id}
             else:
                 raise Exception("Authentication failed. Please check your credentials.")
@@ -2001,13 +2133,11 @@ def odoo_get_product_category_by_id(cred,params):
             apiPassword = creds["apiPassword"]  
             id = params.get("category_id")
             fields = params.get("fields", [])
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "product.category"
-                data = models.execute_kw(
-                    db, uid, apiPassword, model, "read", [int(id)], {"fields": fields}
+                data = session.execute_kw(
+                    model, "read", [int(id)], {"fields": fields}
                 )
                 if data:
                     return {"Category": data}
@@ -2046,10 +2176,8 @@ def odoo_update_product_category(cred,params):
             username = creds["username"]
             apiPassword = creds["apiPassword"]
             id = params["category_id"]
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "product.category"
                 data = {}
                 for key, value in params.items():
@@ -2059,11 +2187,11 @@ def odoo_update_product_category(cred,params):
                     if value:
                         data[key] = value
                 if data:
-                    if models.execute_kw(
-                        db, uid, apiPassword, model, "search", [[("id", "=", int(id))]]
+                    if session.execute_kw(
+                        model, "search", [[("id", "=", int(id))]]
                     ):
-                        models.execute_kw(
-                            db, uid, apiPassword, model, "write", [[int(id)], data]
+                        session.execute_kw(
+                            model, "write", [[int(id)], data]
                         )
                         return {"message": "Updated successfully"}
                     else:
@@ -2102,15 +2230,13 @@ def odoo_delete_product_category(cred,params):
             username = creds["username"]
             apiPassword = creds["apiPassword"]
             id = params.get("category_id")
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 model = "product.category"
-                if models.execute_kw(
-                    db, uid, apiPassword, model, "search", [[("id", "=", int(id))]]
+                if session.execute_kw(
+                    model, "search", [[("id", "=", int(id))]]
                 ):
-                    models.execute_kw(db, uid, apiPassword, model, "unlink", [[id]])
+                    session.execute_kw(model, "unlink", [[id]])
                     return {"message": "Deleted successfully"}
                 else:
                     raise Exception("ID not found or could not be deleted.")
@@ -2135,7 +2261,12 @@ def odoo_get_many_CustomResource(cred,params):
         - :model: (str,required): The Odoo model for the custom resource.
         - :limit: (int,optional) - The maximum number of records to retrieve.
         - :fields: (list,optional) - List of fields to include in the response.
-          
+        - :domain: (list,optional) - Odoo search domain, e.g. [["create_date", ">=", "2024-01-01"]].
+        - :offset: (int,optional) - The number of records to skip.
+        - :order: (str,optional) - The sort order, e.g. "name asc, id desc".
+        - :stream: (bool,optional) - Return a generator of record pages instead of one list, for full exports.
+        - :page_size: (int,optional) - The number of records per page when streaming (default is 500).
+
     Returns:
         dict: A dictionary containing the retrieved custom resources.
     """
@@ -2149,15 +2280,15 @@ def odoo_get_many_CustomResource(cred,params):
             model = params.get("model")
             limit = params.get("limit")
             fields = params.get("fields", [])
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
-                ids = models.execute_kw(db, uid, apiPassword, model, "search", [[]])
-                data = models.execute_kw(
-                    db, uid, apiPassword, model, "read", [ids], {"fields": fields}
-                )
-                return data[:limit]
+            domain = params.get("domain", [])
+            offset = params.get("offset", 0)
+            order = params.get("order")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
+                if params.get("stream", False):
+                    return session.iter_records(model, domain, fields, params.get("page_size"), order, offset, limit)
+                data = session.search_read(model, domain, fields, limit, offset, order)
+                return data
             else:
                 raise Exception("Authentication failed. Please check your credentials.")
         else:
@@ -2194,10 +2325,8 @@ def odoo_create_CustomResource(cred,params):
             username = creds["username"]
             apiPassword = creds["apiPassword"]
             model = params.get("model")
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 data = {}
                 for key, value in params.items():
                     skip_keys = ["model"]
@@ -2205,7 +2334,7 @@ def odoo_create_CustomResource(cred,params):
                         continue
                     if value:
                         data[key] = value
-                id = models.execute_kw(db, uid, apiPassword, model, "create", [data])
+                id = session.execute_kw(model, "create", [data])
                 return {"id": id}
             else:
                 raise Exception("Authentication failed. Please check your credentials.")
@@ -2243,12 +2372,10 @@ def odoo_get_CustomResource_by_id(cred,params):
             id = params.get("customResource_id")
             fields = params.get("fields", [])
             model = params.get("model")
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
-                data = models.execute_kw(
-                    db, uid, apiPassword, model, "read", [int(id)], {"fields": fields}
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
+                data = session.execute_kw(
+                    model, "read", [int(id)], {"fields": fields}
                 )
                 if data:
                     return data
@@ -2291,10 +2418,8 @@ def odoo_update_CustomResource(cred,params):
             apiPassword = creds["apiPassword"]
             id = params["customResource_id"]
             model = params.get("model")
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
                 data = {}
                 for key, value in params.items():
                     skip_keys = ["customResource_id", "model"]
@@ -2303,11 +2428,11 @@ def odoo_update_CustomResource(cred,params):
                     if value:
                         data[key] = value
                 if data:
-                    if models.execute_kw(
-                        db, uid, apiPassword, model, "search", [[("id", "=", int(id))]]
+                    if session.execute_kw(
+                        model, "search", [[("id", "=", int(id))]]
                     ):
-                        models.execute_kw(
-                            db, uid, apiPassword, model, "write", [[int(id)], data]
+                        session.execute_kw(
+                            model, "write", [[int(id)], data]
                         )
                         return {"message": "Updated successfully"}
                     else:
@@ -2347,14 +2472,12 @@ def odoo_delete_CustomResource(cred,params):
             apiPassword = creds["apiPassword"]
             id = params.get("customResource_id")
             model = params.get("model")
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-            uid = common.authenticate(db, username, apiPassword, {})
-            if uid:
-                models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
-                if models.execute_kw(
-                    db, uid, apiPassword, model, "search", [[("id", "=", int(id))]]
+            session = get_odoo_session(url, db, username, apiPassword)
+            if session.uid:
+                if session.execute_kw(
+                    model, "search", [[("id", "=", int(id))]]
                 ):
-                    models.execute_kw(db, uid, apiPassword, model, "unlink", [[id]])
+                    session.execute_kw(model, "unlink", [[id]])
                     return {"message": "Deleted successfully"}
                 else:
                     raise Exception("ID not found or could not be deleted.")
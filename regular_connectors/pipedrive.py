@@ -1,5 +1,6 @@
 import json
 import requests
+from oauth_token_cache import get_cached_token
 status = [200, 201, 202, 204, 206, 207, 208]
 
 def pipedrive_refresh_token(cred):
@@ -12,12 +13,14 @@ def pipedrive_refresh_token(cred):
             'client_secret': creds['clientSecret'],
             'refresh_token': creds['refreshToken'],
         }
-        response = requests.post(token_endpoint, data=data)
-        if response.status_code in status:
-            token_data = response.json()['access_token']
-            return token_data
-        else:
-            raise Exception(f"Failed to refresh Pipedrive token. Status code: {response.status_code}. Response: {response.text}")
+        def request_token():
+            response = requests.post(token_endpoint, data=data)
+            if response.status_code in status:
+                return response.json()
+            else:
+                raise Exception(f"Failed to refresh Pipedrive token. Status code: {response.status_code}. Response: {response.text}")
+        token_data = get_cached_token("pipedrive", creds, request_token)['access_token']
+        return token_data
     except Exception as e:
         raise Exception(e)
 
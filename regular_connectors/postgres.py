@@ -1,66 +1,278 @@
 import psycopg2
 from psycopg2 import OperationalError
-import json, datetime, decimal
+from psycopg2.pool import ThreadedConnectionPool, PoolError
+from psycopg2.extras import Json, execute_values
+import json, datetime, decimal, hashlib, threading, time, itertools, uuid
+
+# Connection pools shared by every postgres_* call of the process, keyed by connection parameters
+POOL_MAX_SIZE = 10
+POOL_WAIT_TIMEOUT = 10
+# pooled connections idle for longer are checked with a SELECT 1 before being handed over
+POOL_CHECK_IDLE = 30
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def connection_parameters(creds):
+    """
+    Map the PostgreSQL credentials to the keyword arguments of psycopg2.connect.
+
+    :param creds: Dictionary containing PostgreSQL database credentials.
+    :return: Connection keyword arguments.
+    :rtype: dict
+    """
+    return {
+        "host": creds["host"],
+        "database": creds["database"],
+        "user": creds["username"],
+        "password": creds["password"],
+        "port": creds["port"],
+        "sslmode": creds.get("sslMode", "disable"),
+    }
+
+
+class LazyConnectionPool(ThreadedConnectionPool):
+    """
+    ThreadedConnectionPool opening its connections on demand and keeping up to maxconn of them once returned,
+    where ThreadedConnectionPool opens minconn connections upfront and closes the returned ones beyond minconn.
+    """
+
+    def __init__(self, maxconn, *args, **kwargs):
+        super().__init__(0, maxconn, *args, **kwargs)
+        # the connections kept by putconn are bounded by minconn
+        self.minconn = self.maxconn
+        self._returned_at = {}
+
+    def putconn(self, conn=None, key=None, close=False):
+        if not close:
+            self._returned_at[id(conn)] = time.monotonic()
+        super().putconn(conn, key, close)
+
+    def is_alive(self, conn):
+        """
+        Check a connection got from the pool, with a SELECT 1 when it was idle for more than POOL_CHECK_IDLE seconds:
+        con.closed is not set when the server dropped the connection (e.g. after a restart).
+        """
+        if conn.closed:
+            return False
+        returned_at = self._returned_at.pop(id(conn), None)
+        if returned_at is None or time.monotonic() - returned_at < POOL_CHECK_IDLE:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+
+def get_pool(creds):
+    """
+    Return the connection pool matching the credentials, creating it if needed.
+
+    :param creds: Dictionary containing PostgreSQL database credentials, "poolSize" is honoured (default: 10).
+    :return: The connection pool.
+    :rtype: LazyConnectionPool
+    """
+    parameters = connection_parameters(creds)
+    key = hashlib.sha256(json.dumps(parameters, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool.closed:
+            # no connection is opened here, the registry lock is never held while connecting
+            pool = LazyConnectionPool(int(creds.get("poolSize") or POOL_MAX_SIZE), **parameters)
+            _pools[key] = pool
+        return pool
+
+
+def close_pools():
+    """
+    Close every connection of every pool and forget the pools.
+    """
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.closeall()
+        _pools.clear()
+
 
 def create_connection(creds):
+    """
+    Borrow a live connection from the pool matching the credentials, the dead ones are closed and replaced.
+    Give it back with release_connection.
+
+    :param creds: Dictionary containing PostgreSQL database credentials.
+    :return: psycopg2 connection object.
+    """
     try:
-        con = psycopg2.connect(
-            host=creds["host"],
-            database=creds["database"],
-            user=creds["username"],
-            password=creds["password"],
-            port=creds['port'],
-            sslmode = creds.get("sslMode","disable")
-        )
-        return con
+        pool = get_pool(creds)
+        deadline = time.monotonic() + POOL_WAIT_TIMEOUT
+        while True:
+            try:
+                con = pool.getconn()
+            except PoolError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.05)
+                continue
+            if not pool.is_alive(con):
+                pool.putconn(con, close=True)
+                continue
+            return con
     except OperationalError  as error:
         raise Exception(f"Error while connecting to postgreSQL: {error}")
-    
+
+
+def release_connection(creds, con):
+    """
+    Give a connection back to its pool, rolling back any open transaction.
+    Broken connections are closed instead of being kept.
+
+    :param creds: Dictionary containing PostgreSQL database credentials.
+    :param con: psycopg2 connection object returned by create_connection.
+    """
+    get_pool(creds).putconn(con, close=bool(con.closed))
+
+
+def bind_value(value):
+    """
+    Adapt a value before binding it to a query placeholder.
+
+    :param value: The value given by the user.
+    :return: The value, wrapped in Json when it is a dictionary.
+    """
+    if isinstance(value, dict):
+        return Json(value)
+    return value
+
+
+def execute_query(creds, query, values=None, fetch=False):
+    """
+    Execute one query on a pooled connection, with its values bound to %s placeholders.
+
+    :param creds: Dictionary containing PostgreSQL database credentials.
+    :param str query: The SQL query.
+    :param values: Values bound to the placeholders of the query.
+    :param bool fetch: Return the rows of the query, formatted with format_value.
+    :return: The formatted rows when fetch is set, None otherwise.
+    :rtype: list
+    """
+    con = create_connection(creds)
+    try:
+        with con.cursor() as cursor:
+            cursor.execute(query, values)
+            result = None
+            if fetch:
+                column_names = [desc[0] for desc in cursor.description]
+                result = format_rows(column_names, cursor.fetchall(), "dict")
+        con.commit()
+        return result
+    except Exception:
+        if not con.closed:
+            con.rollback()
+        raise
+    finally:
+        release_connection(creds, con)
+
+
+def stream_query(creds, query, values=None, chunk_size=1000, row_format="dict"):
+    """
+    Execute a SELECT query on a named (server-side) cursor and yield its rows chunk by chunk.
+
+    Only one chunk is transferred and held in memory at a time. The pooled connection is
+    released when the generator ends or is closed.
+
+    :param creds: Dictionary containing PostgreSQL database credentials.
+    :param str query: The SELECT query.
+    :param values: Values bound to the placeholders of the query.
+    :param int chunk_size: Number of rows fetched per chunk.
+    :param str row_format: "dict", "tuple" or "columnar", see format_rows.
+    :return: Generator of formatted chunks.
+    :rtype: generator
+    """
+    con = create_connection(creds)
+    try:
+        with con.cursor(name="ubility_" + uuid.uuid4().hex) as cursor:
+            cursor.itersize = chunk_size
+            cursor.execute(query, values)
+            column_names = None
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                if column_names is None:
+                    column_names = [desc[0] for desc in cursor.description]
+                yield format_rows(column_names, rows, row_format)
+        con.commit()
+    finally:
+        release_connection(creds, con)
+
+
+def format_value(value):
+    """
+    Format a value to ensure it is JSON serializable.
+
+    :param value: A column value as returned by the cursor.
+    :return: The formatted value.
+    """
+    if isinstance(value, (int, float, str, bool)) or value is None:
+        return value
+    elif isinstance(value, datetime.datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S %z")
+    elif isinstance(value, datetime.date):
+        return value.strftime("%Y-%m-%d")
+    elif isinstance(value, decimal.Decimal):
+        return float(value)
+    elif isinstance(value, bytes):
+        return value.decode('utf-8')
+    elif isinstance(value, set):
+        return list(value)
+    return str(value)
+
+
+def format_rows(column_names, rows, row_format):
+    """
+    Format rows fetched from a cursor in a single pass.
+
+    :param list column_names: The column names of the result.
+    :param list rows: The rows as tuples.
+    :param str row_format: "dict" (one dictionary per row), "tuple" (one tuple per row) or "columnar" (one list per column).
+    :return: The formatted rows.
+    :rtype: list or dict
+    """
+    if row_format == "tuple":
+        return [tuple(format_value(value) for value in row) for row in rows]
+    elif row_format == "columnar":
+        return {
+            column: [format_value(value) for value in values]
+            for column, values in zip(column_names, zip(*rows))
+        }
+    return [{column: format_value(value) for column, value in zip(column_names, row)} for row in rows]
+
+
 def fetch_data_as_dict(cursor):
     """
     Fetch data from the cursor and convert it to a list of dictionaries.
-    
+
     :param cursor: psycopg2 cursor object.
     :return: List of dictionaries where each dictionary represents a row of data.
     :rtype: list
     """
     column_names = [desc[0] for desc in cursor.description]
-    rows = cursor.fetchall()
-    
-    result = []
-    for row in rows:
-        row_dict = dict(zip(column_names, row))
-        result.append(row_dict)
-    
-    return result
+    return [dict(zip(column_names, row)) for row in cursor.fetchall()]
 
 
 def format_data(record):
     """
-    Format data in the record to ensure it is JSON serializable.
-    
+    Format data in the record to ensure it is JSON serializable, see format_value.
+
     :param record: Dictionary representing a row of data.
     :return: Dictionary with formatted fields.
     :rtype: dict
     """
-    formatted_record = {}
-    for key, value in record.items():
-        if isinstance(value, datetime.datetime):
-            formatted_record[key] = value.strftime("%Y-%m-%d %H:%M:%S %z")
-        elif isinstance(value, datetime.date):
-            formatted_record[key] = value.strftime("%Y-%m-%d")
-        elif isinstance(value, decimal.Decimal):
-            formatted_record[key] = float(value)  
-        elif isinstance(value, bytes):
-            formatted_record[key] = value.decode('utf-8')  
-        elif isinstance(value, set):
-            formatted_record[key] = list(value)  
-        elif isinstance(value, (int, float, str, bool)) or value is None:
-            formatted_record[key] = value  
-        else:
-            formatted_record[key] = str(value) 
-            
-    return formatted_record
+    return {key: format_value(value) for key, value in record.items()}
+
 
 def postgres_create_table(creds, params):
     """
@@ -77,12 +289,8 @@ def postgres_create_table(creds, params):
     :rtype: str
     :raises Exception: If there is an issue with the PostgreSQL database or missing input data.
     """
-    cursor = None
-    con = None
     try:
         credentials=json.loads(creds)
-        con = create_connection(credentials)
-        cursor = con.cursor()
         if (
             "table_name" in params
             and params["table_name"]
@@ -98,20 +306,12 @@ def postgres_create_table(creds, params):
                 string_fields += f"{field} {fields[field]}, "
             string_fields = string_fields[:-2]
             query = f"CREATE TABLE IF NOT EXISTS {table_name} ({string_fields})"
-            cursor.execute(query)
-            con.commit()
+            execute_query(credentials, query)
             return "Table created successfully"
         else:
             raise Exception("Missing input data")
     except Exception as e:
-        if con:
-            con.rollback()
         raise Exception(e)
-    finally:
-        if cursor:
-            cursor.close()
-        if con:
-            con.close()
 
 
 
@@ -130,12 +330,8 @@ def postgres_insert_row(creds, params):
     :rtype: str
     :raises Exception: If there is an issue with the PostgreSQL database or missing input data.
     """
-    cursor = None
-    con = None
     try:
         credentials=json.loads(creds)
-        con = create_connection(credentials)
-        cursor = con.cursor()
         if (
             "table_name" in params
             and params["table_name"]
@@ -146,30 +342,178 @@ def postgres_insert_row(creds, params):
         ):
             table_name = params["table_name"]
             data = params["data"]
-            string_fields = ""
-            string_values = ""
-            for field in data.keys():
-                string_fields += f"{field}, "
-                string_values += f"'{data[field]}', "
-            string_fields = string_fields[:-2]
-            string_values = string_values[:-2]
+            string_fields = ", ".join(data.keys())
+            string_values = ", ".join(["%s"] * len(data))
+            values = tuple(bind_value(value) for value in data.values())
             query = (
                 f"INSERT INTO {table_name} ({string_fields}) VALUES ({string_values})"
             )
-            cursor.execute(query)
-            con.commit()
+            execute_query(credentials, query, values)
             return "Row inserted successfully"
         else:
-            if con:
-                con.rollback()
             raise Exception("Missing input data")
     except Exception as e:
         raise Exception(e)
+
+
+
+def csv_field(value):
+    """
+    Format a value as a CSV field for COPY: None stays unquoted so that it is loaded as NULL,
+    everything else is quoted.
+
+    :param value: The value given by the user.
+    :return: The CSV field.
+    :rtype: str
+    """
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    elif isinstance(value, bytes):
+        value = "\\x" + value.hex()
+    elif isinstance(value, (datetime.date, datetime.datetime, datetime.time)):
+        value = value.isoformat()
+    else:
+        value = str(value)
+    return '"' + value.replace('"', '""') + '"'
+
+
+class CopyStream:
+    """
+    File-like object serving rows as CSV lines to cursor.copy_expert.
+    Rows are consumed lazily, only the chunk being read is held in memory.
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.buffer = ""
+
+    def read(self, size=-1):
+        while self.rows is not None and (size < 0 or len(self.buffer) < size):
+            row = next(self.rows, None)
+            if row is None:
+                self.rows = None
+                break
+            self.buffer += ",".join(csv_field(value) for value in row) + "\n"
+        if size < 0:
+            data, self.buffer = self.buffer, ""
+        else:
+            data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+    def readline(self, size=-1):
+        return self.read(size)
+
+
+def postgres_bulk_insert_rows(creds, params):
+    """
+    Insert many rows into a table in a PostgreSQL database in one transaction.
+
+    Rows are streamed with COPY ... FROM STDIN (CSV) or, with the "values" method, sent as multi-row
+    INSERT pages with execute_values. Rows can be a list or any iterable, they are never all held in memory.
+
+    :param creds: Dictionary containing PostgreSQL database credentials.
+    :type creds: dict
+    :param params: Dictionary containing parameters.
+
+        - :table_name: (str, required) - The name of the table where the rows will be inserted.
+        - :rows: (list or iterable, required) - Rows to insert, as dictionaries or as sequences ordered like columns.
+        - :columns: (list, optional) - The columns to fill, required when rows are sequences (default: keys of the first row).
+        - :method: (str, optional) - "copy" (default) or "values". A list of rows falls back to "values" if the server does not support COPY.
+        - :page_size: (int, optional) - Number of rows per INSERT page for the "values" method (default: 1000).
+        - :upsert: (dict, optional) - Update the rows that already exist instead of failing.
+
+            - :conflict_columns: (list, required) - Columns of the unique constraint identifying existing rows.
+            - :update_columns: (list, optional) - Columns to update on conflict (default: none, existing rows are left as is).
+
+    :return: A message indicating successful insertion and the number of rows sent.
+    :rtype: dict
+    :raises Exception: If there is an issue with the PostgreSQL database or missing input data.
+    """
+    con = None
+    try:
+        credentials=json.loads(creds)
+        if not (
+            "table_name" in params
+            and params["table_name"]
+            and params["table_name"] != ""
+            and "rows" in params
+            and params["rows"] is not None
+        ):
+            raise Exception("Missing input data")
+        table_name = params["table_name"]
+        method = params.get("method", "copy")
+        page_size = int(params.get("page_size") or 1000)
+        upsert = params.get("upsert") or {}
+        rows = iter(params["rows"])
+        first_row = next(rows, None)
+        if first_row is None:
+            return {"message": "No rows to insert", "rows": 0}
+        columns = params.get("columns") or (list(first_row.keys()) if isinstance(first_row, dict) else None)
+        if not columns:
+            raise Exception("Missing columns for rows given as sequences")
+        if upsert and not upsert.get("conflict_columns"):
+            raise Exception("Missing conflict columns for upsert")
+        if method not in ("copy", "values"):
+            raise Exception("Invalid method")
+
+        sent = [0]
+        def values_of(all_rows):
+            for row in all_rows:
+                sent[0] += 1
+                yield [row.get(column) for column in columns] if isinstance(row, dict) else list(row)
+
+        string_fields = ", ".join(columns)
+        conflict_clause = ""
+        if upsert:
+            update_columns = upsert.get("update_columns") or []
+            conflict_clause = f" ON CONFLICT ({', '.join(upsert['conflict_columns'])}) "
+            if update_columns:
+                conflict_clause += "DO UPDATE SET " + ", ".join(f"{column} = EXCLUDED.{column}" for column in update_columns)
+            else:
+                conflict_clause += "DO NOTHING"
+
+        all_rows = itertools.chain([first_row], rows)
+        con = create_connection(credentials)
+        with con.cursor() as cursor:
+            if method == "copy":
+                try:
+                    target = table_name
+                    if upsert:
+                        target = "bulk_stage_" + uuid.uuid4().hex
+                        cursor.execute(f"CREATE TEMP TABLE {target} (LIKE {table_name} INCLUDING DEFAULTS) ON COMMIT DROP")
+                    cursor.copy_expert(
+                        f"COPY {target} ({string_fields}) FROM STDIN WITH (FORMAT csv)",
+                        CopyStream(values_of(all_rows)),
+                    )
+                    if upsert:
+                        cursor.execute(
+                            f"INSERT INTO {table_name} ({string_fields}) SELECT {string_fields} FROM {target}{conflict_clause}"
+                        )
+                except psycopg2.NotSupportedError:
+                    if not isinstance(params["rows"], list):
+                        raise
+                    con.rollback()
+                    sent[0] = 0
+                    method = "values"
+                    all_rows = iter(params["rows"])
+            if method == "values":
+                execute_values(
+                    cursor,
+                    f"INSERT INTO {table_name} ({string_fields}) VALUES %s{conflict_clause}",
+                    ([bind_value(value) for value in row] for row in values_of(all_rows)),
+                    page_size=page_size,
+                )
+        con.commit()
+        return {"message": "Rows inserted successfully", "rows": sent[0]}
+    except Exception as e:
+        if con and not con.closed:
+            con.rollback()
+        raise Exception(e)
     finally:
-        if cursor:
-            cursor.close()
         if con:
-            con.close()
+            release_connection(credentials, con)
 
 
 
@@ -192,12 +536,8 @@ def postgres_update_row(creds, params):
     :rtype: str
     :raises Exception: If there is an issue with the PostgreSQL database or missing input data.
     """
-    con = None
-    cursor = None
     try:
         credentials=json.loads(creds)
-        con = create_connection(credentials)
-        cursor = con.cursor()
         if (
             "table_name" in params
             and params["table_name"]
@@ -226,25 +566,17 @@ def postgres_update_row(creds, params):
                 condition_string += conditions["conditions"]
             else:
                 raise Exception("Invalid condition type")
-            string_fields = ""
-            for field in data.keys():
-                string_fields += f"{field} = '{data[field]}', "
-            string_fields = string_fields[:-2]
+            string_fields = ", ".join(f"{field} = %s" for field in data.keys())
+            values = tuple(bind_value(value) for value in data.values())
+            # conditions are raw SQL, escape their % so they are not taken for placeholders
+            condition_string = condition_string.replace("%", "%%")
             query = f"UPDATE {table_name} SET {string_fields} {condition_string}"
-            cursor.execute(query)
-            con.commit()
+            execute_query(credentials, query, values)
             return "Row updated successfully"
         else:
             raise Exception("Missing input data")
     except Exception as e:
-        if con:
-            con.rollback()
         raise Exception(e)
-    finally:
-        if cursor:
-            cursor.close()
-        if con:
-            con.close()
 
 
 
@@ -266,12 +598,8 @@ def postgres_delete_row(creds, params):
     :rtype: str
     :raises Exception: If there is an issue with the PostgreSQL database or missing input data.
     """
-    cursor = None
-    con = None
     try:
         credentials=json.loads(creds)
-        con = create_connection(credentials)
-        cursor = con.cursor()
         if (
             "table_name" in params
             and params["table_name"]
@@ -302,20 +630,12 @@ def postgres_delete_row(creds, params):
                     raise Exception("Invalid condition type")
 
             query = f"DELETE FROM {table_name} {condition_string}"
-            cursor.execute(query)
-            con.commit()
+            execute_query(credentials, query)
             return "Row deleted successfully"
         else:
             raise Exception("Missing input data")
     except Exception as e:
-        if con:
-            con.rollback()
         raise Exception(e)
-    finally:
-        if cursor:
-            cursor.close()
-        if con:
-            con.close()
 
 
 
@@ -334,12 +654,8 @@ def postgres_delete_table(creds, params):
     :rtype: str
     :raises Exception: If there is an issue with the PostgreSQL database or missing input data.
     """
-    cursor= None
-    con = None
     try:
         credentials=json.loads(creds)
-        con = create_connection(credentials)
-        cursor = con.cursor()
         if (
             "table_name" in params
             and params["table_name"]
@@ -356,20 +672,12 @@ def postgres_delete_table(creds, params):
                 query = f"DROP TABLE {table_name}"
             else:
                 raise Exception("Invalid delete type")
-            cursor.execute(query)
-            con.commit()
+            execute_query(credentials, query)
             return f"Table {delete_type}ed successfully"
         else:
             raise Exception("Missing input data")
     except Exception as e:
-        if con:
-            con.rollback()
         raise Exception(e)
-    finally:
-        if cursor:
-            cursor.close()
-        if con:
-            con.close()
 
 
 
@@ -382,37 +690,36 @@ def postgres_execute_custom_query(creds, params):
     :param params: Dictionary containing parameters.
 
         - :query: (str, required) - The custom SQL query to be executed.
+        - :stream: (bool, optional) - Stream the rows of a SELECT query from a server-side cursor.
+        - :chunk_size: (int, optional) - Number of rows per streamed chunk (default: 1000).
+        - :row_format: (str, optional) - Format of the streamed chunks: "dict" (default), "tuple" or "columnar".
 
-    :return: Result of the query execution or a message indicating success.
-    :rtype: list or str
+    :return: Result of the query execution or a message indicating success,
+        or a generator of row chunks when stream is set.
+    :rtype: list or str or generator
     :raises Exception: If there is an issue with the PostgreSQL database or missing input data.
     """
-    cursor = None
-    con = None
     try:
         credentials=json.loads(creds)
-        con = create_connection(credentials)
-        cursor = con.cursor()
-        
         if "query" not in params or not params['query']:
             raise Exception("Missing or empty query")
         query = params["query"]
-        cursor.execute(query)
         if query.strip().upper().startswith(("INSERT", "UPDATE", "DELETE")):
-            con.commit()
+            execute_query(credentials, query)
             return "Query executed successfully"
+        elif params.get("stream", False):
+            return stream_query(
+                credentials,
+                query,
+                chunk_size=int(params.get("chunk_size") or 1000),
+                row_format=params.get("row_format", "dict"),
+            )
         else:
-            result = fetch_data_as_dict(cursor)
-            result = [format_data(record) for record in result]
+            result = execute_query(credentials, query, fetch=True)
             return result
         
     except Exception as e:
         raise Exception(e)
-    finally:
-        if cursor:
-            cursor.close()
-        if con:
-            con.close()
 
 
 
@@ -431,16 +738,16 @@ def postgres_select_row(creds, params):
             - :type: (str, required) - The type of conditions ("AND", "OR", or "custom").
             - :conditions: (list or str, required) - Conditions for selecting rows.
 
-    :return: Selected rows from the specified table.
-    :rtype: list
+        - :stream: (bool, optional) - Stream the rows from a server-side cursor instead of returning them all at once.
+        - :chunk_size: (int, optional) - Number of rows per streamed chunk (default: 1000).
+        - :row_format: (str, optional) - Format of the streamed chunks: "dict" (default), "tuple" or "columnar".
+
+    :return: Selected rows from the specified table, or a generator of row chunks when stream is set.
+    :rtype: list or generator
     :raises Exception: If there is an issue with the PostgreSQL database or missing input data.
     """
-    cursor = None
-    con = None
     try:
         credentials=json.loads(creds)
-        con = create_connection(credentials)
-        cursor = con.cursor()
         count = None
         if (
             "table_name" in params
@@ -477,16 +784,16 @@ def postgres_select_row(creds, params):
             query = f"SELECT * FROM {table_name} {condition_string}"
             if count:
                 query += f" LIMIT {count}"
-            cursor.execute(query)
-            result = fetch_data_as_dict(cursor)
-            result = [format_data(record) for record in result]
+            if params.get("stream", False):
+                return stream_query(
+                    credentials,
+                    query,
+                    chunk_size=int(params.get("chunk_size") or 1000),
+                    row_format=params.get("row_format", "dict"),
+                )
+            result = execute_query(credentials, query, fetch=True)
             return result
         else:
             raise Exception("Missing input data")
     except Exception as e:
         raise Exception(e)
-    finally:
-        if cursor:
-            cursor.close()
-        if con:
-            con.close()
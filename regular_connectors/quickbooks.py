@@ -1,4 +1,5 @@
 import requests, base64,json
+from oauth_token_cache import get_cached_token
 
 SCOPES = [
     "com.intuit.quickbooks.accounting",
@@ -30,14 +31,16 @@ def quickbooks_refresh_access_token(cred):
             "grant_type": "refresh_token",
             "refresh_token": refresh_token,
         }
-        response = requests.post(url=url, headers=token_headers, data=token_data)
-        if response.status_code == 200:
-            token_info = response.json()
-            access_token = token_info["access_token"]
-            return access_token
-        else:
-            err_msg = [response.text,response.status_code]
-            raise Exception(err_msg)
+        def request_token():
+            response = requests.post(url=url, headers=token_headers, data=token_data)
+            if response.status_code == 200:
+                return response.json()
+            else:
+                err_msg = [response.text,response.status_code]
+                raise Exception(err_msg)
+        token_info = get_cached_token("quickbooks", credentials, request_token)
+        access_token = token_info["access_token"]
+        return access_token
     except requests.exceptions.RequestException as error:
         raise Exception(f"RequestException: {error}")
     except Exception as e:
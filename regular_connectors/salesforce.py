@@ -1,6 +1,7 @@
 import requests
 import base64
 import json
+from oauth_token_cache import get_cached_token
 
 ######################     UI      ######################
 
@@ -71,8 +72,7 @@ def salesforce_refresh_access_token(creds):
         client_secret=cred['clientSecret']
         refresh_token=cred['refreshToken']
         url = f"https://login.salesforce.com/services/oauth2/token?grant_type=refresh_token&client_id={client_id}&client_secret={client_secret}&refresh_token={refresh_token}"
-        response = requests.post(url)
-        response_json = response.json()
+        response_json = get_cached_token("salesforce", cred, lambda: requests.post(url).json())
         if "access_token" in response_json:
             return response_json["access_token"]
         else:
@@ -1,4 +1,5 @@
 import requests,json
+from oauth_token_cache import get_cached_token
 
 SCOPES = [
     "offline_access",
@@ -28,15 +29,16 @@ def xero_refresh_access_token(cred):
             "client_secret": client_secret,
         }
 
-        response = requests.post(url, headers=headers, data=data)
-        if response.status_code == 200:
-            token_info = response.json()
-            accessToken = token_info["access_token"]
-            refreshToken = token_info["refresh_token"]
-            return accessToken
-        else:
-            err_msg = [response.text, response.status_code]
-            raise  Exception(err_msg)
+        def request_token():
+            response = requests.post(url, headers=headers, data=data)
+            if response.status_code == 200:
+                return response.json()
+            else:
+                err_msg = [response.text, response.status_code]
+                raise  Exception(err_msg)
+        token_info = get_cached_token("xero", credentials, request_token)
+        accessToken = token_info["access_token"]
+        return accessToken
     except requests.exceptions.RequestException as e:
         raise (e)
     except Exception as e:
@@ -1,5 +1,6 @@
 import requests
 import json
+from oauth_token_cache import get_cached_token
 
 ######################     Generate Access Token      ######################
 
@@ -21,8 +22,7 @@ def zohoCRM_refresh_access_token(cred):
         client_id=credentials['clientID']
         client_secret=credentials['clientSecret']
         url = f"https://accounts.zoho.com/oauth/v2/token?refresh_token={refresh_token}&client_id={client_id}&client_secret={client_secret}&grant_type=refresh_token"
-        response = requests.post(url)
-        response_json = response.json()
+        response_json = get_cached_token("zohoCRM", credentials, lambda: requests.post(url).json())
         if "access_token" in response_json:
             return response_json["access_token"]
         else:
@@ -1,5 +1,6 @@
 import json
 import requests
+from oauth_token_cache import get_cached_token
 status=[200, 201, 202, 204, 206, 207, 208] 
 def refresh_access_token(cred):
     try:
@@ -10,8 +11,8 @@ def refresh_access_token(cred):
         'client_id': creds['clientID'],
         'client_secret': creds['clientSecret'],
     }
-        response = requests.post('https://zoom.us/oauth/token', data=token_params)
-        return response.json()['access_token']
+        response_json = get_cached_token("zoom", creds, lambda: requests.post('https://zoom.us/oauth/token', data=token_params).json())
+        return response_json['access_token']
     except requests.exceptions.RequestException as e:
         raise(e)
     except Exception as e: